@@ -1,7 +1,5 @@
-from elasticsearch import Elasticsearch
 import uuid
-
-es = Elasticsearch("http://localhost:9200")
+from app.database import es
 
 def create_candidate(firstname, lastname, education, years_exp, skills, city, country):
     cid = str(uuid.uuid4())
@@ -0,0 +1,26 @@
+import os
+
+from app.database import es
+
+MGET_MAX_IDS = int(os.getenv("MGET_MAX_IDS", 1000))
+
+
+def normalize_ids(ids: list[str]) -> list[str]:
+    """Id-jevi iz ponovljenog parametra i/ili zarezom razdvojeni, bez praznih i duplikata, u zadatom redosledu"""
+    parsed = (part.strip() for value in ids for part in value.split(","))
+    return list(dict.fromkeys(doc_id for doc_id in parsed if doc_id))
+
+
+def mget_documents(index_name: str, ids: list[str], fields: list[str] | None = None) -> tuple[list[dict], list[str]]:
+    """
+    Jedan ES mget umesto es.get po id-ju: (pronađeni dokumenti u redosledu zahteva, id-jevi koji ne postoje).
+    fields ograničava _source na tražena polja.
+    """
+    res = es.mget(index=index_name, ids=ids, source_includes=fields or None)
+    found, missing = [], []
+    for doc in res["docs"]:
+        if doc.get("found"):
+            found.append({"id": doc["_id"], **doc.get("_source", {})})
+        else:
+            missing.append(doc["_id"])
+    return found, missing
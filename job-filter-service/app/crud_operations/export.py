@@ -0,0 +1,132 @@
+import csv
+import io
+import json
+import os
+
+from app.database import es
+from app.models import CandidateBase, JobBase
+
+# Izvoz celog rezultata upita (CSV / NDJSON) bez limita od 1000 pogodaka: point-in-time daje konzistentan snimak
+# indeksa, a search_after stranice se redom šalju klijentu čim stignu - u memoriji je uvek samo jedna stranica.
+# _source je ograničen na tražene kolone.
+
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", 1000))
+EXPORT_KEEP_ALIVE = os.getenv("EXPORT_KEEP_ALIVE", "1m")
+
+# redosled stranica: _shard_doc je najjeftiniji (redosled u indeksu); za full-text upite prvo _score,
+# a _shard_doc razrešava iste skorove (search_after mora imati jedinstven redosled)
+INDEX_ORDER = [{"_shard_doc": "asc"}]
+SCORE_ORDER = [{"_score": "desc"}, {"_shard_doc": "asc"}]
+
+# kolone po indeksu; "id" je _id dokumenta
+EXPORT_COLUMNS = {
+    "job_ads": ["id", *JobBase.model_fields],
+    "candidates": ["id", *CandidateBase.model_fields],
+}
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_columns(index_name: str, fields: list[str] | None) -> list[str]:
+    """Tražene kolone u zadatom redosledu (sve kolone indeksa ako nisu zadate); ValueError za nepoznatu kolonu"""
+    allowed = EXPORT_COLUMNS[index_name]
+    if not fields:
+        return allowed
+    columns = list(dict.fromkeys(part.strip() for value in fields for part in value.split(",") if part.strip()))
+    unknown = [column for column in columns if column not in allowed]
+    if unknown:
+        raise ValueError(f"Nepoznate kolone: {', '.join(unknown)} (dozvoljene: {', '.join(allowed)})")
+    return columns
+
+
+def _pages(index_name: str, query: dict, source: list[str], page_size: int, sort: list[dict]):
+    # otvaranje i zatvaranje point-in-time-a su u istom generatoru: ako se generator nikad ne pokrene, PIT ni ne postoji
+    pit_id = es.open_point_in_time(index=index_name, keep_alive=EXPORT_KEEP_ALIVE)["id"]
+    try:
+        search_after = None
+        while True:
+            res = es.search(
+                pit={"id": pit_id, "keep_alive": EXPORT_KEEP_ALIVE},
+                query=query.get("query"),
+                sort=sort,
+                search_after=search_after,
+                size=page_size,
+                source=source or False,
+                track_total_hits=False,
+            )
+            # ES može da vrati novi id point-in-time-a, sledeći zahtev mora da koristi njega
+            pit_id = res.get("pit_id", pit_id)
+            hits = res["hits"]["hits"]
+            if not hits:
+                return
+            yield [{"id": hit["_id"], **hit.get("_source", {})} for hit in hits]
+            if len(hits) < page_size:
+                return
+            search_after = hits[-1]["sort"]
+    finally:
+        es.close_point_in_time(id=pit_id)
+
+
+def _with_first(first, pages):
+    try:
+        if first is not None:
+            yield first
+        yield from pages
+    finally:
+        pages.close()
+
+
+def iter_pages(index_name: str, query: dict, fields: list[str], page_size: int = EXPORT_PAGE_SIZE, sort: list[dict] | None = None):
+    """
+    Stranice [{"id", ...polja}] za ceo rezultat upita ({"query": ...} kao iz build_query_* funkcija).
+    sort je INDEX_ORDER (default) ili SCORE_ORDER kad je bitan redosled po relevantnosti.
+    Prva stranica (sa otvaranjem point-in-time-a) se dohvata odmah, pa se greška, npr. nepostojeći indeks,
+    javlja pre prvog bajta odgovora. Point-in-time se zatvara kad se generator iscrpi ili zatvori
+    (npr. klijent prekine preuzimanje), a ako otvaranje ili prva stranica padnu - pre nego što se greška prosledi.
+    """
+    pages = _pages(index_name, query, [field for field in fields if field != "id"], page_size, sort or INDEX_ORDER)
+    return _with_first(next(pages, None), pages)
+
+
+def iter_documents(index_name: str, query: dict, fields: list[str], page_size: int = EXPORT_PAGE_SIZE, sort: list[dict] | None = None):
+    """Isto što i iter_pages, ali dokument po dokument"""
+    for page in iter_pages(index_name, query, fields, page_size, sort):
+        yield from page
+
+
+def _csv_value(value):
+    # liste (npr. skills) idu u jednu ćeliju
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    return value
+
+
+def csv_chunks(pages, columns: list[str]):
+    """Zaglavlje pa jedan CSV chunk po stranici"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode("utf-8")
+    for page in pages:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(doc.get(column)) for column in columns] for doc in page)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def ndjson_chunks(pages, columns: list[str]):
+    """Jedan NDJSON chunk (dokument po liniji) po stranici"""
+    for page in pages:
+        yield "".join(
+            json.dumps({column: doc.get(column) for column in columns}, ensure_ascii=False, default=str) + "\n"
+            for doc in page
+        ).encode("utf-8")
+
+
+def export_chunks(index_name: str, query: dict, columns: list[str], export_format: str, sort: list[dict] | None = None):
+    pages = iter_pages(index_name, query, columns, sort=sort)
+    if export_format == "csv":
+        return csv_chunks(pages, columns)
+    return ndjson_chunks(pages, columns)
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import time
+
+from app.database import es
+from app.crud_operations.job_ads import search_by_desc_exp
+from app.pinecone.pinecone_client import index, generate_query_embedding
+
+# Hibridna pretraga oglasa: ES BM25 (title + description) i Pinecone vektorska pretraga sa istim filterima
+# idu paralelno, a rangovi se spajaju reciprocal rank fusion-om:
+#   score(d) = sum_i  w_i / (k + rank_i(d))
+# Dokument koji vrati samo jedan backend dobija samo njegov doprinos.
+
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", 60))
+# koliko rezultata se traži od svakog backend-a pre spajanja
+HYBRID_DEPTH = int(os.getenv("HYBRID_DEPTH", 50))
+
+BACKENDS = ("bm25", "vector")
+
+
+def reciprocal_rank_fusion(rankings: dict[str, list[str]], weights: dict[str, float], k: int = HYBRID_RRF_K) -> list[tuple[str, float]]:
+    """rankings: backend -> id-jevi od najboljeg; vraća (id, rrf skor) sortirano opadajuće"""
+    scores = {}
+    for backend, ids in rankings.items():
+        weight = weights.get(backend, 1.0)
+        if not weight:
+            continue
+        for rank, doc_id in enumerate(ids, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (k + rank)
+    # isti skor: stabilno po redosledu prvog pojavljivanja
+    return sorted(scores.items(), key=lambda item: -item[1])
+
+
+def pinecone_filter(payload: dict) -> dict | None:
+    """Isti filteri kao search_by_desc_exp, u Pinecone sintaksi"""
+    filter_query = {}
+    if payload.get("required_experience_level"):
+        filter_query["required_experience_level"] = {"$eq": payload["required_experience_level"]}
+    if payload.get("work_modes"):
+        filter_query["work_mode"] = {"$in": list(payload["work_modes"])}
+    if payload.get("city"):
+        filter_query["city"] = {"$eq": payload["city"]}
+    return filter_query or None
+
+
+def _bm25_search(payload: dict, depth: int) -> list[tuple[str, float, dict]]:
+    query = search_by_desc_exp(payload)
+    # agregacije nisu potrebne za rangiranje
+    query.pop("aggs", None)
+    query["size"] = depth
+    res = es.search(index="job_ads", body=query)
+    return [(hit["_id"], hit["_score"], hit["_source"]) for hit in res["hits"]["hits"]]
+
+
+def _vector_search(payload: dict, depth: int) -> list[tuple[str, float, dict]]:
+    embedding = generate_query_embedding(payload["query"])
+    response = index.query(
+        namespace="job_ads",
+        vector=embedding,
+        top_k=depth,
+        include_metadata=True,
+        filter=pinecone_filter(payload),
+    )
+    return [(match.id, match.score, dict(match.metadata or {})) for match in response.matches]
+
+
+async def _timed(search, payload: dict, depth: int) -> tuple[list | None, float, str | None]:
+    started = time.perf_counter()
+    try:
+        hits = await asyncio.to_thread(search, payload, depth)
+        error = None
+    except Exception as e:
+        hits, error = None, f"{type(e).__name__}: {e}"
+    return hits, round((time.perf_counter() - started) * 1000, 1), error
+
+
+async def hybrid_search(payload: dict, top_k: int = 10, bm25_weight: float = 1.0, vector_weight: float = 1.0,
+                        rrf_k: int = HYBRID_RRF_K, depth: int = HYBRID_DEPTH) -> dict:
+    """
+    ES i Pinecone se pozivaju istovremeno (svaki u svom thread-u), pa je latencija ~ sporiji backend, a ne zbir.
+    Ako jedan backend padne, rezultat se pravi samo od drugog, a greška se vraća u "degraded".
+    """
+    if not payload.get("query"):
+        raise ValueError("Hibridna pretraga zahteva tekst upita (query)")
+
+    started = time.perf_counter()
+    (bm25_hits, bm25_ms, bm25_error), (vector_hits, vector_ms, vector_error) = await asyncio.gather(
+        _timed(_bm25_search, payload, depth),
+        _timed(_vector_search, payload, depth),
+    )
+    if bm25_hits is None and vector_hits is None:
+        raise RuntimeError(f"Oba backend-a nedostupna: ES ({bm25_error}), Pinecone ({vector_error})")
+
+    hits = {"bm25": bm25_hits or [], "vector": vector_hits or []}
+    fused = reciprocal_rank_fusion(
+        {backend: [doc_id for doc_id, _, _ in backend_hits] for backend, backend_hits in hits.items()},
+        {"bm25": bm25_weight, "vector": vector_weight},
+        k=rrf_k,
+    )
+
+    details = {}
+    for backend in BACKENDS:
+        for rank, (doc_id, score, source) in enumerate(hits[backend], start=1):
+            detail = details.setdefault(doc_id, {"source": source})
+            detail[f"{backend}_rank"] = rank
+            detail[f"{backend}_score"] = score
+            # ES _source je kanonski dokument; Pinecone metadata samo ako ga ES nije vratio
+            if backend == "bm25":
+                detail["source"] = source
+
+    results = []
+    for doc_id, score in fused[:top_k]:
+        detail = details[doc_id]
+        results.append({
+            "id": doc_id,
+            **detail["source"],
+            "rrf_score": round(score, 6),
+            **{key: value for key, value in detail.items() if key != "source"},
+        })
+
+    return {
+        "count": len(results),
+        "results": results,
+        "degraded": {backend: error for backend, error in (("bm25", bm25_error), ("vector", vector_error)) if error},
+        "timings_ms": {
+            "bm25": bm25_ms,
+            "vector": vector_ms,
+            "total": round((time.perf_counter() - started) * 1000, 1),
+        },
+    }
@@ -3,6 +3,7 @@ import uuid
 from app.database import es
 from app.pinecone.pinecone_client import index, generate_job_embedding
 from app.models import JobAdCreate
+from app.change_log import record_changes
 
 # es = Elasticsearch("http://localhost:9200")
 
@@ -54,6 +55,8 @@ def create_job_ad_saga(job: JobAdCreate) -> str:
         }
 
         index.upsert(vectors=[vector], namespace="job_ads")
+        # job-matcher-service iz dnevnika osvežava svoje lokalne index-e i keš rezultata
+        record_changes("job_ads", [jid])
 
     except Exception as e:
             # rollback ElasticSearch upisa
@@ -103,6 +106,7 @@ def create_job_ad_saga_simulation(job: JobAdCreate, simulate_pinecone_fail: bool
         }
 
         index.upsert(vectors=[vector], namespace="job_ads")
+        record_changes("job_ads", [jid])
         print("Pinecone upis uspešan")
 
     except Exception as e:
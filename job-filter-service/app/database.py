@@ -1,9 +1,11 @@
 import os
 from elasticsearch import Elasticsearch
 from dotenv import load_dotenv
+from app.lazy_client import LazyClient
 
 load_dotenv()
 
 ELASTICSEARCH_HOST = os.getenv("ELASTICSEARCH_HOST", "http://localhost:9200")
 
-es = Elasticsearch(ELASTICSEARCH_HOST)
+# jedan zajednički klijent za ceo servis (pool konekcija), pravi se pri prvoj upotrebi
+es = LazyClient("elasticsearch", lambda: Elasticsearch(ELASTICSEARCH_HOST))
@@ -0,0 +1,148 @@
+import asyncio
+import hashlib
+import math
+import os
+import re
+
+OPENAI_EMBEDDING_MODEL = "text-embedding-3-small"
+FULL_EMBEDDING_DIM = 1536
+
+
+def embedding_dimensions() -> int:
+    """EMBEDDING_DIMENSIONS iz env-a - text-embedding-3 modeli podržavaju skraćene vektore (npr. 512)"""
+    return int(os.getenv("EMBEDDING_DIMENSIONS", FULL_EMBEDDING_DIM))
+
+
+class EmbeddingProvider:
+    """Zajednički interfejs: name (ulazi u ključ keša) i embed(texts) / aembed(texts) -> lista vektora istim redom"""
+
+    model: str
+    dimensions: int
+
+    @property
+    def name(self) -> str:
+        """Model + dimenzija - skraćeni i puni vektori istog modela ne smeju da dele keš"""
+        if self.dimensions == FULL_EMBEDDING_DIM:
+            return self.model
+        return f"{self.model}@{self.dimensions}"
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        raise NotImplementedError
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        """Provider bez async klijenta radi sync embed u thread-u, da ne blokira event loop"""
+        return await asyncio.to_thread(self.embed, texts)
+
+
+def shorten_embedding(vector: list[float], dimensions: int) -> list[float]:
+    """
+    Skraćuje text-embedding-3 vektor na prvih `dimensions` vrednosti i ponovo ga normalizuje.
+    Za text-embedding-3 modele ovo daje isto što i parametar dimensions u API-ju.
+    """
+    head = vector[:dimensions]
+    norm = math.sqrt(sum(value * value for value in head))
+    if norm == 0.0:
+        return list(head)
+    return [value / norm for value in head]
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    # OpenAI prihvata najviše 2048 inputa po jednom embeddings.create pozivu
+    max_inputs_per_request = 2048
+
+    def __init__(self, client, model: str = OPENAI_EMBEDDING_MODEL, dimensions: int = FULL_EMBEDDING_DIM, async_client=None):
+        self.client = client
+        self.async_client = async_client
+        self.model = model
+        self.dimensions = dimensions
+
+    def _request_kwargs(self) -> dict:
+        if self.dimensions != FULL_EMBEDDING_DIM:
+            return {"dimensions": self.dimensions}
+        return {}
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        vectors = []
+        for start in range(0, len(texts), self.max_inputs_per_request):
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=texts[start:start + self.max_inputs_per_request],
+                **self._request_kwargs()
+            )
+            vectors.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return vectors
+
+    async def aembed(self, texts: list[str]) -> list[list[float]]:
+        if self.async_client is None:
+            return await super().aembed(texts)
+
+        vectors = []
+        for start in range(0, len(texts), self.max_inputs_per_request):
+            response = await self.async_client.embeddings.create(
+                model=self.model,
+                input=texts[start:start + self.max_inputs_per_request],
+                **self._request_kwargs()
+            )
+            vectors.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return vectors
+
+
+class LocalHashEmbeddingProvider(EmbeddingProvider):
+    """
+    Offline, deterministički embedding bez mreže - za load testove i benchmark-e.
+    Tekst se razbija na reči i char n-grame, svaki feature se hešira i projektuje
+    sparse random projekcijom (nnz pozicija sa ±1 izvedenih iz blake2b heša), pa se vektor normalizuje.
+    Isti tekst uvek daje isti vektor, a tekstovi sa zajedničkim rečima/n-gramima imaju veći cosine score.
+    """
+
+    def __init__(self, dimensions: int = FULL_EMBEDDING_DIM, ngram_range: tuple[int, int] = (3, 5), nnz: int = 16, seed: str = "v1"):
+        if not 1 <= nnz <= 16:
+            raise ValueError("nnz mora biti između 1 i 16 (blake2b digest ima najviše 64 bajta)")
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+        self.nnz = nnz
+        self.seed = seed.encode("utf-8")
+        self.model = f"local-hash-ngram-{seed}"
+
+    def _features(self, text: str) -> dict[str, float]:
+        features = {}
+        for word in re.findall(r"\w+", text.lower()):
+            features[f"w:{word}"] = features.get(f"w:{word}", 0.0) + 1.0
+            padded = f"#{word}#"
+            for n in range(self.ngram_range[0], self.ngram_range[1] + 1):
+                for start in range(len(padded) - n + 1):
+                    gram = f"c:{padded[start:start + n]}"
+                    features[gram] = features.get(gram, 0.0) + 0.5
+        return features
+
+    def _project(self, feature: str):
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=self.nnz * 4, key=self.seed).digest()
+        for i in range(self.nnz):
+            chunk = int.from_bytes(digest[i * 4:(i + 1) * 4], "little")
+            yield chunk % self.dimensions, 1.0 if chunk & 0x80000000 else -1.0
+
+    def embed_one(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for feature, weight in self._features(text).items():
+            # sublinearni tf da česte reči ne dominiraju
+            weight = 1.0 + math.log(weight) if weight >= 1.0 else weight
+            for position, sign in self._project(feature):
+                vector[position] += sign * weight
+
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm == 0.0:
+            return vector
+        return [value / norm for value in vector]
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_one(text) for text in texts]
+
+
+def provider_from_env(openai_client, async_openai_client=None) -> EmbeddingProvider:
+    """EMBEDDING_PROVIDER=openai (default) ili local, EMBEDDING_DIMENSIONS=1536 (default) ili manje"""
+    name = os.getenv("EMBEDDING_PROVIDER", "openai").lower()
+    if name == "local":
+        return LocalHashEmbeddingProvider(dimensions=embedding_dimensions())
+    if name == "openai":
+        return OpenAIEmbeddingProvider(openai_client, dimensions=embedding_dimensions(), async_client=async_openai_client)
+    raise ValueError(f"Nepoznat EMBEDDING_PROVIDER '{name}', dozvoljeno: openai, local")
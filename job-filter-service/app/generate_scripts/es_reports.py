@@ -1,5 +1,7 @@
 from app.database import es
-from fpdf import FPDF
+from app.pdf_layout import ReportLayout
+from app.pdf_stream import StreamingPDF
+from app.crud_operations.export import SCORE_ORDER, iter_documents
 from datetime import datetime
 import os
 
@@ -7,6 +9,21 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # ide iz
 REPORTS_DIR = os.path.join(BASE_DIR, "reports")
 os.makedirs(REPORTS_DIR, exist_ok=True)
 
+# polja izveštaja i vrednost kad polje nedostaje u dokumentu
+JOB_AD_ROW = {"title": "", "description": "", "work_mode": "", "city": "", "country": ""}
+CANDIDATE_ROW = {"firstname": "", "lastname": "", "education_level": "", "years_experience": 0, "city": ""}
+
+def count_hits(index_name, query):
+    return es.count(index=index_name, query=query["query"])["count"]
+
+def stream_rows(index_name, query, row):
+    """
+    Svi pogoci upita kao redovi izveštaja, stranicu po stranicu (point-in-time + search_after) - bez limita
+    od 1000 pogodaka i bez cele liste u memoriji. Redosled je po _score, kao kod običnog es.search.
+    """
+    for doc in iter_documents(index_name, query, list(row), sort=SCORE_ORDER):
+        yield {field: doc.get(field, default) for field, default in row.items()}
+
 #####################################################################
 # query 1 - job ads easy 
 def build_query_job_ads(filters):
@@ -18,74 +35,69 @@ def build_query_job_ads(filters):
         must_clauses.append({"match": {"required_experience_level": filters["experience_level"]}})
     return {"query": {"bool": {"must": must_clauses}}}
 
-def fetch_job_ads(filters):
-    """Vraća JobAds iz Elasticsearch po zadatim filterima"""
-    query = build_query_job_ads(filters)
-    res = es.search(index="job_ads", body=query, size=1000)
-    hits = res["hits"]["hits"]
-    jobs = []
-    for hit in hits:
-        source = hit["_source"]
-        jobs.append({
-            "title": source.get("title", ""),
-            "description": source.get("description", ""),
-            "work_mode": source.get("work_mode", ""),
-            "city": source.get("city", ""),
-            "country": source.get("country", "")
-        })
-    return jobs
-
-def generate_pdf_job_ads(jobs, filters):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_auto_page_break(auto=False)  # isključujemo automatski break
-
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(0, 10, "JobAds Report - by job type and required experience level", ln=True, align="C")
+def count_job_ads(filters):
+    return count_hits("job_ads", build_query_job_ads(filters))
 
-    pdf.set_font("Arial", "", 12)
-    pdf.cell(0, 10, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
+def stream_job_ads(filters):
+    """JobAds iz Elasticsearch po zadatim filterima, kao stream redova"""
+    return stream_rows("job_ads", build_query_job_ads(filters), JOB_AD_ROW)
 
-    section_title = " - ".join([f"{k.replace('_',' ').capitalize()}: {v}" 
-                                for k, v in filters.items() if v])
-    pdf.cell(0, 10, f"Section: {section_title}", ln=True)
-    pdf.ln(5)
+def render_job_ads_report(filters, total, progress=None, output_path=None):
+    """Za report worker: ES stream se otvara u worker procesu, pa se redovi ne prenose između procesa"""
+    return generate_pdf_job_ads(stream_job_ads(filters), filters, progress=progress, output_path=output_path, total=total)
 
-    line_height = 6
-    page_bottom = pdf.h - pdf.b_margin  # donja margina stranice
+def generate_pdf_job_ads(jobs, filters, progress=None, output_path=None, total=None):
+    output_file = output_path or os.path.join(REPORTS_DIR, f"jobads_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+    total = len(jobs) if total is None else total
+    # stranice se upisuju u fajl čim se završe, u memoriji je samo trenutna stranica
+    with StreamingPDF(output_file) as pdf:
+        pdf.add_page()
+        pdf.set_auto_page_break(auto=False)  # isključujemo automatski break
 
-    for job in jobs:
-        # Procena visine bloka
-        pdf.set_font("Arial", "B", 12)
-        title_height = line_height
-        pdf.set_font("Arial", "", 12)
-        # koliko linija description zauzima
-        desc_lines = pdf.multi_cell(0, line_height, f"Description: {job['description']}", border=0, split_only=True)
-        desc_height = line_height * len(desc_lines)
-        other_height = line_height*3 + 10  # work_mode, city, country, razmak i separator
-        block_height = title_height + desc_height + other_height
-
-        # Page break ako blok ne stane
-        if pdf.get_y() + block_height > page_bottom:
-            pdf.add_page()
-
-        # Crtanje bloka
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 8, f"Title: {job['title']}", ln=True)
+        pdf.set_font("Arial", "B", 16)
+        pdf.cell(0, 10, "JobAds Report - by job type and required experience level", ln=True, align="C")
 
         pdf.set_font("Arial", "", 12)
-        pdf.multi_cell(0, line_height, f"Description: {job['description']}")
-        pdf.cell(0, 8, f"Work Mode: {job['work_mode']}", ln=True)
-        pdf.cell(0, 8, f"City: {job['city']}", ln=True)
-        pdf.cell(0, 8, f"Country: {job['country']}", ln=True)
+        pdf.cell(0, 10, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
 
-        pdf.ln(5)
-        pdf.cell(0, 0, "-"*100, ln=True)
+        section_title = " - ".join([f"{k.replace('_',' ').capitalize()}: {v}" 
+                                    for k, v in filters.items() if v])
+        pdf.cell(0, 10, f"Section: {section_title}", ln=True)
         pdf.ln(5)
 
-    # Sačuvaj PDF
-    output_file = os.path.join(REPORTS_DIR, f"jobads_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-    pdf.output(output_file)
+        line_height = 6
+        page_bottom = pdf.h - pdf.b_margin  # donja margina stranice
+        layout = ReportLayout(pdf)
+
+        for idx, job in enumerate(jobs, start=1):
+            # Procena visine bloka - description se prelama jednom, iste linije se posle i crtaju
+            title_height = line_height
+            pdf.set_font("Arial", "", 12)
+            desc_lines = layout.wrap(f"Description: {job['description']}")
+            desc_height = layout.height(desc_lines, line_height)
+            other_height = line_height*3 + 10  # work_mode, city, country, razmak i separator
+            block_height = title_height + desc_height + other_height
+
+            # Page break ako blok ne stane
+            if pdf.get_y() + block_height > page_bottom:
+                pdf.add_page()
+
+            # Crtanje bloka
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 8, f"Title: {job['title']}", ln=True)
+
+            pdf.set_font("Arial", "", 12)
+            layout.draw(desc_lines, line_height)
+            pdf.cell(0, 8, f"Work Mode: {job['work_mode']}", ln=True)
+            pdf.cell(0, 8, f"City: {job['city']}", ln=True)
+            pdf.cell(0, 8, f"Country: {job['country']}", ln=True)
+
+            pdf.ln(5)
+            pdf.cell(0, 0, "-"*100, ln=True)
+            pdf.ln(5)
+            if progress:
+                progress(idx, max(total, idx))
+
     print(f"PDF generated successfully: {output_file}")
     return output_file
 
@@ -101,65 +113,60 @@ def build_query_candidates(filters):
         must_clauses.append({"range": {"years_experience": {"gte": filters["min_years_experience"]}}})
     return {"query": {"bool": {"must": must_clauses}}}
 
-def fetch_candidates(filters):
-    """Vraća kandidata iz Elasticsearch po zadatim filterima"""
-    query = build_query_candidates(filters)
-    res = es.search(index="candidates", body=query, size=1000)
-    hits = res["hits"]["hits"]
-    candidates = []
-    for hit in hits:
-        source = hit["_source"]
-        candidates.append({
-            "firstname": source.get("firstname", ""),
-            "lastname": source.get("lastname", ""),
-            "education_level": source.get("education_level", ""),
-            "years_experience": source.get("years_experience", 0),
-            "city": source.get("city", "")
-        })
-    return candidates
+def count_candidates(filters):
+    return count_hits("candidates", build_query_candidates(filters))
 
-def generate_pdf_candidates(candidates, filters):
-    """Generiše PDF izveštaj sa Candidates podacima u istom stilu kao JobAds"""
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_auto_page_break(auto=False, margin=15)
+def stream_candidates(filters):
+    """Kandidati iz Elasticsearch po zadatim filterima, kao stream redova"""
+    return stream_rows("candidates", build_query_candidates(filters), CANDIDATE_ROW)
 
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(0, 10, "Candidates Report - by education level and minimum years of experience", ln=True, align="C")
+def render_candidates_report(filters, total, progress=None, output_path=None):
+    return generate_pdf_candidates(stream_candidates(filters), filters, progress=progress, output_path=output_path, total=total)
 
-    pdf.set_font("Arial", "", 12)
-    pdf.cell(0, 10, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
+def generate_pdf_candidates(candidates, filters, progress=None, output_path=None, total=None):
+    """Generiše PDF izveštaj sa Candidates podacima u istom stilu kao JobAds; progress(done, total) posle svakog kandidata"""
+    output_file = output_path or os.path.join(REPORTS_DIR, f"candidates_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+    total = len(candidates) if total is None else total
+    with StreamingPDF(output_file) as pdf:
+        pdf.add_page()
+        pdf.set_auto_page_break(auto=False, margin=15)
 
-    section_title = " - ".join([f"{k.replace('_',' ').capitalize()}: {v}" 
-                                for k, v in filters.items() if v is not None])
-    pdf.cell(0, 10, f"Section: {section_title}", ln=True)
-    pdf.ln(5)
+        pdf.set_font("Arial", "B", 16)
+        pdf.cell(0, 10, "Candidates Report - by education level and minimum years of experience", ln=True, align="C")
 
-    line_height = 6
-    page_bottom = pdf.h - pdf.b_margin
+        pdf.set_font("Arial", "", 12)
+        pdf.cell(0, 10, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
 
-    for candidate in candidates:
-        # procena visine bloka
-        block_height = line_height*6 + 10  # title, lastname, education, experience, city, razmak/separator
+        section_title = " - ".join([f"{k.replace('_',' ').capitalize()}: {v}" 
+                                    for k, v in filters.items() if v is not None])
+        pdf.cell(0, 10, f"Section: {section_title}", ln=True)
+        pdf.ln(5)
 
-        if pdf.get_y() + block_height > page_bottom:
-            pdf.add_page()
+        line_height = 6
+        page_bottom = pdf.h - pdf.b_margin
 
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 8, f"Firstname: {candidate['firstname']}", ln=True)
+        for idx, candidate in enumerate(candidates, start=1):
+            # procena visine bloka
+            block_height = line_height*6 + 10  # title, lastname, education, experience, city, razmak/separator
 
-        pdf.set_font("Arial", "", 12)
-        pdf.cell(0, 8, f"Lastname: {candidate['lastname']}", ln=True)
-        pdf.cell(0, 8, f"Education Level: {candidate['education_level']}", ln=True)
-        pdf.cell(0, 8, f"Years Experience: {candidate['years_experience']}", ln=True)
-        pdf.cell(0, 8, f"City: {candidate['city']}", ln=True)
+            if pdf.get_y() + block_height > page_bottom:
+                pdf.add_page()
 
-        pdf.ln(5)
-        pdf.cell(0, 0, "-"*100, ln=True)
-        pdf.ln(5)
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 8, f"Firstname: {candidate['firstname']}", ln=True)
+
+            pdf.set_font("Arial", "", 12)
+            pdf.cell(0, 8, f"Lastname: {candidate['lastname']}", ln=True)
+            pdf.cell(0, 8, f"Education Level: {candidate['education_level']}", ln=True)
+            pdf.cell(0, 8, f"Years Experience: {candidate['years_experience']}", ln=True)
+            pdf.cell(0, 8, f"City: {candidate['city']}", ln=True)
+
+            pdf.ln(5)
+            pdf.cell(0, 0, "-"*100, ln=True)
+            pdf.ln(5)
+            if progress:
+                progress(idx, max(total, idx))
 
-    output_file = os.path.join(REPORTS_DIR, f"candidates_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-    pdf.output(output_file)
     print(f"PDF generated successfully: {output_file}")
     return output_file
 
@@ -198,63 +205,61 @@ def build_complex_jobads_query(description_keywords=None, work_mode=None):
         }
     }
 
-def fetch_complex_jobads(description_keywords=None, work_mode=None):
-    query = build_complex_jobads_query(description_keywords, work_mode)
-    res = es.search(index="job_ads", body=query, size=1000)
-    hits = res["hits"]["hits"]
-    jobs = []
-    for hit in hits:
-        source = hit["_source"]
-        jobs.append({
-            "title": source.get("title", ""),
-            "description": source.get("description", ""),
-            "work_mode": source.get("work_mode", ""),
-            "city": source.get("city", ""),
-            "country": source.get("country", "")
-        })
-    return jobs
+def count_complex_jobads(description_keywords=None, work_mode=None):
+    return count_hits("job_ads", build_complex_jobads_query(description_keywords, work_mode))
 
-def generate_complex_jobads_pdf(jobs, description_keywords, work_mode):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_auto_page_break(auto=False, margin=15)
+def stream_complex_jobads(description_keywords=None, work_mode=None):
+    return stream_rows("job_ads", build_complex_jobads_query(description_keywords, work_mode), JOB_AD_ROW)
 
-    pdf.set_font("Arial", "B", 16)
-    pdf.cell(0, 10, "Complex JobAds Report - by description keywords and work mode", ln=True, align="C")
+def render_complex_jobads_report(description_keywords, work_mode, total, progress=None, output_path=None):
+    return generate_complex_jobads_pdf(
+        stream_complex_jobads(description_keywords, work_mode), description_keywords, work_mode,
+        progress=progress, output_path=output_path, total=total
+    )
 
-    pdf.set_font("Arial", "", 12)
-    pdf.cell(0, 10, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
-    pdf.cell(0, 10, f"Description keywords: {description_keywords}", ln=True)
-    pdf.cell(0, 10, f"Work Mode filter: {work_mode}", ln=True)
-    pdf.ln(5)
+def generate_complex_jobads_pdf(jobs, description_keywords, work_mode, progress=None, output_path=None, total=None):
+    output_file = output_path or os.path.join(REPORTS_DIR, f"complex_jobads_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
+    total = len(jobs) if total is None else total
+    with StreamingPDF(output_file) as pdf:
+        pdf.add_page()
+        pdf.set_auto_page_break(auto=False, margin=15)
 
-    line_height = 6
-    page_bottom = pdf.h - pdf.b_margin
+        pdf.set_font("Arial", "B", 16)
+        pdf.cell(0, 10, "Complex JobAds Report - by description keywords and work mode", ln=True, align="C")
 
-    for job in jobs:
-        # procena visine bloka
-        desc_lines = pdf.multi_cell(0, line_height, f"Description: {job['description']}", border=0, split_only=True)
-        block_height = line_height*(len(desc_lines)+5)
+        pdf.set_font("Arial", "", 12)
+        pdf.cell(0, 10, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ln=True)
+        pdf.cell(0, 10, f"Description keywords: {description_keywords}", ln=True)
+        pdf.cell(0, 10, f"Work Mode filter: {work_mode}", ln=True)
+        pdf.ln(5)
 
-        if pdf.get_y() + block_height > page_bottom:
-            pdf.add_page()
+        line_height = 6
+        page_bottom = pdf.h - pdf.b_margin
+        layout = ReportLayout(pdf)
 
-        pdf.set_font("Arial", "B", 12)
-        pdf.cell(0, 8, f"Title: {job['title']}", ln=True)
+        for idx, job in enumerate(jobs, start=1):
+            # procena visine bloka - description se prelama jednom, iste linije se posle i crtaju
+            pdf.set_font("Arial", "", 12)
+            desc_lines = layout.wrap(f"Description: {job['description']}")
+            block_height = line_height*(len(desc_lines)+5)
 
-        pdf.set_font("Arial", "", 12)
-        pdf.multi_cell(0, line_height, f"Description: {job['description']}")
-        pdf.cell(0, 8, f"Work Mode: {job['work_mode']}", ln=True)
-        pdf.cell(0, 8, f"City: {job['city']}", ln=True)
-        pdf.cell(0, 8, f"Country: {job['country']}", ln=True)
+            if pdf.get_y() + block_height > page_bottom:
+                pdf.add_page()
 
-        pdf.ln(5)
-        pdf.cell(0, 0, "-"*100, ln=True)
-        pdf.ln(5)
+            pdf.set_font("Arial", "B", 12)
+            pdf.cell(0, 8, f"Title: {job['title']}", ln=True)
 
-    output_file = os.path.join(REPORTS_DIR, f"complex_jobads_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")
-    pdf.output(output_file)
-    print(f"PDF generated successfully: {output_file}")
-    return output_file
+            pdf.set_font("Arial", "", 12)
+            layout.draw(desc_lines, line_height)
+            pdf.cell(0, 8, f"Work Mode: {job['work_mode']}", ln=True)
+            pdf.cell(0, 8, f"City: {job['city']}", ln=True)
+            pdf.cell(0, 8, f"Country: {job['country']}", ln=True)
 
+            pdf.ln(5)
+            pdf.cell(0, 0, "-"*100, ln=True)
+            pdf.ln(5)
+            if progress:
+                progress(idx, max(total, idx))
 
+    print(f"PDF generated successfully: {output_file}")
+    return output_file
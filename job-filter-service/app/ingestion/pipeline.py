@@ -0,0 +1,193 @@
+import itertools
+import json
+import os
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from app.change_log import record_changes
+
+
+def read_ndjson(path: str):
+    """Čita zapise iz NDJSON fajla jedan po jedan (fajl se nikad ne učitava ceo u memoriju)"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def read_es_bulk(path: str):
+    """Čita dokumente iz Elasticsearch _bulk fajla (preskače action linije tipa {"index": {...}})"""
+    for record in read_ndjson(path):
+        if len(record) == 1 and next(iter(record)) in ("index", "create", "update", "delete"):
+            continue
+        yield record
+
+
+def default_record_id(record: dict) -> str:
+    """Deterministički id - ponovljeno učitavanje istog zapisa radi upsert istog vektora, a ne duplikat"""
+    if record.get("id"):
+        return str(record["id"])
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, json.dumps(record, sort_keys=True, default=str)))
+
+
+def _batched(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class IngestionPipeline:
+    """
+    Streaming ingestion u Pinecone namespace.
+    Zapisi se embeduju u velikim batch-evima, upsert ide u chunk-ovima preko više worker thread-ova,
+    a checkpoint fajl pamti koliko je zapisa sa početka ulaza sigurno upisano.
+    Checkpoint se pomera samo preko neprekinutog niza završenih batch-eva, pa posle pada
+    nastavak ponovo obradi najviše batch-eve koji su bili u letu (upsert je idempotentan).
+    """
+
+    def __init__(
+        self,
+        index,
+        namespace: str,
+        embed_texts,
+        text_for,
+        metadata_for,
+        id_for=default_record_id,
+        embed_batch_size: int = 256,
+        upsert_batch_size: int = 100,
+        workers: int = 4,
+        checkpoint_path: str | None = None,
+        log_every: int = 1000,
+    ):
+        self.index = index
+        self.namespace = namespace
+        self.embed_texts = embed_texts
+        self.text_for = text_for
+        self.metadata_for = metadata_for
+        self.id_for = id_for
+        self.embed_batch_size = embed_batch_size
+        self.upsert_batch_size = upsert_batch_size
+        self.workers = workers
+        self.checkpoint_path = checkpoint_path
+        self.log_every = log_every
+
+    def _load_checkpoint(self) -> int:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return 0
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("namespace") != self.namespace:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_path} pripada namespace-u '{checkpoint.get('namespace')}', a ne '{self.namespace}'"
+            )
+        return checkpoint["committed"]
+
+    def _save_checkpoint(self, committed: int):
+        if not self.checkpoint_path:
+            return
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "namespace": self.namespace,
+                "committed": committed,
+                "updated_at": datetime.now().isoformat(),
+            }, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _process_batch(self, batch: list[dict]) -> int:
+        embeddings = self.embed_texts([self.text_for(record) for record in batch])
+        vectors = [
+            {
+                "id": self.id_for(record),
+                "values": embedding,
+                "metadata": self.metadata_for(record),
+            }
+            for record, embedding in zip(batch, embeddings)
+        ]
+        for start in range(0, len(vectors), self.upsert_batch_size):
+            self.index.upsert(vectors=vectors[start:start + self.upsert_batch_size], namespace=self.namespace)
+        # lokalni index-i servisa vide nove zapise iz dnevnika izmena
+        record_changes(self.namespace, [vector["id"] for vector in vectors])
+        return len(batch)
+
+    def run(self, records) -> dict:
+        skipped = self._load_checkpoint()
+        if skipped:
+            print(f"Nastavljam od checkpoint-a: preskačem prvih {skipped} zapisa")
+
+        committed = skipped
+        ingested = 0
+        next_to_commit = 0
+        batch_sizes = {}
+        finished = set()
+        in_flight = {}
+        error = None
+        started = time.perf_counter()
+        last_logged = 0
+
+        def collect(done):
+            nonlocal committed, ingested, next_to_commit, error, last_logged
+            for future in done:
+                seq = in_flight.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                finished.add(seq)
+                ingested += batch_sizes[seq]
+
+            advanced = False
+            while next_to_commit in finished:
+                finished.remove(next_to_commit)
+                committed += batch_sizes.pop(next_to_commit)
+                next_to_commit += 1
+                advanced = True
+            if advanced:
+                self._save_checkpoint(committed)
+
+            if ingested - last_logged >= self.log_every:
+                last_logged = ingested
+                elapsed = time.perf_counter() - started
+                print(f"[{self.namespace}] {ingested} zapisa, {ingested / elapsed:.1f} zapisa/s")
+
+        remaining = itertools.islice(records, skipped, None)
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"ingest-{self.namespace}") as executor:
+            for seq, batch in enumerate(_batched(remaining, self.embed_batch_size)):
+                # ograničen broj batch-eva u letu => memorija ne raste sa veličinom ulaza
+                while len(in_flight) >= self.workers * 2:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    collect(done)
+                if error:
+                    break
+                batch_sizes[seq] = len(batch)
+                in_flight[executor.submit(self._process_batch, batch)] = seq
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+
+        if error:
+            raise RuntimeError(
+                f"Ingestion u '{self.namespace}' prekinut posle {committed} zapisa, pokreni ponovo za nastavak"
+            ) from error
+
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+        elapsed = time.perf_counter() - started
+        stats = {
+            "namespace": self.namespace,
+            "ingested": ingested,
+            "skipped": skipped,
+            "seconds": round(elapsed, 2),
+            "records_per_sec": round(ingested / elapsed, 1) if elapsed else 0.0,
+        }
+        print(f"[{self.namespace}] gotovo: {stats}")
+        return stats
@@ -1,22 +1,31 @@
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from elasticsearch import Elasticsearch
-from dotenv import load_dotenv
-from app.routers import candidates_router, job_ads_router
+from app.database import es, ELASTICSEARCH_HOST
+from app.lazy_client import client_stats, warm_up
+from app.report_jobs import report_jobs
+from app.routers import candidates_router, job_ads_router, report_jobs_router
+from app.pinecone.pinecone_client import embedding_cache, warm_up_steps
 
-# ---- učitavanje .env ----
-load_dotenv()
+STARTUP_WARM_UP = os.getenv("STARTUP_WARM_UP", "true").lower() == "true"
 
-ELASTICSEARCH_HOST = os.getenv("ELASTICSEARCH_HOST", "http://localhost:9200")
+startup_report = {}
 
-# ---- Elasticsearch klijent ----
-es = Elasticsearch(ELASTICSEARCH_HOST)
+# ---- warm-up pre prvog zahteva ----
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # worker prima saobraćaj tek posle warm-up-a; bez njega se klijenti otvaraju na prvom zahtevu
+    if STARTUP_WARM_UP:
+        startup_report.update(await warm_up([("elasticsearch", es.info), *warm_up_steps()]))
+    yield
+    report_jobs.shutdown()
 
 # ---- FastAPI app ----
-app = FastAPI(title="Job Filter API")
+app = FastAPI(title="Job Filter API", lifespan=lifespan)
 
 app.include_router(candidates_router.router, tags=["Candidates"])
 app.include_router(job_ads_router.router, tags=["Job Ads"])
+app.include_router(report_jobs_router.router)
 
 @app.get("/health")
 def health():
@@ -24,3 +33,11 @@ def health():
         "elasticsearch_host": ELASTICSEARCH_HOST,
         "es_alive": es.ping()
     }
+
+@app.get("/startup/stats")
+def startup_stats():
+    return {"warm_up": startup_report or None, "clients": client_stats()}
+
+@app.get("/embeddings/cache-stats")
+def embedding_cache_stats():
+    return embedding_cache.stats()
\ No newline at end of file
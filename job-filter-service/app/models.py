@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from app.enums.job_ads_enums import ExperienceLevel, JobType, WorkMode
 from app.enums.candidates_enums import EducationLevel
@@ -31,6 +31,10 @@ class CandidateUpdate(BaseModel):
     city: Optional[str] = None
     country: Optional[str] = None
 
+class MgetRequest(BaseModel):
+    ids: List[str]
+    fields: Optional[List[str]] = None
+
 class JobBase(BaseModel):
     title: str
     description: str
@@ -58,6 +62,17 @@ class JobAdUpdate(BaseModel):
     city: Optional[str] = None
     country: Optional[str] = None
 
+class HybridSearchRequest(BaseModel):
+    query: str
+    required_experience_level: Optional[ExperienceLevel] = None
+    work_modes: Optional[List[WorkMode]] = None
+    city: Optional[str] = None
+    top_k: int = Field(10, ge=1, le=100)
+    bm25_weight: float = Field(1.0, ge=0)
+    vector_weight: float = Field(1.0, ge=0)
+    rrf_k: Optional[int] = Field(None, ge=1, description="Default HYBRID_RRF_K")
+    depth: Optional[int] = Field(None, ge=1, le=500, description="Broj rezultata po backend-u pre spajanja (default HYBRID_DEPTH)")
+
 class JobAdResult(BaseModel):
     id: str
     title: str
@@ -0,0 +1,54 @@
+import argparse
+
+from app.pinecone.pinecone_client import index, embed_texts, job_embedding_text
+from app.ingestion.pipeline import IngestionPipeline, read_es_bulk, read_ndjson
+
+# Učitava oglase u Pinecone job_ads namespace sa istim id-jem kao u Elasticsearch-u (job_id),
+# npr. iz sample fajla koji se koristi za ES _bulk:
+#   python -m app.pinecone.ingest_job_ads elasticsearch/sample_data/job_ads_sample.txt --es-bulk
+
+JOB_AD_FIELDS = ["job_id", "title", "description", "required_experience_level", "job_type", "work_mode", "city", "country"]
+
+def job_text(job):
+    return job_embedding_text(
+        job["title"],
+        job["description"],
+        job["required_experience_level"],
+        job["job_type"],
+        job["work_mode"],
+        job["city"],
+        job["country"]
+    )
+
+def job_metadata(job):
+    return {field: job[field] for field in JOB_AD_FIELDS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk učitavanje oglasa u Pinecone")
+    parser.add_argument("path", help="NDJSON fajl sa oglasima")
+    parser.add_argument("--es-bulk", action="store_true", help="Fajl je u Elasticsearch _bulk formatu")
+    parser.add_argument("--embed-batch-size", type=int, default=256)
+    parser.add_argument("--upsert-batch-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--checkpoint", default="ingestion_checkpoint_job_ads.json")
+    args = parser.parse_args()
+
+    records = read_es_bulk(args.path) if args.es_bulk else read_ndjson(args.path)
+
+    IngestionPipeline(
+        index,
+        "job_ads",
+        embed_texts=embed_texts,
+        text_for=job_text,
+        metadata_for=job_metadata,
+        id_for=lambda job: job["job_id"],
+        embed_batch_size=args.embed_batch_size,
+        upsert_batch_size=args.upsert_batch_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+    ).run(records)
+
+
+if __name__ == "__main__":
+    main()
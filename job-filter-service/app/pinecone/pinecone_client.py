@@ -1,23 +1,64 @@
 import os
-from openai import OpenAI
-from pinecone import Pinecone
 from dotenv import load_dotenv
 from app.enums.job_ads_enums import ExperienceLevel, JobType, WorkMode
+from app.embeddings.embedding_cache import EmbeddingCache
+from app.embeddings.providers import provider_from_env, FULL_EMBEDDING_DIM, embedding_dimensions
+from app.lazy_client import LazyClient
+from app.pinecone_transport import open_index, probe_query
 
 load_dotenv()  
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 PINECONE_ENVIRONMENT = os.getenv("PINECONE_ENVIRONMENT")
-INDEX_NAME = os.getenv("PINECONE_INDEX_NAME")
+FULL_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# EMBEDDING_DIMENSIONS i index moraju da prate job-matcher-service
+EMBEDDING_DIMENSIONS = embedding_dimensions()
+COMPACT_INDEX_NAME = os.getenv("PINECONE_COMPACT_INDEX_NAME", f"{FULL_INDEX_NAME}-{EMBEDDING_DIMENSIONS}")
+INDEX_NAME = FULL_INDEX_NAME if EMBEDDING_DIMENSIONS == FULL_EMBEDDING_DIM else COMPACT_INDEX_NAME
 
-pc = Pinecone(api_key=PINECONE_API_KEY, environment=PINECONE_ENVIRONMENT)
-index = pc.Index(INDEX_NAME)
+# klijenti se prave pri prvoj upotrebi (i openai/pinecone paketi se tada importuju), a ne pri importu modula
+def _openai_client():
+    from openai import OpenAI
+    return OpenAI(api_key=OPENAI_API_KEY)
+
+def _pinecone_client():
+    from pinecone import Pinecone
+    return Pinecone(api_key=PINECONE_API_KEY, environment=PINECONE_ENVIRONMENT)
+
+client = LazyClient("openai", _openai_client)
+pc = LazyClient("pinecone", _pinecone_client)
+# PINECONE_TRANSPORT=rest|grpc bira transport (vidi app/pinecone_transport.py)
+index = LazyClient("pinecone-index", lambda: open_index(pc.get(), PINECONE_API_KEY, INDEX_NAME))
+
+# EMBEDDING_PROVIDER mora biti isti kao u job-matcher-service jer oba servisa pišu u isti index
+embedding_provider = provider_from_env(client)
+EMBEDDING_MODEL = embedding_provider.name
+
+# isti format keša kao u job-matcher-service, preko zajedničkog volume-a dele i disk tier
+embedding_cache = EmbeddingCache.from_env()
+
+def warm_up_steps():
+    """Koraci za lifespan warm-up: OpenAI klijent, Pinecone index i probni upit"""
+    return [
+        ("openai", client.get),
+        ("pinecone-index", index.get),
+        ("pinecone-probe", lambda: probe_query(index, EMBEDDING_DIMENSIONS)),
+    ]
+
+def embed_texts(texts):
+    """Bulk embedding bez keša, za ingestion"""
+    return embedding_provider.embed(texts)
+
+def job_embedding_text(title, description, experience_level, job_type, work_mode, city, country):
+    return f"{title}: {description}. Required level: {experience_level}, Job type: {job_type}, Work mode: {work_mode}, Location: {city}, {country}"
 
 def generate_job_embedding(title, description, experience_level, job_type, work_mode, city, country):
-    text = f"{title}: {description}. Required level: {experience_level}, Job type: {job_type}, Work mode: {work_mode}, Location: {city}, {country}"
-    response = client.embeddings.create(model="text-embedding-3-small", input=text)
-    return response.data[0].embedding
+    text = job_embedding_text(title, description, experience_level, job_type, work_mode, city, country)
+    return embedding_cache.get_or_compute(EMBEDDING_MODEL, text, lambda: embedding_provider.embed([text])[0])
+
 
+def generate_query_embedding(query: str):
+    """Embedding slobodnog teksta upita (hibridna pretraga), preko istog keša"""
+    return embedding_cache.get_or_compute(EMBEDDING_MODEL, query, lambda: embedding_provider.embed([query])[0])
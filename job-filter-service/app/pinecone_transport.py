@@ -0,0 +1,150 @@
+import asyncio
+import os
+
+import numpy as np
+
+# Zajednički modul za job-matcher-service i job-filter-service (isti fajl u oba servisa).
+# PINECONE_TRANSPORT=rest (default) koristi REST klijent - svaki vektor ide kao JSON tekst od 1536 brojeva.
+# PINECONE_TRANSPORT=grpc koristi gRPC klijent (pinecone[grpc]) - vektori idu kao binarni protobuf float-ovi,
+# preko jednog HTTP/2 kanala sa keep-alive ping-ovima.
+TRANSPORTS = ("rest", "grpc")
+
+PINECONE_TRANSPORT = os.getenv("PINECONE_TRANSPORT", "rest").lower()
+PINECONE_POOL_THREADS = int(os.getenv("PINECONE_POOL_THREADS", 10))
+PINECONE_CONNECTION_POOL_SIZE = int(os.getenv("PINECONE_CONNECTION_POOL_SIZE", 20))
+PINECONE_GRPC_TIMEOUT_SECONDS = float(os.getenv("PINECONE_GRPC_TIMEOUT_SECONDS", 20))
+PINECONE_GRPC_CONNECT_TIMEOUT_SECONDS = float(os.getenv("PINECONE_GRPC_CONNECT_TIMEOUT_SECONDS", 1))
+PINECONE_GRPC_KEEPALIVE_MS = int(os.getenv("PINECONE_GRPC_KEEPALIVE_MS", 30000))
+PINECONE_GRPC_KEEPALIVE_TIMEOUT_MS = int(os.getenv("PINECONE_GRPC_KEEPALIVE_TIMEOUT_MS", 10000))
+
+
+def vector_values(values):
+    """NumPy niz -> lista float-ova (klijenti primaju samo liste); liste prolaze nepromenjene"""
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float32, copy=False).tolist()
+    return values
+
+
+def _vector_record(vector):
+    if isinstance(vector, dict) and isinstance(vector.get("values"), np.ndarray):
+        return {**vector, "values": vector_values(vector["values"])}
+    if isinstance(vector, tuple) and len(vector) > 1 and isinstance(vector[1], np.ndarray):
+        return (vector[0], vector_values(vector[1]), *vector[2:])
+    return vector
+
+
+class VectorIndex:
+    """
+    Omotač oko REST ili gRPC index klijenta: query/upsert/update primaju i NumPy nizove.
+    Sve ostale metode (fetch, delete, list, describe_index_stats...) prosleđuju se klijentu.
+    """
+
+    def __init__(self, client, transport: str):
+        self.client = client
+        self.transport = transport
+
+    def query(self, vector=None, **kwargs):
+        return self.client.query(vector=vector_values(vector), **kwargs)
+
+    def upsert(self, vectors, **kwargs):
+        return self.client.upsert(vectors=[_vector_record(vector) for vector in vectors], **kwargs)
+
+    def update(self, id=None, values=None, **kwargs):
+        if values is not None:
+            kwargs["values"] = vector_values(values)
+        return self.client.update(id=id, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+class AsyncGrpcIndex:
+    """
+    Async interfejs (isti kao IndexAsyncio) nad gRPC index-om: zahtevi idu sa async_req=True,
+    a gRPC future se čeka kroz event loop, bez zauzimanja thread-a po zahtevu.
+    """
+
+    def __init__(self, index: VectorIndex):
+        self._index = index
+
+    async def _call(self, method, **kwargs):
+        return await asyncio.wrap_future(method(async_req=True, **kwargs))
+
+    async def query(self, **kwargs):
+        kwargs["vector"] = vector_values(kwargs.get("vector"))
+        return await self._call(self._index.client.query, **kwargs)
+
+    async def fetch(self, **kwargs):
+        return await self._call(self._index.client.fetch, **kwargs)
+
+    async def upsert(self, vectors, show_progress=False, **kwargs):
+        return await self._call(self._index.client.upsert, vectors=[_vector_record(vector) for vector in vectors], **kwargs)
+
+    async def update(self, **kwargs):
+        if kwargs.get("values") is not None:
+            kwargs["values"] = vector_values(kwargs["values"])
+        return await self._call(self._index.client.update, **kwargs)
+
+    async def delete(self, **kwargs):
+        return await self._call(self._index.client.delete, **kwargs)
+
+    async def close(self):
+        # kanal pripada sinhronom gRPC index-u i zatvara se zajedno sa njim
+        pass
+
+
+def _grpc_keepalive_options() -> dict:
+    return {
+        "grpc.keepalive_time_ms": PINECONE_GRPC_KEEPALIVE_MS,
+        "grpc.keepalive_timeout_ms": PINECONE_GRPC_KEEPALIVE_TIMEOUT_MS,
+        "grpc.keepalive_permit_without_calls": 1,
+        "grpc.http2.max_pings_without_data": 0,
+    }
+
+
+def _open_grpc_index(api_key: str, index_name: str, pool_threads: int):
+    try:
+        from pinecone.config import ConfigBuilder
+        from pinecone.grpc import GRPCClientConfig, PineconeGRPC
+        from pinecone.grpc.channel_factory import GrpcChannelFactory
+    except ImportError as e:
+        raise ValueError("PINECONE_TRANSPORT=grpc zahteva paket pinecone[grpc]") from e
+
+    class KeepaliveChannelFactory(GrpcChannelFactory):
+        # Pinecone SDK ne prosleđuje grpc_channel_options kanalu, pa se opcije dodaju ovde
+        def _build_options(self, target):
+            extra = tuple((self.grpc_client_config.grpc_channel_options or {}).items())
+            return super()._build_options(target) + extra
+
+    grpc_config = GRPCClientConfig(
+        timeout=PINECONE_GRPC_TIMEOUT_SECONDS,
+        conn_timeout=PINECONE_GRPC_CONNECT_TIMEOUT_SECONDS,
+        reuse_channel=True,
+        grpc_channel_options=_grpc_keepalive_options(),
+    )
+    pc = PineconeGRPC(api_key=api_key)
+    host = pc.describe_index(index_name).host
+    endpoint = host.replace("https://", "")
+    if ":" not in endpoint:
+        endpoint = f"{endpoint}:443"
+    config = ConfigBuilder.build(api_key=api_key, host=host)
+    channel = KeepaliveChannelFactory(config=config, grpc_client_config=grpc_config).create_channel(endpoint)
+    return pc.Index(index_name, host=host, grpc_config=grpc_config, pool_threads=pool_threads, channel=channel)
+
+
+def open_index(pc, api_key: str, index_name: str, transport: str = PINECONE_TRANSPORT,
+               pool_threads: int = PINECONE_POOL_THREADS) -> VectorIndex:
+    """Index klijent za izabrani transport; pc je REST Pinecone klijent (koristi se i za control plane)"""
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Nepoznat PINECONE_TRANSPORT: {transport} (dozvoljeno: {', '.join(TRANSPORTS)})")
+    if transport == "grpc":
+        return VectorIndex(_open_grpc_index(api_key, index_name, pool_threads), transport)
+    client = pc.Index(index_name, pool_threads=pool_threads, connection_pool_maxsize=PINECONE_CONNECTION_POOL_SIZE)
+    return VectorIndex(client, transport)
+
+
+def probe_query(index, dimensions: int, namespace: str = "job_ads"):
+    """Najjeftiniji upit (top_k=1, bez metadata) koji otvara konekciju do index-a; za async index vraća korutinu"""
+    probe = [0.0] * dimensions
+    probe[0] = 1.0
+    return index.query(vector=probe, top_k=1, namespace=namespace, include_metadata=False)
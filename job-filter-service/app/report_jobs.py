@@ -0,0 +1,235 @@
+import asyncio
+import inspect
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.pdf_stream import last_render_stats
+
+# Zajednički modul za job-matcher-service i job-filter-service (isti fajl u oba servisa).
+# Asinhroni PDF izveštaji: POST odmah vraća job id, podaci se dohvataju u web procesu (async ili u thread-u),
+# a FPDF renderovanje ide u ograničen pool procesa - dugačak izveštaj ne drži web worker ni GIL.
+# Za izveštaje bez gornje granice fetch vraća samo parametre upita, a render ih čita kao stream u worker-u.
+# Kad je red pun (REPORT_QUEUE_LIMIT aktivnih job-ova), novi zahtev se odbija umesto da uspori sve ostalo.
+# Stanje job-ova je u memoriji procesa (servis radi sa jednim uvicorn worker-om); PDF-ovi su na disku.
+
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", 2))
+REPORT_QUEUE_LIMIT = int(os.getenv("REPORT_QUEUE_LIMIT", 16))
+REPORT_JOB_TTL_SECONDS = int(os.getenv("REPORT_JOB_TTL_SECONDS", 3600))
+REPORT_JOBS_DIR = os.getenv("REPORT_JOBS_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports", "jobs"))
+
+ACTIVE_STATUSES = ("queued", "fetching", "rendering")
+
+# u worker procesu: red kroz koji se napredak javlja web procesu
+_progress_queue = None
+
+
+class ReportQueueFull(Exception):
+    """Previše aktivnih job-ova - zahtev se odbija (429)"""
+
+
+class NoReportData(Exception):
+    """Upit za izveštaj nije vratio nijedan red"""
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _render(job_id: str, render, args: tuple, output_path: str) -> tuple[str, dict | None]:
+    """
+    Izvršava se u worker procesu; render je funkcija na nivou modula (prenosi se kroz pickle).
+    Vraća putanju i statistiku renderovanja (strane, veličina, peak RSS) ako je render koristio StreamingPDF.
+    """
+    last = [0.0]
+
+    def progress(done: int, total: int):
+        fraction = done / total if total else 1.0
+        # najviše ~50 poruka po job-u, bez obzira na broj redova
+        if fraction - last[0] >= 0.02 or done == total:
+            last[0] = fraction
+            _progress_queue.put((job_id, fraction))
+
+    _progress_queue.put((job_id, 0.0))
+    path = render(*args, progress=progress, output_path=output_path)
+    return path, last_render_stats()
+
+
+class ReportJobs:
+    """
+    Registar job-ova + pool procesa za renderovanje. Pool se pravi pri prvom job-u (import ne pokreće procese),
+    a procesi se startuju sa "spawn", pa ne nasleđuju niti ni otvorene konekcije web procesa.
+    """
+
+    def __init__(self, workers: int = REPORT_WORKERS, queue_limit: int = REPORT_QUEUE_LIMIT,
+                 ttl_seconds: int = REPORT_JOB_TTL_SECONDS, output_dir: str = REPORT_JOBS_DIR):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.ttl_seconds = ttl_seconds
+        self.output_dir = output_dir
+        self.rejected = 0
+        self._jobs = {}
+        self._tasks = set()
+        self._lock = threading.Lock()
+        self._executor = None
+        self._progress_queue = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context("spawn")
+                self._progress_queue = context.Queue()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self._progress_queue,),
+                )
+                threading.Thread(target=self._drain_progress, args=(self._progress_queue,), daemon=True).start()
+            return self._executor
+
+    def _reset_pool(self, executor: ProcessPoolExecutor):
+        """
+        Worker koji je pao (OOM kill, segfault) trajno kvari ProcessPoolExecutor; pokvaren pool se gasi,
+        a sledeći job pravi novi. Ako je pool u međuvremenu već zamenjen, ne dira se novi.
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return
+            progress_queue = self._progress_queue
+            self._executor = self._progress_queue = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        # None zaustavlja drain thread starog pool-a
+        progress_queue.put(None)
+
+    def _drain_progress(self, progress_queue):
+        while True:
+            message = progress_queue.get()
+            if message is None:
+                return
+            job_id, fraction = message
+            job = self._jobs.get(job_id)
+            # prva poruka znači da je worker preuzeo job iz reda
+            if job is not None and job["status"] in ("queued", "rendering"):
+                job["status"] = "rendering"
+                job["progress"] = round(fraction, 3)
+
+    def _expire(self):
+        now = time.time()
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job["finished_at"] is not None and now - job["finished_at"] > self.ttl_seconds
+            ]
+            for job in expired:
+                del self._jobs[job["id"]]
+        for job in expired:
+            if job["path"] and os.path.exists(job["path"]):
+                os.remove(job["path"])
+
+    def active(self) -> int:
+        return sum(1 for job in list(self._jobs.values()) if job["status"] in ACTIVE_STATUSES)
+
+    def submit(self, kind: str, fetch, render) -> dict:
+        """
+        fetch: korutina ili sinhrona funkcija bez argumenata -> tuple argumenata za render (NoReportData ako nema redova).
+        render(*args, progress=, output_path=) pravi PDF u worker procesu i vraća putanju.
+        Mora se pozvati iz event loop-a (job se izvršava kao asyncio task).
+        """
+        self._expire()
+        with self._lock:
+            if sum(1 for job in self._jobs.values() if job["status"] in ACTIVE_STATUSES) >= self.queue_limit:
+                self.rejected += 1
+                raise ReportQueueFull(f"Red izveštaja je pun ({self.queue_limit} aktivnih job-ova)")
+            job_id = uuid.uuid4().hex
+            job = {
+                "id": job_id,
+                "kind": kind,
+                "status": "queued",
+                "progress": 0.0,
+                "error": None,
+                "path": None,
+                "render": None,
+                "created_at": time.time(),
+                "finished_at": None,
+            }
+            self._jobs[job_id] = job
+
+        task = asyncio.get_running_loop().create_task(self._run(job, fetch, render))
+        # referenca čuva task od garbage collector-a dok se ne završi
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return self.view(job)
+
+    async def _run(self, job: dict, fetch, render):
+        try:
+            job["status"] = "fetching"
+            args = await fetch() if inspect.iscoroutinefunction(fetch) else await asyncio.to_thread(fetch)
+
+            job["status"] = "queued"
+            os.makedirs(self.output_dir, exist_ok=True)
+            output_path = os.path.join(self.output_dir, f"{job['kind']}_{job['id']}.pdf")
+            loop = asyncio.get_running_loop()
+            executor = self._pool()
+            try:
+                job["path"], job["render"] = await loop.run_in_executor(executor, _render, job["id"], render, args, output_path)
+            except BrokenProcessPool:
+                self._reset_pool(executor)
+                raise
+            job.update(status="done", progress=1.0)
+        except NoReportData as e:
+            job.update(status="empty", error=str(e))
+        except Exception as e:
+            job.update(status="failed", error=f"{type(e).__name__}: {e}")
+        finally:
+            job["finished_at"] = time.time()
+
+    def get(self, job_id: str) -> dict | None:
+        self._expire()
+        return self._jobs.get(job_id)
+
+    @staticmethod
+    def view(job: dict) -> dict:
+        return {
+            "job_id": job["id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "progress": job["progress"],
+            "error": job["error"],
+            "render": job["render"],
+            "created_at": job["created_at"],
+            "finished_at": job["finished_at"],
+        }
+
+    def stats(self) -> dict:
+        statuses = {}
+        peaks = []
+        for job in list(self._jobs.values()):
+            statuses[job["status"]] = statuses.get(job["status"], 0) + 1
+            if job["render"]:
+                peaks.append(job["render"]["peak_rss_mb"])
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "active": self.active(),
+            "rejected": self.rejected,
+            "jobs": statuses,
+            # najveći peak RSS worker procesa među završenim job-ovima
+            "peak_rss_mb": max(peaks, default=None),
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, progress_queue = self._executor, self._progress_queue
+            self._executor = self._progress_queue = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            progress_queue.put(None)
+
+
+report_jobs = ReportJobs()
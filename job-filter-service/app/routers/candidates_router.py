@@ -2,12 +2,16 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 from typing import List, Optional, Any
 import uuid
-from app.models import CandidateCreate, CandidateUpdate, CandidateBase
+from app.models import CandidateCreate, CandidateUpdate, CandidateBase, MgetRequest
+from app.crud_operations.common import MGET_MAX_IDS, mget_documents, normalize_ids
 from app.database import es
 from elasticsearch.exceptions import NotFoundError
 from app.crud_operations.candidates import search_by_experience_and_city, search_by_skills_and_education
-from fastapi.responses import FileResponse
-from app.generate_scripts.es_reports import fetch_candidates, generate_pdf_candidates   
+from fastapi.responses import FileResponse, StreamingResponse
+from app.generate_scripts.es_reports import count_candidates, stream_candidates, generate_pdf_candidates, render_candidates_report, build_query_candidates
+from app.crud_operations.export import EXPORT_MEDIA_TYPES, export_chunks, export_columns
+from app.report_jobs import NoReportData
+from app.routers.report_jobs_router import submit_report_job
 from app.enums.candidates_enums import EducationLevel
 import os
 
@@ -27,18 +31,63 @@ def generate_candidates_report(
     }
 
     try:
-        candidates = fetch_candidates(filters)
+        total = count_candidates(filters)
 
-        if not candidates:
+        if not total:
             raise HTTPException(status_code=404, detail="No candidates found for the given filters")
 
-        pdf_file = generate_pdf_candidates(candidates, filters)
+        pdf_file = generate_pdf_candidates(stream_candidates(filters), filters, total=total)
         return FileResponse(pdf_file, media_type="application/pdf", filename=os.path.basename(pdf_file))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/report/jobs", status_code=202, summary="Generate Candidates PDF report kao pozadinski job")
+async def submit_candidates_report_job(
+    education_level: EducationLevel = Query(None, description="Education level filter"),
+    min_years_experience: int = Query(None, description="Minimal years of experience")
+):
+    filters = {
+        "education_level": education_level.value if education_level else None,
+        "min_years_experience": min_years_experience
+    }
+
+    def fetch():
+        total = count_candidates(filters)
+        if not total:
+            raise NoReportData("No candidates found for the given filters")
+        return filters, total
+
+    return submit_report_job("candidates_report", fetch, render_candidates_report)
+
+
+@router.get("/export", summary="Izvoz svih kandidata po filterima (CSV / NDJSON, stream bez limita od 1000)")
+def export_candidates(
+    education_level: EducationLevel = Query(None, description="Education level filter"),
+    min_years_experience: int = Query(None, description="Minimal years of experience"),
+    fields: Optional[List[str]] = Query(None, description="Kolone (ponovljen parametar ili razdvojene zarezom); default sve"),
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$")
+):
+    filters = {
+        "education_level": education_level.value if education_level else None,
+        "min_years_experience": min_years_experience
+    }
+    try:
+        columns = export_columns("candidates", fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        chunks = export_chunks("candidates", build_query_candidates(filters), columns, export_format)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="candidates_export.{export_format}"'},
+    )
+
+
 @router.post("/search/by-experience-city", response_model=dict)
 def search_candidates_by_experience_and_city(payload: dict):
     try:
@@ -73,6 +122,32 @@ def search_candidates_by_skills_and_education(payload: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _mget(ids: List[str], fields: Optional[List[str]]) -> dict:
+    ids = normalize_ids(ids)
+    if not ids:
+        raise HTTPException(status_code=400, detail="Potreban je bar jedan id")
+    if len(ids) > MGET_MAX_IDS:
+        raise HTTPException(status_code=413, detail=f"Najviše {MGET_MAX_IDS} id-jeva po zahtevu")
+    try:
+        results, missing = mget_documents("candidates", ids, fields)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"count": len(results), "results": results, "missing": missing}
+
+
+@router.get("", response_model=dict, summary="Više kandidata po id-jevima, u redosledu zahteva")
+def get_candidates_endpoint(
+    ids: List[str] = Query(..., description="Id-jevi (ponovljen parametar ili razdvojeni zarezom)"),
+    fields: Optional[List[str]] = Query(None, description="Samo ova polja iz _source")
+):
+    return _mget(ids, fields)
+
+
+@router.post("/mget", response_model=dict, summary="Više kandidata po id-jevima (duge liste id-jeva u telu zahteva)")
+def mget_candidates_endpoint(request: MgetRequest):
+    return _mget(request.ids, request.fields)
+
+
 @router.post("/", response_model=dict)
 def create_candidate_endpoint(candidate: CandidateCreate):
     cid = str(uuid.uuid4())
@@ -1,14 +1,21 @@
 import os
 from fastapi import APIRouter, HTTPException, Query
-from typing import List
+from typing import List, Optional
 import uuid
 from elasticsearch.exceptions import NotFoundError
 from app.database import es
-from app.models import JobAdCreate, JobAdUpdate, JobAdResult
+from app.models import JobAdCreate, JobAdUpdate, JobAdResult, MgetRequest, HybridSearchRequest
+from app.crud_operations.hybrid_search import HYBRID_DEPTH, HYBRID_RRF_K, hybrid_search
+from app.crud_operations.common import MGET_MAX_IDS, mget_documents, normalize_ids
 from app.enums.job_ads_enums import JobType, ExperienceLevel, WorkMode
 from app.crud_operations.job_ads import search_by_desc_exp, create_job_ad_saga, create_job_ad_saga_simulation
-from fastapi.responses import FileResponse
-from app.generate_scripts.es_reports import fetch_job_ads, generate_pdf_job_ads, fetch_complex_jobads, generate_complex_jobads_pdf
+from fastapi.responses import FileResponse, StreamingResponse
+from app.generate_scripts.es_reports import count_job_ads, stream_job_ads, generate_pdf_job_ads, render_job_ads_report
+from app.generate_scripts.es_reports import count_complex_jobads, stream_complex_jobads, generate_complex_jobads_pdf, render_complex_jobads_report
+from app.generate_scripts.es_reports import build_query_job_ads, build_complex_jobads_query
+from app.crud_operations.export import EXPORT_MEDIA_TYPES, SCORE_ORDER, export_chunks, export_columns
+from app.report_jobs import NoReportData
+from app.routers.report_jobs_router import submit_report_job
 import os
 
 router = APIRouter(
@@ -22,17 +29,34 @@ def generate_complex_report(
     work_mode: WorkMode = Query(None, description="Work mode filter: remote / onsite / hybrid")
 ):
     try:
-        jobs = fetch_complex_jobads(description_keywords, work_mode)
-        if not jobs:
+        total = count_complex_jobads(description_keywords, work_mode)
+        if not total:
             raise HTTPException(status_code=404, detail="No jobs found for the given keywords and work mode")
 
-        pdf_file = generate_complex_jobads_pdf(jobs, description_keywords, work_mode)
+        # oglasi stižu iz ES stranicu po stranicu, a PDF stranice idu na disk čim se završe
+        jobs = stream_complex_jobads(description_keywords, work_mode)
+        pdf_file = generate_complex_jobads_pdf(jobs, description_keywords, work_mode, total=total)
         return FileResponse(pdf_file, media_type="application/pdf", filename=os.path.basename(pdf_file))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/complex_report/jobs", status_code=202, summary="Complex JobAds PDF report kao pozadinski job")
+async def submit_complex_report_job(
+    description_keywords: str = Query(..., description="Keywords to search in description"),
+    work_mode: WorkMode = Query(None, description="Work mode filter: remote / onsite / hybrid")
+):
+    # ES count ide u thread, a oglase worker proces čita kao stream dok renderuje - web worker je odmah slobodan
+    def fetch():
+        total = count_complex_jobads(description_keywords, work_mode)
+        if not total:
+            raise NoReportData("No jobs found for the given keywords and work mode")
+        return description_keywords, work_mode, total
+
+    return submit_report_job("complex_jobads_report", fetch, render_complex_jobads_report)
+
+
 @router.get("/report", summary="Generate JobAds PDF report")
 def generate_jobads_report(
     job_type: JobType = Query(None, description="Job type filter"),
@@ -44,18 +68,79 @@ def generate_jobads_report(
     }
 
     try:
-        jobs = fetch_job_ads(filters)
+        total = count_job_ads(filters)
 
-        if not jobs:
+        if not total:
             raise HTTPException(status_code=404, detail="No jobs found for the given filters")
 
-        pdf_file = generate_pdf_job_ads(jobs, filters)
+        pdf_file = generate_pdf_job_ads(stream_job_ads(filters), filters, total=total)
         return FileResponse(pdf_file, media_type="application/pdf", filename=os.path.basename(pdf_file))
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/report/jobs", status_code=202, summary="Generate JobAds PDF report kao pozadinski job")
+async def submit_jobads_report_job(
+    job_type: JobType = Query(None, description="Job type filter"),
+    experience_level: ExperienceLevel = Query(None, description="Experience level filter")
+):
+    filters = {
+        "job_type": job_type.value if job_type else None,
+        "experience_level": experience_level.value if experience_level else None
+    }
+
+    def fetch():
+        total = count_job_ads(filters)
+        if not total:
+            raise NoReportData("No jobs found for the given filters")
+        return filters, total
+
+    return submit_report_job("jobads_report", fetch, render_job_ads_report)
+
+
+def _export(query: dict, fields: Optional[List[str]], export_format: str, filename: str, sort: Optional[list] = None) -> StreamingResponse:
+    try:
+        columns = export_columns("job_ads", fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        chunks = export_chunks("job_ads", query, columns, export_format, sort)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
+
+
+@router.get("/export", summary="Izvoz svih oglasa po filterima (CSV / NDJSON, stream bez limita od 1000)")
+def export_jobads(
+    job_type: JobType = Query(None, description="Job type filter"),
+    experience_level: ExperienceLevel = Query(None, description="Experience level filter"),
+    fields: Optional[List[str]] = Query(None, description="Kolone (ponovljen parametar ili razdvojene zarezom); default sve"),
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$")
+):
+    filters = {
+        "job_type": job_type.value if job_type else None,
+        "experience_level": experience_level.value if experience_level else None
+    }
+    return _export(build_query_job_ads(filters), fields, export_format, "jobads_export")
+
+
+@router.get("/complex_export", summary="Izvoz oglasa po ključnim rečima u opisu i work mode-u (CSV / NDJSON)")
+def export_complex_jobads(
+    description_keywords: str = Query(..., description="Keywords to search in description"),
+    work_mode: WorkMode = Query(None, description="Work mode filter: remote / onsite / hybrid"),
+    fields: Optional[List[str]] = Query(None, description="Kolone (ponovljen parametar ili razdvojene zarezom); default sve"),
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$")
+):
+    query = build_complex_jobads_query(description_keywords, work_mode.value if work_mode else None)
+    # full-text upit - redovi po relevantnosti
+    return _export(query, fields, export_format, "complex_jobads_export", SCORE_ORDER)
+
+
 @router.post("/search", response_model=dict)
 def search_jobs(payload: dict):
     try:
@@ -71,6 +156,24 @@ def search_jobs(payload: dict):
         raise HTTPException(status_code=500, detail=str(e))
     
 
+@router.post("/hybrid-search", response_model=dict, summary="BM25 (ES) + vektorska (Pinecone) pretraga spojena RRF-om")
+async def hybrid_search_jobs(request: HybridSearchRequest):
+    payload = request.model_dump(mode="json", include={"query", "required_experience_level", "work_modes", "city"})
+    try:
+        return await hybrid_search(
+            payload,
+            top_k=request.top_k,
+            bm25_weight=request.bm25_weight,
+            vector_weight=request.vector_weight,
+            rrf_k=request.rrf_k or HYBRID_RRF_K,
+            depth=request.depth or HYBRID_DEPTH,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 #   @router.post("/", response_model=dict)
 #   def create_job_endpoint(job: JobAdCreate):
 #    jid = str(uuid.uuid4())
@@ -109,6 +212,32 @@ def create_job_ad_endpoint(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _mget(ids: List[str], fields: Optional[List[str]]) -> dict:
+    ids = normalize_ids(ids)
+    if not ids:
+        raise HTTPException(status_code=400, detail="Potreban je bar jedan id")
+    if len(ids) > MGET_MAX_IDS:
+        raise HTTPException(status_code=413, detail=f"Najviše {MGET_MAX_IDS} id-jeva po zahtevu")
+    try:
+        results, missing = mget_documents("job_ads", ids, fields)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"count": len(results), "results": results, "missing": missing}
+
+
+@router.get("", response_model=dict, summary="Više oglasa po id-jevima, u redosledu zahteva")
+def get_job_ads_endpoint(
+    ids: List[str] = Query(..., description="Id-jevi (ponovljen parametar ili razdvojeni zarezom)"),
+    fields: Optional[List[str]] = Query(None, description="Samo ova polja iz _source")
+):
+    return _mget(ids, fields)
+
+
+@router.post("/mget", response_model=dict, summary="Više oglasa po id-jevima (duge liste id-jeva u telu zahteva)")
+def mget_job_ads_endpoint(request: MgetRequest):
+    return _mget(request.ids, request.fields)
+
+
 @router.get("/{jid}", response_model=JobAdResult)
 def read_job_endpoint(jid: str):
     try:
@@ -0,0 +1,48 @@
+import os
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+from app.report_jobs import ReportQueueFull, report_jobs
+
+router = APIRouter(prefix="/reports/jobs", tags=["Report Jobs"])
+
+
+def submit_report_job(kind: str, fetch, render) -> dict:
+    """Pokreće job za izveštaj i vraća telo 202 odgovora; pun red -> 429"""
+    try:
+        job = report_jobs.submit(kind, fetch, render)
+    except ReportQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "10"})
+    return {
+        **job,
+        "status_url": f"{router.prefix}/{job['job_id']}",
+        "download_url": f"{router.prefix}/{job['job_id']}/download",
+    }
+
+
+def _job_or_404(job_id: str) -> dict:
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found (nepostojeći ili istekao)")
+    return job
+
+
+@router.get("", summary="Stanje reda izveštaja")
+async def report_jobs_stats():
+    return report_jobs.stats()
+
+
+@router.get("/{job_id}", summary="Status i napredak job-a za izveštaj")
+async def report_job_status(job_id: str):
+    return report_jobs.view(_job_or_404(job_id))
+
+
+@router.get("/{job_id}/download", summary="Gotov PDF izveštaj")
+async def report_job_download(job_id: str):
+    job = _job_or_404(job_id)
+    if job["status"] == "empty":
+        raise HTTPException(status_code=404, detail=job["error"])
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=job["error"])
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"Izveštaj još nije gotov (status: {job['status']})")
+    return FileResponse(job["path"], media_type="application/pdf", filename=os.path.basename(job["path"]))
@@ -0,0 +1,130 @@
+import argparse
+import multiprocessing
+import os
+import random
+import re
+import resource
+import tempfile
+import time
+
+# Propusnost PDF izveštaja (app.pdf_layout) na 1k / 10k / 100k oglasa, bez Elasticsearch-a (sintetički podaci):
+#   python -m benchmarks.pdf_layout_benchmark --sizes 1000,10000,100000
+#   python -m benchmarks.pdf_layout_benchmark --sizes 1000,10000 --legacy     (poređenje sa dvostrukim multi_cell)
+#   python -m benchmarks.pdf_layout_benchmark --sizes 100000 --stream          (oglasi kao generator, kao ES stream)
+# Svaki slučaj ide u svežem procesu, pa je peak RSS tog procesa vršna memorija jednog izveštaja.
+
+WORDS = (
+    "python backend frontend developer engineer team remote hybrid onsite experience cloud docker kubernetes "
+    "sql api design testing agile product customer data pipeline platform services microservices security "
+    "monitoring deployment scalable reliable communication english mentoring ownership startup enterprise"
+).split()
+CITIES = ["Beograd", "Novi Sad", "Nis", "Kragujevac", "Subotica"]
+REPORTS = ("job_ads", "complex")
+
+
+def iter_jobs(count: int, seed: int):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield {
+            "title": " ".join(rng.choices(WORDS, k=3)).title(),
+            "description": " ".join(rng.choices(WORDS, k=rng.randint(30, 120))) + ".",
+            "work_mode": rng.choice(["remote", "onsite", "hybrid"]),
+            "city": rng.choice(CITIES),
+            "country": "Serbia",
+        }
+
+
+def sample_jobs(count: int, seed: int) -> list[dict]:
+    return list(iter_jobs(count, seed))
+
+
+def legacy_complex_jobads_pdf(jobs, description_keywords, work_mode, output_path):
+    """Raniji generate_complex_jobads_pdf: multi_cell(split_only=True) za visinu, pa multi_cell za crtanje"""
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_auto_page_break(auto=False, margin=15)
+    pdf.set_font("Arial", "", 12)
+    line_height = 6
+    page_bottom = pdf.h - pdf.b_margin
+    for job in jobs:
+        desc_lines = pdf.multi_cell(0, line_height, f"Description: {job['description']}", border=0, split_only=True)
+        if pdf.get_y() + line_height * (len(desc_lines) + 5) > page_bottom:
+            pdf.add_page()
+        pdf.set_font("Arial", "B", 12)
+        pdf.cell(0, 8, f"Title: {job['title']}", ln=True)
+        pdf.set_font("Arial", "", 12)
+        pdf.multi_cell(0, line_height, f"Description: {job['description']}")
+        pdf.cell(0, 8, f"Work Mode: {job['work_mode']}", ln=True)
+        pdf.cell(0, 8, f"City: {job['city']}", ln=True)
+        pdf.cell(0, 8, f"Country: {job['country']}", ln=True)
+        pdf.ln(5)
+        pdf.cell(0, 0, "-" * 100, ln=True)
+        pdf.ln(5)
+    pdf.output(output_path)
+    return output_path
+
+
+def run_case(report: str, size: int, seed: int, output_dir: str, stream: bool = False) -> dict:
+    from app.generate_scripts.es_reports import generate_complex_jobads_pdf, generate_pdf_job_ads
+
+    # stream: oglasi se prave tek kad ih izveštaj traži, pa ni ulaz ne raste sa brojem oglasa
+    jobs = iter_jobs(size, seed) if stream else sample_jobs(size, seed)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    output_path = os.path.join(output_dir, f"{report}_{size}.pdf")
+
+    started = time.perf_counter()
+    if report == "job_ads":
+        generate_pdf_job_ads(jobs, {"job_type": "full-time"}, output_path=output_path, total=size)
+    elif report == "complex":
+        generate_complex_jobads_pdf(jobs, "python", "remote", output_path=output_path, total=size)
+    else:
+        legacy_complex_jobads_pdf(jobs, "python", "remote", output_path)
+    seconds = time.perf_counter() - started
+    # ru_maxrss je u KB na Linux-u; meri se pre čitanja fajla za brojanje strana
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with open(output_path, "rb") as f:
+        pages = len(re.findall(rb"/Type /Page\b(?!s)", f.read()))
+    return {
+        "report": report,
+        "records": size,
+        "pages": pages,
+        "seconds": seconds,
+        "pages_per_sec": pages / seconds,
+        "records_per_sec": size / seconds,
+        "peak_rss_mb": rss_peak / 1024,
+        "rss_growth_mb": (rss_peak - rss_before) / 1024,
+        "file_mb": os.path.getsize(output_path) / 1024 / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Propusnost i memorija PDF izveštaja")
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--reports", default=",".join(REPORTS), help="job_ads,complex")
+    parser.add_argument("--legacy", action="store_true", help="Dodaj i raniji complex izveštaj (dvostruki multi_cell)")
+    parser.add_argument("--stream", action="store_true", help="Oglasi kao generator umesto liste")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    reports = args.reports.split(",") + (["legacy"] if args.legacy else [])
+    context = multiprocessing.get_context("spawn")
+
+    print(f"{'report':<10} {'records':>8} {'pages':>7} {'sec':>8} {'pages/s':>9} {'records/s':>10} {'peak MB':>8} {'+MB':>7} {'file MB':>8}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        for size in sizes:
+            for report in reports:
+                with context.Pool(1) as pool:
+                    result = pool.apply(run_case, (report, size, args.seed, output_dir, args.stream))
+                print(
+                    f"{result['report']:<10} {result['records']:>8} {result['pages']:>7} {result['seconds']:>8.2f} "
+                    f"{result['pages_per_sec']:>9.1f} {result['records_per_sec']:>10.0f} {result['peak_rss_mb']:>8.1f} "
+                    f"{result['rss_growth_mb']:>7.1f} {result['file_mb']:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import asyncio
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def approx_size(value) -> int:
+    """Gruba procena memorije rezultata (dict/list/tuple strukture)"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approx_size(key) + approx_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approx_size(item) for item in value)
+    return size
+
+
+class TTLCache:
+    """
+    Thread-safe LRU keš sa TTL-om i ograničenim brojem unosa.
+    weigher (opciono) procenjuje veličinu vrednosti u bajtovima, pa stats prikazuje i zauzetu memoriju;
+    uz max_bytes se najstariji unosi izbacuju i kad ukupna veličina pređe granicu.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float | None = None, weigher=None, max_bytes: int | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.weigher = weigher
+        self.max_bytes = max_bytes if weigher else None
+        self.weight = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Vraća vrednost za ključ ili None ako je nema ili je istekla"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, weight = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                self.weight -= weight
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        weight = self.weigher(value) if self.weigher else 0
+        with self._lock:
+            previous = self._data.get(key)
+            if previous is not None:
+                self.weight -= previous[2]
+            self._data[key] = (value, expires_at, weight)
+            self.weight += weight
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries or (self.max_bytes and self._data and self.weight > self.max_bytes):
+                _, (_, _, evicted_weight) = self._data.popitem(last=False)
+                self.weight -= evicted_weight
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is not None:
+                self.weight -= entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        stats = {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+        if self.weigher:
+            stats["approx_bytes"] = self.weight
+        if self.max_bytes:
+            stats["max_bytes"] = self.max_bytes
+        return stats
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Deduplikacija istovremenih poziva: za isti ključ samo prvi thread izvršava fn,
+    ostali čekaju i dobijaju isti rezultat (ili isti exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """Vraća (rezultat, shared) - shared je True ako je rezultat dobijen od tuđeg poziva"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.result, False
+
+
+class AsyncSingleFlight:
+    """
+    asyncio verzija SingleFlight-a (jedan event loop po procesu): za isti ključ radi samo prvi Task,
+    ostale korutine čekaju njegov rezultat. Otkazivanje jednog pozivaoca ne otkazuje zajednički poziv.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn):
+        """Vraća (rezultat, shared) kao SingleFlight.do, samo što je fn async funkcija"""
+        task = self._calls.get(key)
+        if task is not None:
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = task
+
+        def forget(_):
+            if self._calls.get(key) is task:
+                del self._calls[key]
+
+        task.add_done_callback(forget)
+        return await asyncio.shield(task), False
@@ -0,0 +1,128 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+# Zajednički modul za job-matcher-service i job-filter-service (isti fajl u oba servisa).
+# Dnevnik upisa u Pinecone namespace-ove u SQLite fajlu na zajedničkom volume-u (pored keša embedding-a):
+# svaki proces koji piše (uvicorn worker-i, saga u job-filter-service, ingestion) dodaje (namespace, id, op),
+# a lokalni index-i drugih procesa iz njega primenjuju samo izmene posle poslednjeg viđenog seq-a.
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CHANGE_LOG_PATH = os.path.join(BASE_DIR, "cache", "changes.sqlite")
+
+CHANGE_LOG_ENABLED = os.getenv("CHANGE_LOG_ENABLED", "true").lower() == "true"
+CHANGE_LOG_PATH = os.getenv("CHANGE_LOG_PATH", DEFAULT_CHANGE_LOG_PATH)
+# čuva se samo poslednjih N izmena; čitalac koji zaostane više od toga radi ceo refresh
+CHANGE_LOG_MAX_ROWS = int(os.getenv("CHANGE_LOG_MAX_ROWS", 100000))
+
+
+def origin() -> str:
+    """Oznaka procesa koji piše - čitalac preskače svoje upise (već su u njegovim index-ima)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class ChangeLog:
+    """
+    SQLite tabela izmena sa rastućim seq-om (AUTOINCREMENT - seq se ne ponavlja ni posle brisanja starih redova).
+    Konekcija se otvara lenjo i posebno u svakom procesu (posle fork-a se ne deli).
+    Greške dnevnika se samo loguju: upis u Pinecone je već uspeo, a čitaoci imaju periodični ceo refresh.
+    """
+
+    def __init__(self, path: str, max_rows: int = 100000, enabled: bool = True):
+        self.path = path
+        self.max_rows = max_rows
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._writes_since_prune = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    namespace TEXT NOT NULL,
+                    doc_id TEXT NOT NULL,
+                    op TEXT NOT NULL,
+                    origin TEXT NOT NULL,
+                    at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_changes_namespace_seq ON changes(namespace, seq)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def record(self, namespace: str, doc_ids, op: str) -> int | None:
+        """Upisuje izmene (op je "upsert" ili "delete"); vraća seq poslednje ili None ako dnevnik nije dostupan"""
+        doc_ids = list(doc_ids)
+        if not self.enabled or not doc_ids:
+            return None
+        now, writer = time.time(), origin()
+        try:
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    conn.executemany(
+                        "INSERT INTO changes (namespace, doc_id, op, origin, at) VALUES (?, ?, ?, ?, ?)",
+                        [(namespace, doc_id, op, writer, now) for doc_id in doc_ids],
+                    )
+                    seq = conn.execute("SELECT MAX(seq) FROM changes").fetchone()[0]
+                self._writes_since_prune += len(doc_ids)
+                # brisanje starih redova ne radimo na svakom upisu
+                if self._writes_since_prune >= 1000:
+                    self._writes_since_prune = 0
+                    conn.execute("DELETE FROM changes WHERE seq <= ?", (seq - self.max_rows,))
+            return seq
+        except (sqlite3.Error, OSError) as e:
+            print(f"Dnevnik izmena ({namespace}) nije upisan: {e}")
+            return None
+
+    def version(self, namespace: str) -> int | None:
+        """Seq poslednje izmene namespace-a (0 ako je nije bilo), None ako dnevnik nije dostupan"""
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                row = self._connection().execute("SELECT MAX(seq) FROM changes WHERE namespace = ?", (namespace,)).fetchone()
+            return row[0] or 0
+        except (sqlite3.Error, OSError) as e:
+            print(f"Dnevnik izmena ({namespace}) nije pročitan: {e}")
+            return None
+
+    def since(self, namespace: str, seq: int, limit: int) -> list[tuple[int, str, str, str]] | None:
+        """
+        Izmene posle seq-a kao (seq, doc_id, op, origin), najviše limit.
+        None znači da nastavak nije moguć (dnevnik nedostupan ili su izmene posle seq-a već obrisane) - treba ceo refresh.
+        """
+        if not self.enabled:
+            return None
+        try:
+            with self._lock:
+                conn = self._connection()
+                oldest = conn.execute("SELECT MIN(seq) FROM changes").fetchone()[0]
+                if oldest is not None and oldest > seq + 1:
+                    return None
+                return conn.execute(
+                    "SELECT seq, doc_id, op, origin FROM changes WHERE namespace = ? AND seq > ? ORDER BY seq LIMIT ?",
+                    (namespace, seq, limit),
+                ).fetchall()
+        except (sqlite3.Error, OSError) as e:
+            print(f"Dnevnik izmena ({namespace}) nije pročitan: {e}")
+            return None
+
+
+change_log = ChangeLog(CHANGE_LOG_PATH, CHANGE_LOG_MAX_ROWS, CHANGE_LOG_ENABLED)
+
+
+def record_changes(namespace: str, doc_ids, op: str = "upsert") -> int | None:
+    return change_log.record(namespace, doc_ids, op)
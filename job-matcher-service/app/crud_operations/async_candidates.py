@@ -0,0 +1,191 @@
+import asyncio
+import uuid
+
+from app.database import get_async_index, EMBEDDING_DIMENSIONS
+from app.embeddings.embedding_client import aget_embedding, skills_table
+from app.embeddings.skills_table import canonicalize_skills, skills_query_text
+from app.crud_operations.async_common import fetch_many, fetch_metadata, apply_update
+from app.crud_operations.candidates import (
+    RANKED_TOP_K,
+    candidate_changes,
+    candidate_embedding_text,
+    candidate_filter,
+    candidate_metadata,
+    candidate_text_from_metadata,
+    search_candidate_vectors,
+    validate_education_level,
+    validate_skills,
+)
+from app.matching.rerank import fetch_size, mentioned_skills, rerank
+from app.search.indexes import candidates_metadata_index, metadata_index_for
+from app.search.result_cache import namespace_versions
+from app.search.vector_engine import sync_vector_engine, vector_engine_for
+
+# CRUD i pretraga kandidata za async router-e (pravila su u candidates.py): OpenAI/Pinecone pozivi idu
+# preko async klijenata umesto da blokiraju thread iz threadpool-a.
+
+async def create_candidate(firstname: str, lastname: str, skills: list[str], education_level: str, years_experience: float, city: str, country: str) -> str:
+    validate_education_level(education_level)
+    validate_skills(skills)
+
+    candidate_id = str(uuid.uuid4())
+    text = candidate_embedding_text(firstname, lastname, skills, education_level, years_experience, city, country)
+    embedding = await aget_embedding(text)
+
+    vector = {
+        "id": candidate_id,
+        "values": embedding,
+        "metadata": candidate_metadata(firstname, lastname, skills, education_level, years_experience, city, country, text)
+    }
+
+    index = await get_async_index()
+    await index.upsert(vectors=[vector], namespace="candidates", show_progress=False)
+    candidates_metadata_index.upsert(candidate_id, vector["metadata"])
+    sync_vector_engine("candidates", "upsert", candidate_id, vector["metadata"], embedding)
+    namespace_versions.bump("candidates", [candidate_id])
+    return candidate_id
+
+async def get_candidate_by_id(candidate_id: str) -> dict | None:
+    index = await get_async_index()
+    response = await index.fetch(ids=[candidate_id], namespace="candidates")
+    if response.vectors:
+        return response.vectors.get(candidate_id)
+    return None
+
+async def delete_candidate(candidate_id: str) -> bool:
+    index = await get_async_index()
+    await index.delete(ids=[candidate_id], namespace="candidates")
+    candidates_metadata_index.delete(candidate_id)
+    sync_vector_engine("candidates", "delete", candidate_id)
+    namespace_versions.bump("candidates", [candidate_id], "delete")
+    return True
+
+async def update_candidate(candidate_id: str, **kwargs) -> bool:
+    current = await fetch_metadata(candidate_id, "candidates")
+    if current is None:
+        return False
+
+    changes = candidate_changes(current, kwargs)
+    if not changes:
+        return True
+
+    set_metadata, values = await apply_update(candidate_id, "candidates", current, changes, candidate_text_from_metadata)
+    candidates_metadata_index.update(candidate_id, set_metadata)
+    sync_vector_engine("candidates", "update", candidate_id, {**current, **set_metadata}, values)
+    namespace_versions.bump("candidates", [candidate_id])
+    return True
+
+async def generate_skills_embedding(skill_query: str):
+    skills = canonicalize_skills(skill_query)
+    if skills:
+        embedding = skills_table.lookup(skills)
+        if embedding is not None:
+            return embedding
+        return await aget_embedding(skills_query_text(skills))
+
+    return await aget_embedding(f"Skills: {skill_query}")
+
+async def rank_candidates(
+    skill_query: str | None = None,
+    education_level: str | None = None,
+    min_years_experience: float | None = None,
+    top_k: int = RANKED_TOP_K
+) -> list[tuple[str, float | None]]:
+    if not skill_query:
+        metadata_index = metadata_index_for("candidates")
+        if metadata_index is not None:
+            # ceo namespace može da prođe filter, pa se sortiranje radi van event loop-a
+            hits = await asyncio.to_thread(
+                metadata_index.query,
+                equals={"education_level": education_level},
+                ranges={"years_experience": (min_years_experience, None)}
+            )
+            return [(doc_id, None) for doc_id, _ in hits]
+
+    embedding = await generate_skills_embedding(skill_query) if skill_query else [0.0] * EMBEDDING_DIMENSIONS
+
+    engine = vector_engine_for("candidates")
+    if engine is not None:
+        ranked = await asyncio.to_thread(search_candidate_vectors, engine, embedding, top_k, education_level, min_years_experience)
+        return [(candidate_id, score if skill_query else None) for candidate_id, score in ranked]
+
+    index = await get_async_index()
+    response = await index.query(
+        namespace="candidates",
+        vector=embedding,
+        top_k=top_k,
+        include_metadata=False,
+        filter=candidate_filter(education_level, min_years_experience),
+    )
+    return [(match.id, match.score if skill_query else None) for match in response.matches]
+
+async def rerank_candidates(
+    skill_query: str | None = None,
+    education_level: str | None = None,
+    min_years_experience: float | None = None,
+    max_years_experience: float | None = None,
+    city: str | None = None,
+    top_k: int = RANKED_TOP_K
+) -> list[tuple[str, float, dict]]:
+    """
+    rank_candidates sa over-fetch-om + strukturni re-ranking (app.matching.rerank).
+    education_level i min_years_experience ostaju tvrdi filteri; max_years_experience i city samo menjaju skor.
+    Bez skill_query nema semantičkog redosleda, pa se re-rangiraju svi kandidati koji prolaze filter
+    (iz lokalnog metadata index-a); ako index nije dostupan, ValueError.
+    """
+    if skill_query:
+        ranked = await rank_candidates(skill_query, education_level, min_years_experience, top_k=fetch_size(top_k))
+        scores = dict(ranked)
+        records, _ = await fetch_many("candidates", list(scores))
+        candidates = [{**record, "score": scores[record["id"]]} for record in records]
+    else:
+        metadata_index = metadata_index_for("candidates")
+        if metadata_index is None:
+            raise ValueError("rerank bez skill_query zahteva učitan metadata index kandidata")
+        hits = await asyncio.to_thread(
+            metadata_index.query,
+            equals={"education_level": education_level},
+            ranges={"years_experience": (min_years_experience, None)}
+        )
+        candidates = [{"id": doc_id, "metadata": metadata, "score": None} for doc_id, metadata in hits]
+
+    reranked = await asyncio.to_thread(
+        rerank,
+        candidates,
+        top_k,
+        version=namespace_versions.get("candidates"),
+        required_skills=canonicalize_skills(skill_query) or mentioned_skills(skill_query),
+        min_years=min_years_experience,
+        max_years=max_years_experience,
+        city=city,
+    )
+    return [(candidate["id"], candidate["score"], candidate["features"]) for candidate in reranked]
+
+async def hydrate_candidates(ranked: list[tuple]) -> list[dict]:
+    metadata_by_id = {}
+    metadata_index = metadata_index_for("candidates")
+    if metadata_index is not None:
+        for candidate_id, *_ in ranked:
+            metadata = metadata_index.get(candidate_id)
+            if metadata is not None:
+                metadata_by_id[candidate_id] = metadata
+
+    missing = [candidate_id for candidate_id, *_ in ranked if candidate_id not in metadata_by_id]
+    if missing:
+        index = await get_async_index()
+        response = await index.fetch(ids=missing, namespace="candidates")
+        for candidate_id, vector in (response.vectors or {}).items():
+            metadata_by_id[candidate_id] = vector.metadata
+
+    results = []
+    # posle re-rankinga stavka nosi i breakdown po feature-ima: (id, score, features)
+    for candidate_id, score, *features in ranked:
+        if candidate_id not in metadata_by_id:
+            continue
+        match_dict = {"id": candidate_id, "metadata": metadata_by_id[candidate_id]}
+        if score is not None:
+            match_dict["score"] = score
+        if features:
+            match_dict["features"] = features[0]
+        results.append(match_dict)
+    return results
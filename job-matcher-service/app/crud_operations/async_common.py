@@ -0,0 +1,96 @@
+import asyncio
+import os
+
+from app.database import get_async_index
+from app.embeddings.embedding_client import aget_embedding, embedding_text_hash
+from app.search.indexes import metadata_index_for
+
+MGET_MAX_IDS = int(os.getenv("MGET_MAX_IDS", 1000))
+# fetch ide kao GET sa id-jevima u query string-u, pa se veći zahtevi dele na više paralelnih fetch-eva
+MGET_FETCH_BATCH_SIZE = int(os.getenv("MGET_FETCH_BATCH_SIZE", 100))
+
+
+async def fetch_metadata(vector_id: str, namespace: str) -> dict | None:
+    """
+    Vraća samo metadata jednog vektora, bez 1536 float vrednosti koje vraća fetch.
+    Query po id-ju sa include_values=False vraća najbliže vektore (prvi je obično sam taj vektor),
+    pa tražimo naš id među prvih nekoliko; ako ga nema (npr. više identičnih vektora) padamo na fetch.
+    """
+    index = await get_async_index()
+    response = await index.query(
+        namespace=namespace,
+        id=vector_id,
+        top_k=5,
+        include_values=False,
+        include_metadata=True
+    )
+    for match in response.matches:
+        if match.id == vector_id:
+            return dict(match.metadata or {})
+
+    response = await index.fetch(ids=[vector_id], namespace=namespace)
+    vector = response.vectors.get(vector_id) if response.vectors else None
+    if vector is None:
+        return None
+    return dict(vector.metadata or {})
+
+
+async def apply_update(vector_id: str, namespace: str, current: dict, changes: dict, embedding_text) -> tuple[dict, list[float] | None]:
+    """
+    Upisuje izmene u Pinecone sa što manje posla:
+    - embedding tekst isti (isti hash) -> samo set_metadata, bez poziva ka OpenAI
+    - tekst promenjen -> novi embedding + values i izmenjena metadata u jednom update pozivu
+    Vraća (upisana metadata polja, novi embedding ili None ako nije menjan).
+    """
+    updated = {**current, **changes}
+    new_hash = embedding_text_hash(embedding_text(updated))
+    old_hash = current.get("embedding_hash") or embedding_text_hash(embedding_text(current))
+
+    set_metadata = dict(changes)
+    if current.get("embedding_hash") != new_hash:
+        set_metadata["embedding_hash"] = new_hash
+
+    index = await get_async_index()
+    if new_hash == old_hash:
+        await index.update(id=vector_id, set_metadata=set_metadata, namespace=namespace)
+        return set_metadata, None
+
+    values = await aget_embedding(embedding_text(updated))
+    await index.update(id=vector_id, values=values, set_metadata=set_metadata, namespace=namespace)
+    return set_metadata, values
+
+
+def normalize_ids(ids: list[str]) -> list[str]:
+    """Id-jevi iz ponovljenog parametra i/ili zarezom razdvojeni, bez praznih i duplikata, u zadatom redosledu"""
+    parsed = (part.strip() for value in ids for part in value.split(","))
+    return list(dict.fromkeys(doc_id for doc_id in parsed if doc_id))
+
+
+async def fetch_many(namespace: str, ids: list[str], include_values: bool = False) -> tuple[list[dict], list[str]]:
+    """
+    Više dokumenata po id-ju u redosledu zahteva: (pronađeni, id-jevi koji ne postoje).
+    Bez vrednosti metadata dolazi iz lokalnog metadata index-a, a Pinecone fetch ide samo za ostatak.
+    """
+    found = {}
+    metadata_index = None if include_values else metadata_index_for(namespace)
+    if metadata_index is not None:
+        for doc_id in ids:
+            metadata = metadata_index.get(doc_id)
+            if metadata is not None:
+                found[doc_id] = {"id": doc_id, "metadata": metadata}
+
+    missing = [doc_id for doc_id in ids if doc_id not in found]
+    if missing:
+        index = await get_async_index()
+        responses = await asyncio.gather(*[
+            index.fetch(ids=missing[start:start + MGET_FETCH_BATCH_SIZE], namespace=namespace)
+            for start in range(0, len(missing), MGET_FETCH_BATCH_SIZE)
+        ])
+        for response in responses:
+            for doc_id, vector in (response.vectors or {}).items():
+                record = {"id": doc_id, "metadata": dict(vector.metadata or {})}
+                if include_values:
+                    record["values"] = list(vector.values)
+                found[doc_id] = record
+
+    return [found[doc_id] for doc_id in ids if doc_id in found], [doc_id for doc_id in ids if doc_id not in found]
@@ -0,0 +1,114 @@
+import asyncio
+import uuid
+
+from app.database import get_async_index, EMBEDDING_DIMENSIONS
+from app.embeddings.embedding_client import aget_embedding
+from app.crud_operations.async_common import fetch_metadata, apply_update
+from app.crud_operations.job_ads import (
+    job_ad_changes,
+    job_ad_metadata,
+    job_ad_result,
+    job_ads_filter,
+    job_ads_response,
+    job_embedding_text,
+    job_text_from_metadata,
+    validate_job_ad_field,
+)
+from app.enums.job_ads_enums import JobType, ExperienceLevel, WorkMode
+from app.search.indexes import job_ads_metadata_index, metadata_index_for
+from app.search.result_cache import namespace_versions, search_results, normalize_query_text
+from app.search.vector_engine import sync_vector_engine
+
+# CRUD i pretraga oglasa za async router-e (pravila su u job_ads.py).
+
+async def create_job_ad(title: str, description: str, experience_level: str, job_type: str, work_mode: str, city: str, country: str) -> str:
+    validate_job_ad_field("experience_level", experience_level)
+    validate_job_ad_field("job_type", job_type)
+    validate_job_ad_field("work_mode", work_mode)
+
+    job_id = str(uuid.uuid4())
+    text = job_embedding_text(title, description, experience_level, job_type, work_mode, city, country)
+    embedding = await aget_embedding(text)
+
+    vector = {
+        "id": job_id,
+        "values": embedding,
+        "metadata": job_ad_metadata(title, description, experience_level, job_type, work_mode, city, country, text)
+    }
+
+    index = await get_async_index()
+    await index.upsert(vectors=[vector], namespace="job_ads", show_progress=False)
+    job_ads_metadata_index.upsert(job_id, vector["metadata"])
+    sync_vector_engine("job_ads", "upsert", job_id, vector["metadata"], embedding)
+    namespace_versions.bump("job_ads", [job_id])
+    return job_id
+
+async def get_job_ad_by_id(job_id: str) -> dict | None:
+    index = await get_async_index()
+    response = await index.fetch(ids=[job_id], namespace="job_ads")
+    if response.vectors:
+        return response.vectors.get(job_id)
+    return None
+
+async def delete_job_ad(job_id: str) -> bool:
+    index = await get_async_index()
+    await index.delete(ids=[job_id], namespace="job_ads")
+    job_ads_metadata_index.delete(job_id)
+    sync_vector_engine("job_ads", "delete", job_id)
+    namespace_versions.bump("job_ads", [job_id], "delete")
+    return True
+
+async def update_job_ad(job_id: str, **kwargs) -> bool:
+    current = await fetch_metadata(job_id, "job_ads")
+    if current is None:
+        return False
+
+    changes = job_ad_changes(current, kwargs)
+    if not changes:
+        return True
+
+    set_metadata, values = await apply_update(job_id, "job_ads", current, changes, job_text_from_metadata)
+    job_ads_metadata_index.update(job_id, set_metadata)
+    sync_vector_engine("job_ads", "update", job_id, {**current, **set_metadata}, values)
+    namespace_versions.bump("job_ads", [job_id])
+    return True
+
+async def generate_job_title_embedding(title_query: str):
+    return await aget_embedding(f"Job title: {title_query}")
+
+async def filter_job_ads(
+    title_query: str | None = None,
+    required_experience_level: ExperienceLevel | None = None,
+    job_type: JobType | None = None,
+    work_mode: WorkMode | None = None,
+    top_k: int = 50
+):
+    filter_dict = job_ads_filter(required_experience_level, job_type, work_mode)
+    title_query = normalize_query_text(title_query)
+
+    params = {"title_query": title_query, "filter": filter_dict, "top_k": top_k}
+    return await search_results.aget_or_compute(
+        "job_ads", "job_ads.filter", params, lambda: _search_job_ads(title_query, filter_dict, top_k)
+    )
+
+async def _search_job_ads(title_query: str | None, filter_dict: dict, top_k: int):
+    if not title_query:
+        metadata_index = metadata_index_for("job_ads")
+        if metadata_index is not None:
+            hits = await asyncio.to_thread(metadata_index.query, equals=filter_dict)
+            return {
+                "count": len(hits),
+                "results": [job_ad_result(job_id, metadata) for job_id, metadata in hits[:top_k]]
+            }
+
+    embedding = await generate_job_title_embedding(title_query) if title_query else [0.0] * EMBEDDING_DIMENSIONS
+
+    index = await get_async_index()
+    res = await index.query(
+        vector=embedding,
+        top_k=top_k,
+        include_metadata=True,
+        namespace="job_ads",
+        filter=filter_dict if filter_dict else None
+    )
+    return job_ads_response(res.matches, title_query)
@@ -0,0 +1,125 @@
+import asyncio
+
+from app.database import get_async_index
+from app.crud_operations.async_common import fetch_many
+from app.pinecone_transport import vector_values
+from app.search.result_cache import namespace_versions, normalize_filters, search_results
+from app.search.vector_engine import vector_engine_for
+
+# Uparivanje i slični dokumenti preko već sačuvanih vektora: vektor izvornog dokumenta se čita iz lokalne
+# replike ili Pinecone fetch-om i direktno se koristi kao upit nad drugim (ili istim) namespace-om,
+# bez ponovnog slanja teksta ka OpenAI.
+
+
+def pinecone_filter(equals: dict, ranges: dict) -> dict | None:
+    """equals/ranges (kao za metadata index i vector engine) -> Pinecone filter"""
+    filter_query = {}
+    for field, value in equals.items():
+        if isinstance(value, (list, tuple)):
+            filter_query[field] = {"$in": list(value)}
+        else:
+            filter_query[field] = {"$eq": value}
+    for field, (minimum, maximum) in ranges.items():
+        bounds = {}
+        if minimum is not None:
+            bounds["$gte"] = minimum
+        if maximum is not None:
+            bounds["$lte"] = maximum
+        if bounds:
+            filter_query[field] = bounds
+    return filter_query or None
+
+
+async def stored_vector(namespace: str, doc_id: str):
+    engine = vector_engine_for(namespace)
+    if engine is not None:
+        vector = engine.vector(doc_id)
+        if vector is not None:
+            return vector
+
+    index = await get_async_index()
+    response = await index.fetch(ids=[doc_id], namespace=namespace)
+    vector = (response.vectors or {}).get(doc_id)
+    return None if vector is None else vector.values
+
+
+async def _rank_by_vector(namespace: str, vector, top_k: int, equals: dict, ranges: dict) -> list[tuple[str, float, dict | None]]:
+    engine = vector_engine_for(namespace)
+    if engine is not None:
+        ranked = await asyncio.to_thread(engine.search, vector, top_k, equals, ranges)
+        return [(doc_id, score, None) for doc_id, score in ranked]
+
+    index = await get_async_index()
+    response = await index.query(
+        namespace=namespace,
+        vector=vector_values(vector),
+        top_k=top_k,
+        include_metadata=True,
+        filter=pinecone_filter(equals, ranges),
+    )
+    return [(match.id, match.score, dict(match.metadata or {})) for match in response.matches]
+
+
+async def _match_stored(source_namespace: str, doc_id: str, target_namespace: str, top_k: int, equals: dict, ranges: dict) -> list[dict] | None:
+    vector = await stored_vector(source_namespace, doc_id)
+    if vector is None:
+        return None
+
+    # u istom namespace-u prvi pogodak je sam dokument, pa se traži jedan više
+    same = source_namespace == target_namespace
+    ranked = await _rank_by_vector(target_namespace, vector, top_k + 1 if same else top_k, equals, ranges)
+    ranked = [hit for hit in ranked if not (same and hit[0] == doc_id)][:top_k]
+
+    # lokalni engine vraća samo (id, skor) - metadata se dopunjuje jednim mget-om
+    missing = [hit_id for hit_id, _, metadata in ranked if metadata is None]
+    fetched = {}
+    if missing:
+        records, _ = await fetch_many(target_namespace, missing)
+        fetched = {record["id"]: record["metadata"] for record in records}
+
+    results = []
+    for hit_id, score, metadata in ranked:
+        metadata = metadata if metadata is not None else fetched.get(hit_id)
+        if metadata is not None:
+            results.append({"id": hit_id, "score": score, "metadata": metadata})
+    return results
+
+
+async def match_stored(source_namespace: str, doc_id: str, target_namespace: str, top_k: int,
+                       equals: dict | None = None, ranges: dict | None = None) -> list[dict] | None:
+    """
+    Top-k dokumenata iz target_namespace najbližih sačuvanom vektoru doc_id iz source_namespace.
+    None ako izvorni dokument ne postoji. Rezultat se kešira; ključ sadrži i verziju izvornog namespace-a,
+    pa izmena izvornog dokumenta (novi vektor) takođe poništava keš.
+    """
+    equals = normalize_filters(equals or {})
+    ranges = {field: bounds for field, bounds in (ranges or {}).items() if bounds != (None, None)}
+    params = {
+        "doc_id": doc_id,
+        "top_k": top_k,
+        "equals": equals,
+        "ranges": ranges,
+        "source_version": namespace_versions.get(source_namespace),
+    }
+    return await search_results.aget_or_compute(
+        target_namespace, f"stored.{source_namespace}", params,
+        lambda: _match_stored(source_namespace, doc_id, target_namespace, top_k, equals, ranges)
+    )
+
+
+def candidate_filters(education_level: str | None = None, min_years_experience: float | None = None,
+                      city: str | None = None) -> tuple[dict, dict]:
+    equals = {"education_level": education_level, "city": city}
+    ranges = {"years_experience": (min_years_experience, None)} if min_years_experience is not None else {}
+    return equals, ranges
+
+
+def job_ad_filters(required_experience_level: str | None = None, job_type: str | None = None,
+                   work_mode: str | None = None, city: str | None = None) -> tuple[dict, dict]:
+    equals = {
+        "required_experience_level": required_experience_level,
+        "job_type": job_type,
+        "work_mode": work_mode,
+        "city": city,
+    }
+    return equals, {}
@@ -0,0 +1,318 @@
+import json
+import os
+import time
+import uuid
+
+from app.database import index
+from app.embeddings.embedding_client import embed_texts, embedding_text_hash
+from app.crud_operations.candidates import (
+    CANDIDATE_FIELDS,
+    candidate_changes,
+    candidate_embedding_text,
+    candidate_metadata,
+    candidate_text_from_metadata,
+    validate_education_level,
+    validate_skills,
+)
+from app.crud_operations.job_ads import (
+    UPDATE_FIELD_MAP,
+    job_ad_changes,
+    job_ad_metadata,
+    job_embedding_text,
+    job_text_from_metadata,
+    validate_job_ad_field,
+)
+from app.export.namespace_export import iter_namespace
+from app.search.indexes import METADATA_INDEXES, metadata_index_for
+from app.search.result_cache import namespace_versions
+from app.search.vector_engine import sync_vector_engine
+
+# Bulk create/update/delete: validacija celog zahteva u jednom prolazu, embedding u batch-evima,
+# upsert/fetch/delete u chunk-ovima. Svaka operacija je generator događaja:
+#   {"event": "item", "index": 3, "id": "...", "status": "created"}
+#   {"event": "progress", "done": 500, "total": 20000}
+#   {"event": "summary", "total": 20000, "statuses": {"created": 19998, "invalid": 2}, "seconds": 41.2}
+# koji router šalje kao NDJSON stream ili skuplja u jedan JSON odgovor.
+
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 20000))
+BULK_EMBED_BATCH_SIZE = int(os.getenv("BULK_EMBED_BATCH_SIZE", 256))
+BULK_UPSERT_BATCH_SIZE = int(os.getenv("BULK_UPSERT_BATCH_SIZE", 100))
+BULK_FETCH_BATCH_SIZE = int(os.getenv("BULK_FETCH_BATCH_SIZE", 100))
+# Pinecone prima najviše 1000 id-jeva po delete pozivu
+BULK_DELETE_BATCH_SIZE = int(os.getenv("BULK_DELETE_BATCH_SIZE", 1000))
+
+# polja iz JobAdCreate redom kojim ih primaju job_embedding_text i job_ad_metadata
+JOB_AD_CREATE_FIELDS = ["title", "description", "experience_level", "job_type", "work_mode", "city", "country"]
+
+
+def _validate_candidate(item: dict):
+    validate_education_level(item["education_level"])
+    validate_skills(item["skills"])
+
+
+def _validate_job_ad(item: dict):
+    for field in ("experience_level", "job_type", "work_mode"):
+        validate_job_ad_field(field, item[field])
+
+
+BULK_SPECS = {
+    "candidates": {
+        "fields": CANDIDATE_FIELDS,
+        "validate": _validate_candidate,
+        "embedding_text": candidate_embedding_text,
+        "metadata": candidate_metadata,
+        "changes": candidate_changes,
+        "text_from_metadata": candidate_text_from_metadata,
+    },
+    "job_ads": {
+        "fields": JOB_AD_CREATE_FIELDS,
+        "validate": _validate_job_ad,
+        "embedding_text": job_embedding_text,
+        "metadata": job_ad_metadata,
+        "changes": job_ad_changes,
+        "text_from_metadata": job_text_from_metadata,
+    },
+}
+
+
+def _chunks(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class _Progress:
+    """Broji obrađene stavke i statuse; progress događaj ide posle svakog chunk-a"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.statuses = {}
+        self.started = time.perf_counter()
+
+    def item(self, position: int, doc_id: str | None, status: str, error: str | None = None) -> dict:
+        self.done += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        event = {"event": "item", "index": position, "id": doc_id, "status": status}
+        if error:
+            event["error"] = error
+        return event
+
+    def progress(self) -> dict:
+        return {"event": "progress", "done": self.done, "total": self.total}
+
+    def summary(self) -> dict:
+        return {
+            "event": "summary",
+            "total": self.total,
+            "statuses": self.statuses,
+            "seconds": round(time.perf_counter() - self.started, 2),
+        }
+
+
+def _write_chunk(namespace: str, vectors: list[dict]):
+    """Jedan upsert poziv + sinhronizacija lokalnih index-a; verzija se podiže posle svakog chunk-a"""
+    index.upsert(vectors=vectors, namespace=namespace)
+    for vector in vectors:
+        METADATA_INDEXES[namespace].upsert(vector["id"], vector["metadata"])
+        sync_vector_engine(namespace, "upsert", vector["id"], vector["metadata"], vector["values"])
+    namespace_versions.bump(namespace, [vector["id"] for vector in vectors])
+
+
+def bulk_create(namespace: str, items: list[dict]):
+    spec = BULK_SPECS[namespace]
+    progress = _Progress(len(items))
+
+    # validacija celog zahteva pre bilo kakvog poziva ka OpenAI/Pinecone
+    pending = []
+    for position, item in enumerate(items):
+        try:
+            spec["validate"](item)
+        except ValueError as e:
+            yield progress.item(position, None, "invalid", str(e))
+            continue
+        values = [item[field] for field in spec["fields"]]
+        text = spec["embedding_text"](*values)
+        pending.append((position, str(uuid.uuid4()), text, spec["metadata"](*values, text)))
+
+    for batch in _chunks(pending, BULK_EMBED_BATCH_SIZE):
+        try:
+            embeddings = embed_texts([text for _, _, text, _ in batch])
+        except Exception as e:
+            # neuspeli batch ne prekida ostatak - stavke dobijaju status failed i mogu ponovo da se pošalju
+            for position, _, _, _ in batch:
+                yield progress.item(position, None, "failed", str(e))
+            yield progress.progress()
+            continue
+
+        for chunk in _chunks(list(zip(batch, embeddings)), BULK_UPSERT_BATCH_SIZE):
+            try:
+                _write_chunk(namespace, [
+                    {"id": doc_id, "values": embedding, "metadata": metadata}
+                    for (_, doc_id, _, metadata), embedding in chunk
+                ])
+            except Exception as e:
+                for (position, _, _, _), _ in chunk:
+                    yield progress.item(position, None, "failed", str(e))
+            else:
+                for (position, doc_id, _, _), _ in chunk:
+                    yield progress.item(position, doc_id, "created")
+        yield progress.progress()
+
+    yield progress.summary()
+
+
+def _fetch_vectors(namespace: str, ids: list[str]) -> dict:
+    """id -> (metadata, values) za postojeće vektore, chunked fetch"""
+    found = {}
+    for chunk in _chunks(ids, BULK_FETCH_BATCH_SIZE):
+        response = index.fetch(ids=chunk, namespace=namespace)
+        for doc_id, vector in (response.vectors or {}).items():
+            found[doc_id] = (dict(vector.metadata or {}), vector.values)
+    return found
+
+
+def bulk_update(namespace: str, items: list[dict]):
+    """
+    Stavke su {"id": ..., <polja za izmenu>}. Trenutno stanje se čita chunked fetch-om (metadata + values),
+    novi embedding se računa samo za stavke kojima se promenio embedding tekst, a upis ide kao chunked upsert
+    celih zapisa umesto jednog update poziva po stavci.
+    """
+    spec = BULK_SPECS[namespace]
+    progress = _Progress(len(items))
+
+    valid = []
+    for position, item in enumerate(items):
+        updates = {key: value for key, value in item.items() if key != "id"}
+        if not item.get("id") or not updates:
+            yield progress.item(position, item.get("id"), "invalid", "Potrebni su id i bar jedno polje za izmenu")
+            continue
+        try:
+            spec["changes"]({}, updates)
+        except ValueError as e:
+            yield progress.item(position, item["id"], "invalid", str(e))
+            continue
+        valid.append((position, item["id"], updates))
+
+    for batch in _chunks(valid, BULK_EMBED_BATCH_SIZE):
+        try:
+            current = _fetch_vectors(namespace, list({doc_id for _, doc_id, _ in batch}))
+        except Exception as e:
+            for position, doc_id, _ in batch:
+                yield progress.item(position, doc_id, "failed", str(e))
+            yield progress.progress()
+            continue
+
+        writes, results = {}, []
+        for position, doc_id, updates in batch:
+            if doc_id not in current:
+                results.append((position, doc_id, "not_found"))
+                continue
+            metadata, values = current[doc_id]
+            changes = spec["changes"](metadata, updates)
+            if not changes:
+                results.append((position, doc_id, "unchanged"))
+                continue
+            updated = {**metadata, **changes}
+            text = spec["text_from_metadata"](updated)
+            new_hash = embedding_text_hash(text)
+            old_hash = metadata.get("embedding_hash") or embedding_text_hash(spec["text_from_metadata"](metadata))
+            updated["embedding_hash"] = new_hash
+            # ista stavka više puta u zahtevu: važi poslednja izmena, nadovezana na prethodne
+            current[doc_id] = (updated, values)
+            writes[doc_id] = {"id": doc_id, "values": values, "metadata": updated, "text": text if new_hash != old_hash else None}
+            results.append((position, doc_id, "updated"))
+
+        try:
+            reembed = [write for write in writes.values() if write["text"] is not None]
+            if reembed:
+                for write, embedding in zip(reembed, embed_texts([write["text"] for write in reembed])):
+                    write["values"] = embedding
+            for chunk in _chunks(list(writes.values()), BULK_UPSERT_BATCH_SIZE):
+                _write_chunk(namespace, [
+                    {"id": write["id"], "values": write["values"], "metadata": write["metadata"]}
+                    for write in chunk
+                ])
+        except Exception as e:
+            # upsert celih zapisa je idempotentan, pa se ceo batch može bezbedno ponoviti
+            for position, doc_id, status in results:
+                if status == "updated":
+                    yield progress.item(position, doc_id, "failed", str(e))
+                else:
+                    yield progress.item(position, doc_id, status)
+        else:
+            for position, doc_id, status in results:
+                yield progress.item(position, doc_id, status)
+        yield progress.progress()
+
+    yield progress.summary()
+
+
+def _matches(metadata: dict, equals: dict, ranges: dict) -> bool:
+    for field, value in equals.items():
+        allowed = value if isinstance(value, (list, tuple, set)) else [value]
+        if metadata.get(field) not in allowed:
+            return False
+    for field, (minimum, maximum) in ranges.items():
+        value = metadata.get(field)
+        if value is None or (minimum is not None and value < minimum) or (maximum is not None and value > maximum):
+            return False
+    return True
+
+
+def ids_matching_filter(namespace: str, equals: dict | None = None, ranges: dict | None = None) -> list[str]:
+    """
+    Id-jevi za delete-by-filter. Brisanje ide po id-jevima (ne Pinecone delete sa filterom)
+    da bi rezultat imao stavku po dokumentu i da bi lokalni index-i ostali sinhronizovani.
+    """
+    equals = {field: value for field, value in (equals or {}).items() if value is not None}
+    ranges = {field: bounds for field, bounds in (ranges or {}).items() if bounds != (None, None)}
+    metadata_index = metadata_index_for(namespace)
+    if metadata_index is not None:
+        return [doc_id for doc_id, _ in metadata_index.query(equals=equals, ranges=ranges)]
+    # metadata index nije učitan - prolaz kroz ceo namespace
+    return [record["id"] for record in iter_namespace(namespace) if _matches(record["metadata"], equals, ranges)]
+
+
+def bulk_delete(namespace: str, ids: list[str]):
+    progress = _Progress(len(ids))
+    for chunk in _chunks(list(enumerate(ids)), BULK_DELETE_BATCH_SIZE):
+        chunk_ids = list({doc_id for _, doc_id in chunk})
+        try:
+            index.delete(ids=chunk_ids, namespace=namespace)
+        except Exception as e:
+            for position, doc_id in chunk:
+                yield progress.item(position, doc_id, "failed", str(e))
+        else:
+            for doc_id in chunk_ids:
+                METADATA_INDEXES[namespace].delete(doc_id)
+                sync_vector_engine(namespace, "delete", doc_id)
+            namespace_versions.bump(namespace, chunk_ids, "delete")
+            # Pinecone ne javlja da li je id postojao, pa je status uvek deleted
+            for position, doc_id in chunk:
+                yield progress.item(position, doc_id, "deleted")
+        yield progress.progress()
+
+    yield progress.summary()
+
+
+def collect_results(events) -> dict:
+    """Ne-stream odgovor: sve stavke po redosledu ulaza + summary"""
+    results, summary = [], {}
+    for event in events:
+        if event["event"] == "item":
+            results.append({key: value for key, value in event.items() if key != "event"})
+        elif event["event"] == "summary":
+            summary = {key: value for key, value in event.items() if key != "event"}
+    results.sort(key=lambda result: result["index"])
+    return {"summary": summary, "results": results}
+
+
+def job_ad_delete_filter(experience_level=None, job_type=None, work_mode=None, city=None, country=None) -> dict:
+    """Polja iz API-ja -> equals nad ključevima iz metadata"""
+    fields = {"experience_level": experience_level, "job_type": job_type, "work_mode": work_mode, "city": city, "country": country}
+    return {UPDATE_FIELD_MAP.get(field, field): value for field, value in fields.items() if value}
+
+
+def iter_bulk_ndjson(events):
+    for event in events:
+        yield json.dumps(event, ensure_ascii=False) + "\n"
@@ -1,30 +1,16 @@
-import os
-import uuid
+import argparse
 import random
-from openai import OpenAI
-from pinecone import Pinecone
-from dotenv import load_dotenv
-
-# -----------------------------
-# Load environment variables
-# -----------------------------
-load_dotenv()
+import uuid
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
-PINECONE_ENVIRONMENT = os.getenv("PINECONE_ENVIRONMENT")
-INDEX_NAME = os.getenv("PINECONE_INDEX_NAME")
+from app.database import index
+from app.embeddings.embedding_client import embed_texts, embedding_text_hash
+from app.crud_operations.candidates import CANDIDATE_FIELDS, candidate_embedding_text
+from app.crud_operations.job_ads import JOB_AD_FIELDS, job_embedding_text
+from app.ingestion.pipeline import IngestionPipeline, read_ndjson
 
-# -----------------------------
-# Setup OpenAI client
-# -----------------------------
-client = OpenAI(api_key=OPENAI_API_KEY)
-
-# -----------------------------
-# Setup Pinecone client
-# -----------------------------
-pc = Pinecone(api_key=PINECONE_API_KEY)
-index = pc.Index(INDEX_NAME)
+# Pokretanje (iz job-matcher-service foldera):
+#   python -m app.data_script --count 200
+#   python -m app.data_script --candidates-file candidates.ndjson --job-ads-file job_ads.ndjson --workers 8
 
 # -----------------------------
 # Predefinisani podaci
@@ -49,86 +35,87 @@ job_types = ["full-time", "part-time", "internship", "contract"]
 work_modes = ["remote", "onsite", "hybrid"]
 
 # -----------------------------
-# Helper function: OpenAI embedding
-# -----------------------------
-def generate_embedding(text):
-    response = client.embeddings.create(
-        model="text-embedding-3-small",
-        input=text
-    )
-    return response.data[0].embedding
+# Generatori zapisa - seed čini generisanje ponovljivim, pa nastavak od checkpoint-a
+# preskače tačno iste zapise koji su već upisani
+# -----------------------------
+def generate_candidates(count, rng):
+    for _ in range(count):
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "firstname": rng.choice(candidate_firstnames),
+            "lastname": rng.choice(candidate_lastnames),
+            "education_level": rng.choice(education_levels),
+            "years_experience": round(rng.uniform(0.5, 10), 1),
+            "skills": rng.sample(skills_pool, k=rng.randint(1, 5)),
+            "city": rng.choice(cities),
+            "country": rng.choice(countries)
+        }
+
+def generate_job_ads(count, rng):
+    for _ in range(count):
+        yield {
+            "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "title": rng.choice(job_titles),
+            "description": rng.choice(job_descriptions),
+            "required_experience_level": rng.choice(experience_levels),
+            "job_type": rng.choice(job_types),
+            "work_mode": rng.choice(work_modes),
+            "city": rng.choice(cities),
+            "country": rng.choice(countries)
+        }
 
 # -----------------------------
-# Helper function: prepare text for embedding
+# Mapiranje zapisa na embedding tekst i metadata
 # -----------------------------
-def candidate_text(firstname, lastname, skills, education, years_exp, city, country):
-    return f"{firstname} {lastname}, Education: {education}, Skills: {', '.join(skills)}, Experience: {years_exp} years, Location: {city}, {country}"
+def candidate_text(record):
+    return candidate_embedding_text(*(record[field] for field in CANDIDATE_FIELDS))
 
-def job_text(title, description, experience_level, job_type, work_mode, city, country):
-    return f"{title}: {description}. Required level: {experience_level}, Job type: {job_type}, Work mode: {work_mode}, Location: {city}, {country}"
+def job_text(record):
+    return job_embedding_text(*(record[field] for field in JOB_AD_FIELDS))
 
-# -----------------------------
-# Generate and insert candidates
-# -----------------------------
-for _ in range(200):
-    firstname = random.choice(candidate_firstnames)
-    lastname = random.choice(candidate_lastnames)
-    education = random.choice(education_levels)
-    years_exp = round(random.uniform(0.5, 10), 1)
-    skills = random.sample(skills_pool, k=random.randint(1, 5))
-    city = random.choice(cities)
-    country = random.choice(countries)
-
-    text_for_embedding = candidate_text(firstname, lastname, skills, education, years_exp, city, country)
-    embedding_vector = generate_embedding(text_for_embedding)
-
-    candidate = {
-        "id": str(uuid.uuid4()),
-        "values": embedding_vector,
-        "metadata": {
-            "firstname": firstname,
-            "lastname": lastname,
-            "education_level": education,
-            "years_experience": years_exp,
-            "skills": skills,
-            "city": city,
-            "country": country
-        }
-    }
+def candidate_metadata(record):
+    metadata = {field: record[field] for field in CANDIDATE_FIELDS}
+    metadata["embedding_hash"] = embedding_text_hash(candidate_text(record))
+    return metadata
 
-    index.upsert(vectors=[candidate], namespace="candidates")
+def job_metadata(record):
+    metadata = {field: record[field] for field in JOB_AD_FIELDS}
+    metadata["embedding_hash"] = embedding_text_hash(job_text(record))
+    return metadata
 
-print("200 kandidata ubačeno u Pinecone!")
 
-# -----------------------------
-# Generate and insert job ads
-# -----------------------------
-for _ in range(200):
-    title = random.choice(job_titles)
-    description = random.choice(job_descriptions)
-    experience_level = random.choice(experience_levels)
-    job_type = random.choice(job_types)
-    work_mode = random.choice(work_modes)
-    city = random.choice(cities)
-    country = random.choice(countries)
-
-    text_for_embedding = job_text(title, description, experience_level, job_type, work_mode, city, country)
-    embedding_vector = generate_embedding(text_for_embedding)
-
-    job = {
-        "id": str(uuid.uuid4()),
-        "values": embedding_vector,
-        "metadata": {
-            "title": title,
-            "description": description,
-            "required_experience_level": experience_level,
-            "job_type": job_type,
-            "work_mode": work_mode,
-            "city": city,
-            "country": country
-        }
-    }
+def build_pipeline(namespace, text_for, metadata_for, args):
+    return IngestionPipeline(
+        index,
+        namespace,
+        embed_texts=embed_texts,
+        text_for=text_for,
+        metadata_for=metadata_for,
+        embed_batch_size=args.embed_batch_size,
+        upsert_batch_size=args.upsert_batch_size,
+        workers=args.workers,
+        checkpoint_path=f"{args.checkpoint_prefix}_{namespace}.json",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk učitavanje kandidata i oglasa u Pinecone")
+    parser.add_argument("--candidates-file", help="NDJSON fajl sa kandidatima (umesto generisanih podataka)")
+    parser.add_argument("--job-ads-file", help="NDJSON fajl sa oglasima (umesto generisanih podataka)")
+    parser.add_argument("--count", type=int, default=200, help="Broj generisanih kandidata i oglasa")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--embed-batch-size", type=int, default=256)
+    parser.add_argument("--upsert-batch-size", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--checkpoint-prefix", default="ingestion_checkpoint")
+    args = parser.parse_args()
+
+    candidates = read_ndjson(args.candidates_file) if args.candidates_file else generate_candidates(args.count, random.Random(args.seed))
+    build_pipeline("candidates", candidate_text, candidate_metadata, args).run(candidates)
+
+    job_ads = read_ndjson(args.job_ads_file) if args.job_ads_file else generate_job_ads(args.count, random.Random(args.seed + 1))
+    build_pipeline("job_ads", job_text, job_metadata, args).run(job_ads)
 
-    index.upsert(vectors=[job], namespace="job_ads")
 
-print("200 oglasa ubačeno u Pinecone!")
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,74 @@
+import asyncio
 import os
-from openai import OpenAI
-from pinecone import Pinecone
 from dotenv import load_dotenv
+from app.embeddings.providers import FULL_EMBEDDING_DIM, embedding_dimensions
+from app.lazy_client import LazyClient, warm_up
+from app.pinecone_transport import PINECONE_TRANSPORT, AsyncGrpcIndex, open_index, probe_query
 
 load_dotenv()  
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 PINECONE_ENVIRONMENT = os.getenv("PINECONE_ENVIRONMENT")
-INDEX_NAME = os.getenv("PINECONE_INDEX_NAME")
+FULL_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# sa EMBEDDING_DIMENSIONS < 1536 servis radi nad posebnim, kompaktnim indexom
+# (pravi se sa: python -m app.migrate_compact_index)
+EMBEDDING_DIMENSIONS = embedding_dimensions()
+COMPACT_INDEX_NAME = os.getenv("PINECONE_COMPACT_INDEX_NAME", f"{FULL_INDEX_NAME}-{EMBEDDING_DIMENSIONS}")
+INDEX_NAME = FULL_INDEX_NAME if EMBEDDING_DIMENSIONS == FULL_EMBEDDING_DIM else COMPACT_INDEX_NAME
 
-pc = Pinecone(api_key=PINECONE_API_KEY, environment=PINECONE_ENVIRONMENT)
-index = pc.Index(INDEX_NAME)
+# klijenti se prave pri prvoj upotrebi (i openai/pinecone paketi se tada importuju), a ne pri importu modula
+def _openai_client():
+    from openai import OpenAI
+    return OpenAI(api_key=OPENAI_API_KEY)
+
+def _async_openai_client():
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+def _pinecone_client():
+    from pinecone import Pinecone
+    return Pinecone(api_key=PINECONE_API_KEY, environment=PINECONE_ENVIRONMENT)
+
+client = LazyClient("openai", _openai_client)
+async_client = LazyClient("openai-async", _async_openai_client)
+pc = LazyClient("pinecone", _pinecone_client)
+# PINECONE_TRANSPORT=rest|grpc bira transport za sve crud i report module (vidi app/pinecone_transport.py)
+index = LazyClient("pinecone-index", lambda: open_index(pc.get(), PINECONE_API_KEY, INDEX_NAME))
+
+# asyncio Pinecone klijent (aiohttp sesija) mora da se napravi unutar event loop-a, pa se otvara lazy
+_async_index = None
+_async_index_lock = asyncio.Lock()
+
+async def get_async_index():
+    global _async_index
+    if _async_index is None:
+        async with _async_index_lock:
+            if _async_index is None and PINECONE_TRANSPORT == "grpc":
+                _async_index = AsyncGrpcIndex(index)
+            elif _async_index is None:
+                host = (await asyncio.to_thread(pc.describe_index, INDEX_NAME)).host
+                _async_index = pc.IndexAsyncio(host=host)
+    return _async_index
+
+async def close_async_index():
+    global _async_index
+    if _async_index is not None:
+        await _async_index.close()
+        _async_index = None
+
+async def _probe_async_index():
+    await probe_query(await get_async_index(), EMBEDDING_DIMENSIONS)
+
+async def warm_up_clients() -> dict:
+    """Otvara klijente i pool-ove konekcija i šalje probne upite pre nego što worker primi saobraćaj"""
+    return await warm_up([
+        ("openai", lambda: (client.get(), async_client.get())),
+        ("pinecone-index", index.get),
+        ("pinecone-probe", lambda: probe_query(index, EMBEDDING_DIMENSIONS)),
+        ("pinecone-async-probe", _probe_async_index),
+    ])
 
 #try:
     #indexes = pc.list_indexes().names()  
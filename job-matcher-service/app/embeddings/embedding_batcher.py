@@ -0,0 +1,104 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batcher ispred embedding API-ja.
+    Zahtevi se skupljaju najviše max_wait_ms (ili dok se ne skupi max_batch_size tekstova),
+    šalju se kao jedan batch poziv, a vektori se vraćaju svakom pozivaocu preko Future-a.
+    """
+
+    def __init__(self, embed_batch, max_batch_size: int = 64, max_wait_ms: float = 5, max_concurrent_batches: int = 4,
+                 timeout_seconds: float = 60):
+        self.embed_batch = embed_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        # pozivalac ne čeka zauvek ni ako batch nikad ne razreši Future
+        self.timeout = timeout_seconds
+        self._queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_batches, thread_name_prefix="embedding-batch")
+        self._slots = threading.Semaphore(max_concurrent_batches)
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._collect_loop, name="embedding-batcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str) -> list[float]:
+        return self.submit(text).result(timeout=self.timeout)
+
+    async def aembed(self, text: str) -> list[float]:
+        """Isto kao embed, ali event loop ne čeka blokirano - Future iz batch thread-a se preslikava u asyncio"""
+        return await asyncio.wait_for(asyncio.wrap_future(self.submit(text)), self.timeout)
+
+    def _collect_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # ograničavamo broj batch poziva u letu, ostali zahtevi čekaju u redu i pune sledeći batch
+            self._slots.acquire()
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch):
+        try:
+            # isti tekst u istom batch-u šaljemo samo jednom
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                vectors = self.embed_batch(texts)
+                if len(vectors) != len(texts):
+                    raise ValueError(f"Embedding provider je vratio {len(vectors)} vektora za {len(texts)} tekstova")
+                by_text = dict(zip(texts, vectors))
+                for text, future in batch:
+                    if not future.done():
+                        future.set_result(by_text[text])
+            except Exception as e:
+                # svaki pozivalac mora dobiti odgovor, inače čeka na Future koji se nikad ne razreši
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            with self._stats_lock:
+                self.batches += 1
+                self.items += len(batch)
+        finally:
+            self._slots.release()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "batches": self.batches,
+                "items": self.items,
+                "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+                "queued": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+            }
@@ -0,0 +1,219 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+from app.caching import TTLCache, SingleFlight, AsyncSingleFlight
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_PATH = os.path.join(BASE_DIR, "cache", "embeddings.sqlite")
+
+
+def embedding_key(model: str, text: str) -> str:
+    """Content-addressed ključ: isti model + isti tekst = isti embedding"""
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class DiskEmbeddingStore:
+    """
+    SQLite tier keša koji preživljava restart servisa.
+    WAL mod dozvoljava da više uvicorn worker-a (i oba servisa preko zajedničkog volume-a) koriste isti fajl.
+    """
+
+    def __init__(self, path: str, max_entries: int = 200000, ttl_seconds: float | None = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)")
+
+    def get(self, key: str) -> list[float] | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector, created_at FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            blob, created_at = row
+            if self.ttl_seconds and created_at + self.ttl_seconds < now:
+                self._conn.execute("DELETE FROM embeddings WHERE key = ?", (key,))
+                return None
+
+            self._conn.execute("UPDATE embeddings SET last_access = ? WHERE key = ?", (now, key))
+
+        vector = array("f")
+        vector.frombytes(blob)
+        return vector.tolist()
+
+    def put(self, key: str, model: str, vector: list[float]):
+        now = time.time()
+        blob = array("f", vector).tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, model, blob, now, now),
+            )
+            self._writes_since_eviction += 1
+            # eviction ne radimo na svakom upisu, COUNT(*) nad velikom tabelom nije besplatan
+            if self._writes_since_eviction >= 1000:
+                self._writes_since_eviction = 0
+                self._evict(now)
+
+    def _evict(self, now: float):
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM embeddings WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_access LIMIT ?)",
+                (overflow,),
+            )
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class EmbeddingCache:
+    """
+    Dvoslojni keš embedding-a: in-memory LRU ispred SQLite fajla.
+    Istovremeni zahtevi za isti (model, tekst) prave samo jedan poziv ka OpenAI (single-flight).
+    """
+
+    def __init__(self, memory: TTLCache, disk: DiskEmbeddingStore | None = None):
+        self.memory = memory
+        self.disk = disk
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+        self._stats_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.miss_seconds = 0.0
+
+    @classmethod
+    def from_env(cls) -> "EmbeddingCache":
+        ttl = float(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", 30 * 24 * 3600)) or None
+        memory = TTLCache(
+            max_entries=int(os.getenv("EMBEDDING_CACHE_MEMORY_ENTRIES", 10000)),
+            ttl_seconds=ttl,
+        )
+        disk = None
+        if os.getenv("EMBEDDING_CACHE_DISK_ENABLED", "true").lower() == "true":
+            disk = DiskEmbeddingStore(
+                os.getenv("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH),
+                max_entries=int(os.getenv("EMBEDDING_CACHE_DISK_ENTRIES", 200000)),
+                ttl_seconds=ttl,
+            )
+        return cls(memory, disk)
+
+    def _count(self, name: str, seconds: float = 0.0):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+            self.miss_seconds += seconds
+
+    def get_or_compute(self, model: str, text: str, compute) -> list[float]:
+        """Vraća embedding iz keša, a ako ga nema poziva compute() i upisuje rezultat u oba sloja"""
+        key = embedding_key(model, text)
+
+        vector = self.memory.get(key)
+        if vector is not None:
+            self._count("memory_hits")
+            return vector
+
+        def load():
+            if self.disk is not None:
+                stored = self.disk.get(key)
+                if stored is not None:
+                    self._count("disk_hits")
+                    self.memory.set(key, stored)
+                    return stored
+
+            started = time.perf_counter()
+            computed = compute()
+            self._count("misses", time.perf_counter() - started)
+
+            self.memory.set(key, computed)
+            if self.disk is not None:
+                self.disk.put(key, model, computed)
+            return computed
+
+        vector, shared = self._flight.do(key, load)
+        if shared:
+            self._count("coalesced")
+        return vector
+
+    async def aget_or_compute(self, model: str, text: str, acompute) -> list[float]:
+        """Async varijanta get_or_compute: acompute je korutina, a istovremeni isti promašaji čekaju isti Task"""
+        key = embedding_key(model, text)
+
+        vector = self.memory.get(key)
+        if vector is not None:
+            self._count("memory_hits")
+            return vector
+
+        async def load():
+            if self.disk is not None:
+                stored = await asyncio.to_thread(self.disk.get, key)
+                if stored is not None:
+                    self._count("disk_hits")
+                    self.memory.set(key, stored)
+                    return stored
+
+            started = time.perf_counter()
+            computed = await acompute()
+            self._count("misses", time.perf_counter() - started)
+
+            self.memory.set(key, computed)
+            if self.disk is not None:
+                await asyncio.to_thread(self.disk.put, key, model, computed)
+            return computed
+
+        vector, shared = await self._async_flight.do(key, load)
+        if shared:
+            self._count("coalesced")
+        return vector
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            hits = self.memory_hits + self.disk_hits + self.coalesced
+            total = hits + self.misses
+            avg_miss = self.miss_seconds / self.misses if self.misses else 0.0
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "coalesced": self.coalesced,
+                "misses": self.misses,
+                "hit_ratio": round(hits / total, 4) if total else 0.0,
+                "memory_entries": len(self.memory),
+                "disk_entries": self.disk.count() if self.disk is not None else 0,
+                "avg_miss_latency_ms": round(avg_miss * 1000, 2),
+                # svaki hit je jedan OpenAI poziv manje
+                "saved_requests": hits,
+                "estimated_saved_seconds": round(hits * avg_miss, 2),
+            }
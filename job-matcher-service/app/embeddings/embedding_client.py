@@ -0,0 +1,67 @@
+import os
+
+from app.database import client, async_client
+from app.embeddings.embedding_batcher import EmbeddingBatcher
+from app.embeddings.embedding_cache import EmbeddingCache, embedding_key
+from app.embeddings.providers import provider_from_env
+from app.embeddings.skills_table import SkillsEmbeddingTable, TABLE_PATH
+
+# EMBEDDING_PROVIDER=local daje determinističke vektore bez mreže (load testovi, benchmark-i)
+embedding_provider = provider_from_env(client, async_client)
+EMBEDDING_MODEL = embedding_provider.name
+
+embedding_cache = EmbeddingCache.from_env()
+
+# pravi se offline komandom: python -m app.embeddings.skills_table
+skills_table = SkillsEmbeddingTable.load(TABLE_PATH, EMBEDDING_MODEL)
+
+BATCHING_ENABLED = os.getenv("EMBEDDING_BATCH_ENABLED", "true").lower() == "true"
+
+embedding_batcher = EmbeddingBatcher(
+    embedding_provider.embed,
+    max_batch_size=int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", 64)),
+    max_wait_ms=float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", 5)),
+    max_concurrent_batches=int(os.getenv("EMBEDDING_BATCH_MAX_CONCURRENT", 4)),
+    timeout_seconds=float(os.getenv("EMBEDDING_BATCH_TIMEOUT_SECONDS", 60)),
+)
+
+
+def _compute_embedding(text: str) -> list[float]:
+    if BATCHING_ENABLED:
+        return embedding_batcher.embed(text)
+    return embedding_provider.embed([text])[0]
+
+
+def get_embedding(text: str) -> list[float]:
+    """Vraća embedding za tekst, provider se poziva samo ako tekst nije već u kešu"""
+    return embedding_cache.get_or_compute(EMBEDDING_MODEL, text, lambda: _compute_embedding(text))
+
+
+async def _acompute_embedding(text: str) -> list[float]:
+    if BATCHING_ENABLED:
+        return await embedding_batcher.aembed(text)
+    return (await embedding_provider.aembed([text]))[0]
+
+
+async def aget_embedding(text: str) -> list[float]:
+    """Async get_embedding: keš -> batcher/AsyncOpenAI, bez blokiranja event loop-a"""
+    return await embedding_cache.aget_or_compute(EMBEDDING_MODEL, text, lambda: _acompute_embedding(text))
+
+
+def embedding_text_hash(text: str) -> str:
+    """Hash (model, tekst) koji se čuva u metadata - ako se ne promeni, embedding ne treba ponovo računati"""
+    return embedding_key(EMBEDDING_MODEL, text)
+
+
+def embed_texts(texts: list[str]) -> list[list[float]]:
+    """Bulk embedding za ingestion - tekstovi su uglavnom jedinstveni pa se keš zaobilazi"""
+    return embedding_provider.embed(texts)
+
+
+def embedding_stats() -> dict:
+    return {
+        "provider": EMBEDDING_MODEL,
+        "cache": embedding_cache.stats(),
+        "batcher": embedding_batcher.stats(),
+        "skills_table": skills_table.stats(),
+    }
@@ -0,0 +1,124 @@
+import argparse
+import json
+import os
+import re
+
+import numpy as np
+
+from app.enums.candidates_enums import SKILLS_POOL
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TABLE_PATH = os.path.join(BASE_DIR, "cache", "skills_table.npy")
+
+_SKILL_BY_LOWER = {skill.lower(): skill for skill in SKILLS_POOL}
+_SKILL_BIT = {skill: 1 << position for position, skill in enumerate(SKILLS_POOL)}
+
+
+def canonicalize_skills(skill_query: str | None) -> list[str] | None:
+    """
+    "sql, python" / "Python;SQL" / "python sql" -> ["Python", "SQL"] (redosled iz SKILLS_POOL, bez duplikata).
+    Vraća None ako upit sadrži nešto što nije skill iz SKILLS_POOL - takav upit ide na običan embedding.
+    """
+    if not skill_query:
+        return None
+
+    tokens = [token for token in re.split(r"[\s,;/|+]+", skill_query.strip().lower()) if token]
+    if not tokens or any(token not in _SKILL_BY_LOWER for token in tokens):
+        return None
+
+    mask = skills_mask(_SKILL_BY_LOWER[token] for token in tokens)
+    return [skill for skill in SKILLS_POOL if mask & _SKILL_BIT[skill]]
+
+
+def skills_mask(skills) -> int:
+    mask = 0
+    for skill in skills:
+        mask |= _SKILL_BIT[skill]
+    return mask
+
+
+def skills_query_text(skills: list[str]) -> str:
+    return f"Skills: {', '.join(skills)}"
+
+
+def all_skill_combinations():
+    """Sve neprazne kombinacije iz SKILLS_POOL, red u tabeli = mask - 1"""
+    for mask in range(1, 1 << len(SKILLS_POOL)):
+        yield [skill for skill in SKILLS_POOL if mask & _SKILL_BIT[skill]]
+
+
+class SkillsEmbeddingTable:
+    """
+    Unapred izračunati embedding-i za sve kombinacije skill-ova (2^9 - 1 = 511 redova).
+    Tabela je .npy fajl koji se učitava preko mmap-a, pa je svi uvicorn worker-i dele kroz page cache.
+    """
+
+    def __init__(self, vectors: np.ndarray | None = None, model: str | None = None):
+        self.vectors = vectors
+        self.model = model
+        self.hits = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self.vectors is not None
+
+    @staticmethod
+    def meta_path(path: str) -> str:
+        return os.path.splitext(path)[0] + ".json"
+
+    @classmethod
+    def load(cls, path: str, model: str) -> "SkillsEmbeddingTable":
+        """Učitava tabelu samo ako je napravljena istim modelom i za isti SKILLS_POOL, inače vraća praznu"""
+        meta_path = cls.meta_path(path)
+        if not os.path.exists(path) or not os.path.exists(meta_path):
+            return cls()
+
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("model") != model or meta.get("skills_pool") != SKILLS_POOL:
+            print(f"Skills tabela {path} je zastarela (model/skills_pool), koristi se običan embedding")
+            return cls()
+
+        return cls(np.load(path, mmap_mode="r"), model)
+
+    def lookup(self, skills: list[str]) -> list[float] | None:
+        if self.vectors is None:
+            return None
+        self.hits += 1
+        return self.vectors[skills_mask(skills) - 1].tolist()
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "rows": 0 if self.vectors is None else int(self.vectors.shape[0]),
+            "hits": self.hits,
+        }
+
+
+def build_table(path: str, model: str, embed_texts) -> None:
+    combinations = list(all_skill_combinations())
+    vectors = np.asarray(embed_texts([skills_query_text(skills) for skills in combinations]), dtype=np.float32)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    np.save(path, vectors)
+    with open(SkillsEmbeddingTable.meta_path(path), "w", encoding="utf-8") as f:
+        json.dump({"model": model, "skills_pool": SKILLS_POOL, "rows": len(combinations)}, f)
+
+    print(f"Skills tabela sačuvana: {path} ({vectors.shape[0]} x {vectors.shape[1]})")
+
+
+TABLE_PATH = os.getenv("SKILLS_TABLE_PATH", DEFAULT_TABLE_PATH)
+
+
+def main():
+    # python -m app.embeddings.skills_table
+    parser = argparse.ArgumentParser(description="Pravi tabelu embedding-a za sve kombinacije SKILLS_POOL")
+    parser.add_argument("--path", default=TABLE_PATH)
+    args = parser.parse_args()
+
+    from app.embeddings.embedding_client import EMBEDDING_MODEL, embed_texts
+    build_table(args.path, EMBEDDING_MODEL, embed_texts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import json
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from app.database import index
+
+NAMESPACES = ("candidates", "job_ads")
+
+
+def iter_namespace(namespace: str, include_values: bool = False, batch_size: int = 100, max_in_flight: int = 4, source_index=None):
+    """
+    Generator koji prolazi kroz ceo namespace: index.list daje stranice id-jeva, a za svaku stranicu
+    ide jedan fetch. Najviše max_in_flight fetch-eva je u letu, pa memorija ne zavisi od veličine namespace-a.
+    Zapisi se vraćaju redom kojim ih list vraća.
+    """
+    source_index = source_index or index
+    executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix=f"export-{namespace}")
+    pending = deque()
+
+    def drain_one():
+        ids, future = pending.popleft()
+        vectors = future.result().vectors or {}
+        for vector_id in ids:
+            vector = vectors.get(vector_id)
+            if vector is None:
+                continue  # obrisan između list i fetch
+            record = {"id": vector_id, "metadata": dict(vector.metadata or {})}
+            if include_values:
+                record["values"] = list(vector.values)
+            yield record
+
+    try:
+        for ids in source_index.list(namespace=namespace, limit=batch_size):
+            ids = list(ids)
+            pending.append((ids, executor.submit(source_index.fetch, ids=ids, namespace=namespace)))
+            if len(pending) >= max_in_flight:
+                yield from drain_one()
+        while pending:
+            yield from drain_one()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_ndjson(namespace: str, include_values: bool = False, batch_size: int = 100, max_in_flight: int = 4):
+    """NDJSON linije za StreamingResponse ili fajl"""
+    for record in iter_namespace(namespace, include_values=include_values, batch_size=batch_size, max_in_flight=max_in_flight):
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def main():
+    # python -m app.export.namespace_export candidates --output candidates.ndjson --include-values
+    parser = argparse.ArgumentParser(description="Izvoz celog Pinecone namespace-a u NDJSON")
+    parser.add_argument("namespace", choices=NAMESPACES)
+    parser.add_argument("--output", help="Izlazni fajl (default: stdout)")
+    parser.add_argument("--include-values", action="store_true", help="Uključi i vektore")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--max-in-flight", type=int, default=4)
+    args = parser.parse_args()
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        count = 0
+        for line in iter_ndjson(args.namespace, args.include_values, args.batch_size, args.max_in_flight):
+            out.write(line)
+            count += 1
+    finally:
+        if args.output:
+            out.close()
+    print(f"Izvezeno {count} zapisa iz '{args.namespace}'", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
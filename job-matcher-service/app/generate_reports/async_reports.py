@@ -0,0 +1,133 @@
+import asyncio
+
+from app.database import get_async_index
+from app.crud_operations.async_candidates import generate_skills_embedding, hydrate_candidates
+from app.crud_operations.candidates import candidate_filter, search_candidate_vectors
+from app.generate_reports.pinecone_reports import VECTOR_DIM, candidate_report_row, job_ad_report_row
+from app.matching.rerank import experience_window, fetch_size, mentioned_skills, rerank
+from app.search.indexes import metadata_index_for
+from app.search.result_cache import namespace_versions, search_results, normalize_filters, normalize_query_text
+from app.search.vector_engine import vector_engine_for
+
+# Upiti za izveštaje (redovi iz pinecone_reports.py); sam PDF se i dalje pravi sync (u thread-u iz router-a).
+
+async def filter_candidates_for_report(skill_query: str | None = None, min_years_experience: int | None = None, top_k: int = 10):
+    skill_query = normalize_query_text(skill_query)
+    params = {"skill_query": skill_query, "min_years_experience": min_years_experience, "top_k": top_k}
+    return await search_results.aget_or_compute(
+        "candidates", "report.candidates", params,
+        lambda: _query_candidates_for_report(skill_query, min_years_experience, top_k)
+    )
+
+async def _query_candidates_for_report(skill_query: str | None, min_years_experience: int | None, top_k: int):
+    if not skill_query:
+        metadata_index = metadata_index_for("candidates")
+        if metadata_index is not None:
+            hits = await asyncio.to_thread(metadata_index.query, ranges={"years_experience": (min_years_experience, None)})
+            return [candidate_report_row(metadata, 0.0) for _, metadata in hits[:top_k]]
+
+    embedding = await generate_skills_embedding(skill_query) if skill_query else [0.0] * VECTOR_DIM
+
+    engine = vector_engine_for("candidates")
+    if engine is not None:
+        ranked = await asyncio.to_thread(search_candidate_vectors, engine, embedding, top_k, min_years_experience=min_years_experience)
+        return [candidate_report_row(c["metadata"], c["score"]) for c in await hydrate_candidates(ranked)]
+
+    index = await get_async_index()
+    response = await index.query(
+        namespace="candidates",
+        vector=embedding,
+        top_k=top_k,
+        include_metadata=True,
+        filter=candidate_filter(min_years_experience=min_years_experience)
+    )
+    return [candidate_report_row(match.metadata, match.score) for match in response.matches]
+
+async def filter_job_ads_for_report(job_types: list[str] | None = None, cities: list[str] | None = None, top_k: int = 10):
+    filters = normalize_filters({"job_type": job_types, "city": cities})
+    job_types, cities = filters.get("job_type"), filters.get("city")
+    return await search_results.aget_or_compute(
+        "job_ads", "report.job_ads", {"filter": filters, "top_k": top_k},
+        lambda: _query_job_ads_for_report(job_types, cities, top_k)
+    )
+
+async def _query_job_ads_for_report(job_types: list[str] | None, cities: list[str] | None, top_k: int):
+    metadata_index = metadata_index_for("job_ads")
+    if metadata_index is not None:
+        hits = await asyncio.to_thread(metadata_index.query, equals={"job_type": job_types, "city": cities})
+        return [job_ad_report_row(metadata, 0.0) for _, metadata in hits[:top_k]]
+
+    filter_query = {}
+    if job_types:
+        filter_query["job_type"] = {"$in": job_types}
+    if cities:
+        filter_query["city"] = {"$in": cities}
+
+    index = await get_async_index()
+    response = await index.query(
+        namespace="job_ads",
+        vector=[0.0] * VECTOR_DIM,
+        top_k=top_k,
+        include_metadata=True,
+        filter=filter_query if filter_query else None
+    )
+    return [job_ad_report_row(match.metadata, match.score) for match in response.matches]
+
+async def filter_candidates_for_job_description(job_description: str, top_k: int = 5, rerank_results: bool = False,
+                                                required_experience_level: str | None = None, city: str | None = None):
+    job_description = normalize_query_text(job_description)
+    if not job_description:
+        raise ValueError("Job description is required for vector search")
+
+    if rerank_results:
+        params = {"job_description": job_description, "top_k": top_k, **normalize_filters({
+            "required_experience_level": required_experience_level,
+            "city": city,
+        })}
+        return await search_results.aget_or_compute(
+            "candidates", "report.job_description.rerank", params,
+            lambda: _rerank_candidates_for_job_description(
+                job_description, top_k, params.get("required_experience_level"), params.get("city")
+            )
+        )
+
+    return await search_results.aget_or_compute(
+        "candidates", "report.job_description", {"job_description": job_description, "top_k": top_k},
+        lambda: _query_candidates_for_job_description(job_description, top_k)
+    )
+
+async def _search_candidates_for_job_description(job_description: str, top_k: int) -> list[dict]:
+    embedding = await generate_skills_embedding(job_description)
+
+    engine = vector_engine_for("candidates")
+    if engine is not None:
+        ranked = await asyncio.to_thread(search_candidate_vectors, engine, embedding, top_k)
+        return await hydrate_candidates(ranked)
+
+    index = await get_async_index()
+    response = await index.query(
+        namespace="candidates",
+        vector=embedding,
+        top_k=top_k,
+        include_metadata=True
+    )
+    return [{"id": match.id, "metadata": match.metadata, "score": match.score} for match in response.matches]
+
+async def _query_candidates_for_job_description(job_description: str, top_k: int):
+    candidates = await _search_candidates_for_job_description(job_description, top_k)
+    return [candidate_report_row(c["metadata"], c["score"]) for c in candidates]
+
+async def _rerank_candidates_for_job_description(job_description: str, top_k: int, required_experience_level: str | None, city: str | None):
+    candidates = await _search_candidates_for_job_description(job_description, fetch_size(top_k))
+    min_years, max_years = experience_window(required_experience_level)
+    reranked = await asyncio.to_thread(
+        rerank,
+        candidates,
+        top_k,
+        version=namespace_versions.get("candidates"),
+        required_skills=mentioned_skills(job_description),
+        min_years=min_years,
+        max_years=max_years,
+        city=city,
+    )
+    return [{**candidate_report_row(c["metadata"], c["score"]), "features": c["features"]} for c in reranked]
@@ -0,0 +1,89 @@
+import asyncio
+import inspect
+import threading
+import time
+
+# Zajednički modul za job-matcher-service i job-filter-service (isti fajl u oba servisa).
+# Klijenti (OpenAI, Pinecone, Elasticsearch) se prave pri prvoj upotrebi, a ne pri importu modula,
+# pa import ne ide na mrežu; lifespan ih otvara unapred kroz warm_up pre prvog zahteva.
+
+_clients = []
+
+
+class LazyClient:
+    """
+    Proxy oko klijenta koji se pravi tek pri prvom pristupu (factory se poziva jednom, thread-safe).
+    Atributi se prosleđuju pravom klijentu, pa se koristi isto kao i sam klijent: index.query(...).
+    """
+
+    def __init__(self, name: str, factory):
+        self.name = name
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+        self.init_ms = None
+        _clients.append(self)
+
+    def get(self):
+        client = self._client
+        if client is None:
+            with self._lock:
+                if self._client is None:
+                    started = time.perf_counter()
+                    self._client = self._factory()
+                    self.init_ms = round((time.perf_counter() - started) * 1000, 1)
+                client = self._client
+        return client
+
+    @property
+    def loaded(self) -> bool:
+        return self._client is not None
+
+    def reset(self):
+        """Sledeći pristup pravi novi klijent (npr. posle close)"""
+        with self._lock:
+            self._client = None
+            self.init_ms = None
+
+    def __getattr__(self, name):
+        # poziva se samo za atribute kojih nema na samom proxy-ju
+        return getattr(self.get(), name)
+
+    def stats(self) -> dict:
+        return {"name": self.name, "loaded": self.loaded, "init_ms": self.init_ms}
+
+
+def loaded_clients() -> list[str]:
+    return [client.name for client in _clients if client.loaded]
+
+
+def client_stats() -> list[dict]:
+    return [client.stats() for client in _clients]
+
+
+async def warm_up(steps: list[tuple[str, object]]) -> dict:
+    """
+    Izvršava korake zagrevanja redom (sinhroni koraci idu u thread, korutine se čekaju) i meri ih.
+    Greška u koraku se beleži i ne zaustavlja start - klijent se tada otvara na prvom zahtevu.
+    """
+    report = {"steps": [], "ok": True}
+    started = time.perf_counter()
+    for name, step in steps:
+        step_started = time.perf_counter()
+        error = None
+        try:
+            if inspect.iscoroutinefunction(step):
+                await step()
+            else:
+                await asyncio.to_thread(step)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            report["ok"] = False
+            print(f"Warm-up korak '{name}' nije uspeo: {error}")
+        report["steps"].append({
+            "name": name,
+            "ms": round((time.perf_counter() - step_started) * 1000, 1),
+            "error": error,
+        })
+    report["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return report
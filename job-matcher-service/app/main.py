@@ -1,7 +1,66 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routers import candidates_router, job_ads_router
+from app.routers import bulk_router, candidates_router, job_ads_router, export_router, report_jobs_router
+from app.database import close_async_index, warm_up_clients
+from app.lazy_client import client_stats
+from app.report_jobs import report_jobs
+from app.embeddings.embedding_client import embedding_stats
+from app.search.indexes import metadata_index_stats, start_metadata_index_sync
+from app.search.pagination import candidate_result_sets
+from app.search.result_cache import search_results
+from app.search.vector_engine import VECTOR_ENGINES, load_vector_engines, start_vector_engine_sync
+from app.matching.match_table import match_table_info
 
-app = FastAPI(title="Job Matcher API")
+STARTUP_WARM_UP = os.getenv("STARTUP_WARM_UP", "true").lower() == "true"
 
+startup_report = {}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_metadata_index_sync()
+    load_vector_engines()
+    start_vector_engine_sync()
+    # worker prima saobraćaj tek posle warm-up-a; bez njega se klijenti otvaraju na prvom zahtevu
+    if STARTUP_WARM_UP:
+        startup_report.update(await warm_up_clients())
+    yield
+    report_jobs.shutdown()
+    await close_async_index()
+
+app = FastAPI(title="Job Matcher API", lifespan=lifespan)
+
+# bulk rute pre candidates/job_ads rute sa {id} parametrom
+app.include_router(bulk_router.router)
 app.include_router(candidates_router.router, tags=["Candidates"])
-app.include_router(job_ads_router.router, tags=["Job Ads"])
\ No newline at end of file
+app.include_router(job_ads_router.router, tags=["Job Ads"])
+app.include_router(export_router.router, tags=["Export"])
+app.include_router(report_jobs_router.router)
+
+@app.get("/startup/stats")
+def startup_stats():
+    return {"warm_up": startup_report or None, "clients": client_stats()}
+
+@app.get("/embeddings/cache-stats")
+def embedding_stats_endpoint():
+    return embedding_stats()
+
+@app.get("/metadata-index/stats")
+def metadata_index_stats_endpoint():
+    return metadata_index_stats()
+
+@app.get("/result-sets/stats")
+def result_set_cache_stats():
+    return candidate_result_sets.stats()
+
+@app.get("/search-cache/stats")
+def search_cache_stats():
+    return search_results.stats()
+
+@app.get("/vector-engine/stats")
+def vector_engine_stats():
+    return [engine.stats() for engine in VECTOR_ENGINES.values()]
+
+@app.get("/matches/info")
+def match_table_info_endpoint():
+    return match_table_info() or {"built": False}
\ No newline at end of file
@@ -0,0 +1,220 @@
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import ExitStack
+
+import numpy as np
+
+from app.matching.match_table import MATCH_TABLE_PATH, MatchTableWriter
+from app.search.vector_engine import ENGINE_FIELDS, VECTOR_REPLICA_DIR, Replica, build_replica, pinned_replica
+
+# Offline uparivanje svih job ad-ova sa svim kandidatima (i obrnuto) nad lokalnim replikama:
+#   python -m app.search.vector_engine          (ili --refresh ovde)
+#   python -m app.matching.batch_match --top-n 20 --workers 8
+# Skorovi se računaju po blokovima (block_size x target_block), a za svaki red se čuva samo tekući top-N,
+# pa memorija ne zavisi od broja parova (100k x 100k bi inače bila matrica od 40 GB).
+
+# required_experience_level -> dozvoljen raspon years_experience kandidata (uključivo)
+EXPERIENCE_YEARS = {
+    "junior": (0.0, 3.0),
+    "mid": (2.0, 6.0),
+    "senior": (5.0, None),
+}
+
+_worker = {}
+
+
+def _lookup(values: list, mapping, default) -> np.ndarray:
+    """Niz vrednost-po-kodu rečnika; poslednji element je za kod -1 (polje nije postavljeno)"""
+    return np.array([mapping(value) for value in values] + [default])
+
+
+def _init_worker(job_ads_path: str, candidates_path: str, city_rule: bool, experience_rule: bool):
+    # isti build-ovi kao u roditelju (ne CURRENT) - indeksi iz worker-a se mapiraju na id-jeve roditelja
+    jobs = Replica(job_ads_path)
+    candidates = Replica(candidates_path)
+
+    levels = jobs.columns["required_experience_level"]
+    level_vocab = jobs.vocab["required_experience_level"]
+    # poslednji element svakog niza je za kod -1 (polje nije postavljeno)
+    bounds = [EXPERIENCE_YEARS.get(level, (None, None)) for level in level_vocab]
+    job_min = np.array([-np.inf if low is None else low for low, _ in bounds] + [-np.inf])[levels]
+    job_max = np.array([np.inf if high is None else high for _, high in bounds] + [np.inf])[levels]
+
+    # gradovi se porede kroz kodove iz rečnika kandidata; grad koji nema nijedan kandidat dobija -2
+    candidate_city_codes = {city: code for code, city in enumerate(candidates.vocab["city"])}
+    job_city = _lookup(jobs.vocab["city"], lambda city: candidate_city_codes.get(city, -2), -2)[jobs.columns["city"]]
+    job_remote = _lookup(jobs.vocab["work_mode"], lambda mode: mode == "remote", False)[jobs.columns["work_mode"]]
+
+    _worker.update({
+        "job_ads": jobs,
+        "candidates": candidates,
+        "job_min": job_min,
+        "job_max": job_max,
+        "job_city": job_city,
+        "job_remote": job_remote,
+        "candidate_years": candidates.columns["years_experience"],
+        "candidate_city": candidates.columns["city"],
+        "city_rule": city_rule,
+        "experience_rule": experience_rule,
+    })
+
+
+def _compatible(job_rows: slice, candidate_rows: slice) -> np.ndarray:
+    """Maska (broj job-ova x broj kandidata): iskustvo u rasponu nivoa i isti grad (osim za remote)"""
+    w = _worker
+    n_jobs = len(w["job_min"][job_rows])
+    n_candidates = len(w["candidate_years"][candidate_rows])
+    mask = np.ones((n_jobs, n_candidates), dtype=bool)
+
+    if w["experience_rule"]:
+        years = w["candidate_years"][candidate_rows][None, :]
+        mask &= (years >= w["job_min"][job_rows][:, None]) & (years <= w["job_max"][job_rows][:, None])
+    if w["city_rule"]:
+        same_city = w["job_city"][job_rows][:, None] == w["candidate_city"][candidate_rows][None, :]
+        mask &= same_city | w["job_remote"][job_rows][:, None]
+    return mask
+
+
+def _match_block(namespace: str, start: int, end: int, top_n: int, target_block: int):
+    """
+    Top-N parova za redove [start, end) jednog namespace-a ("job_ads" -> kandidati, "candidates" -> job-ovi).
+    Vraća (start, indeksi, skorovi); nekompatibilni parovi imaju skor -inf.
+    """
+    target_namespace = "candidates" if namespace == "job_ads" else "job_ads"
+    queries = np.asarray(_worker[namespace].vectors[start:end])
+    targets = _worker[target_namespace].vectors
+    rows = end - start
+
+    best_scores = np.full((rows, 0), -np.inf, dtype=np.float32)
+    best_index = np.zeros((rows, 0), dtype=np.int64)
+
+    for t_start in range(0, targets.shape[0], target_block):
+        t_end = min(t_start + target_block, targets.shape[0])
+        scores = queries @ np.asarray(targets[t_start:t_end]).T
+        if namespace == "job_ads":
+            mask = _compatible(slice(start, end), slice(t_start, t_end))
+        else:
+            mask = _compatible(slice(t_start, t_end), slice(start, end)).T
+        scores[~mask] = -np.inf
+
+        scores = np.concatenate([best_scores, scores], axis=1)
+        index = np.concatenate([best_index, np.broadcast_to(np.arange(t_start, t_end), (rows, t_end - t_start))], axis=1)
+        if scores.shape[1] > top_n:
+            keep = np.argpartition(-scores, top_n - 1, axis=1)[:, :top_n]
+            scores = np.take_along_axis(scores, keep, axis=1)
+            index = np.take_along_axis(index, keep, axis=1)
+        best_scores, best_index = scores, index
+
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return start, np.take_along_axis(best_index, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+def _rows(query_ids: list, target_ids: list, start: int, index: np.ndarray, scores: np.ndarray):
+    for offset in range(index.shape[0]):
+        query_id = query_ids[start + offset]
+        for rank, (target, score) in enumerate(zip(index[offset], scores[offset]), start=1):
+            if score == -np.inf:
+                break
+            yield query_id, rank, target_ids[target], float(score)
+
+
+def run_batch(root: str = VECTOR_REPLICA_DIR, path: str = MATCH_TABLE_PATH, top_n: int = 20, workers: int | None = None,
+              block_size: int = 512, target_block: int = 8192, city_rule: bool = True, experience_rule: bool = True) -> dict:
+    # build-ovi se biraju jednom i ostaju pin-ovani do kraja (novi build iz servisa ih ne briše)
+    with ExitStack() as pins:
+        jobs = pins.enter_context(pinned_replica("job_ads", root))
+        candidates = pins.enter_context(pinned_replica("candidates", root))
+        if jobs is None or candidates is None:
+            raise ValueError("Nema lokalnih replika - pokreni python -m app.search.vector_engine ili --refresh")
+        if jobs.model != candidates.model:
+            raise ValueError(f"Replike su napravljene različitim modelima ({jobs.model} / {candidates.model})")
+        return _run_batch(jobs, candidates, path, top_n, workers, block_size, target_block, city_rule, experience_rule)
+
+
+def _run_batch(jobs: Replica, candidates: Replica, path: str, top_n: int, workers: int | None, block_size: int,
+               target_block: int, city_rule: bool, experience_rule: bool) -> dict:
+
+    ids = {"job_ads": jobs.ids, "candidates": candidates.ids}
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    writer = MatchTableWriter(path)
+    written = {"job_ads": 0, "candidates": 0}
+
+    def store(future, namespace):
+        start, index, scores = future.result()
+        target_ids = ids["candidates" if namespace == "job_ads" else "job_ads"]
+        rows = list(_rows(ids[namespace], target_ids, start, index, scores))
+        writer.write(namespace, rows)
+        written[namespace] += len(rows)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(jobs.path, candidates.path, city_rule, experience_rule)) as executor:
+            in_flight = {}
+            for namespace in ("job_ads", "candidates"):
+                total = len(ids[namespace])
+                for start in range(0, total, block_size):
+                    # ograničen broj blokova u letu - rezultati se upisuju čim stignu
+                    if len(in_flight) >= workers * 2:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            store(future, in_flight.pop(future))
+                    future = executor.submit(_match_block, namespace, start, min(start + block_size, total), top_n, target_block)
+                    in_flight[future] = namespace
+
+            for future in list(in_flight):
+                store(future, in_flight.pop(future))
+
+        info = {
+            "job_ads_build": jobs.build_id,
+            "candidates_build": candidates.build_id,
+            "top_n": top_n,
+            "city_rule": city_rule,
+            "experience_rule": experience_rule,
+            "job_ad_rows": written["job_ads"],
+            "candidate_rows": written["candidates"],
+            "elapsed_seconds": round(time.perf_counter() - started, 2),
+        }
+        writer.commit(info)
+    except BaseException:
+        writer.abort()
+        raise
+
+    print(f"Match tabela: {len(jobs.ids)} job ad-ova x {len(candidates.ids)} kandidata za {info['elapsed_seconds']}s -> {path}")
+    return info
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch top-N uparivanje job ad-ova i kandidata")
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None, help="Broj procesa (default: broj CPU-a)")
+    parser.add_argument("--block-size", type=int, default=512, help="Redova upita po zadatku")
+    parser.add_argument("--target-block", type=int, default=8192, help="Kolona po jednom matričnom proizvodu")
+    parser.add_argument("--no-city-rule", action="store_true", help="Ne zahtevaj isti grad za onsite/hybrid oglase")
+    parser.add_argument("--no-experience-rule", action="store_true", help="Ne proveravaj godine iskustva za nivo oglasa")
+    parser.add_argument("--refresh", action="store_true", help="Prvo napravi nove replike iz Pinecone-a")
+    parser.add_argument("--root", default=VECTOR_REPLICA_DIR)
+    parser.add_argument("--output", default=MATCH_TABLE_PATH)
+    args = parser.parse_args()
+
+    if args.refresh:
+        from app.embeddings.embedding_client import EMBEDDING_MODEL
+        from app.export.namespace_export import iter_namespace
+        for namespace, fields in ENGINE_FIELDS.items():
+            build_replica(args.root, namespace, iter_namespace(namespace, include_values=True), EMBEDDING_MODEL, **fields)
+
+    run_batch(
+        root=args.root,
+        path=args.output,
+        top_n=args.top_n,
+        workers=args.workers,
+        block_size=args.block_size,
+        target_block=args.target_block,
+        city_rule=not args.no_city_rule,
+        experience_rule=not args.no_experience_rule,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import json
+import os
+import sqlite3
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MATCH_TABLE_PATH = os.path.join(BASE_DIR, "cache", "matches.sqlite")
+
+MATCH_TABLE_PATH = os.getenv("MATCH_TABLE_PATH", DEFAULT_MATCH_TABLE_PATH)
+
+# (tabela, kolona upita, kolona rezultata) za oba smera
+DIRECTIONS = {
+    "job_ads": ("job_candidate_matches", "job_id", "candidate_id"),
+    "candidates": ("candidate_job_matches", "candidate_id", "job_id"),
+}
+
+
+class MatchTableWriter:
+    """
+    Piše novu tabelu u privremeni fajl i na kraju ga atomično zamenjuje (os.replace),
+    pa endpoint-i do kraja batch-a čitaju prethodni rezultat.
+    """
+
+    def __init__(self, path: str = MATCH_TABLE_PATH):
+        self.path = path
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        self._conn = sqlite3.connect(self.tmp_path)
+        self._conn.execute("PRAGMA synchronous=OFF")
+        for table, query_column, match_column in DIRECTIONS.values():
+            self._conn.execute(
+                f"CREATE TABLE {table} ({query_column} TEXT NOT NULL, rank INTEGER NOT NULL, "
+                f"{match_column} TEXT NOT NULL, score REAL NOT NULL, PRIMARY KEY ({query_column}, rank)) WITHOUT ROWID"
+            )
+        self._conn.execute("CREATE TABLE match_run (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def write(self, namespace: str, rows):
+        """rows: (query_id, rank, match_id, score)"""
+        table = DIRECTIONS[namespace][0]
+        self._conn.executemany(f"INSERT INTO {table} VALUES (?, ?, ?, ?)", rows)
+
+    def commit(self, info: dict):
+        info = {**info, "generated_at": time.time()}
+        self._conn.executemany("INSERT INTO match_run VALUES (?, ?)", [(key, json.dumps(value)) for key, value in info.items()])
+        self._conn.commit()
+        self._conn.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        self._conn.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def _connect(path: str) -> sqlite3.Connection | None:
+    if not os.path.exists(path):
+        return None
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def top_matches(namespace: str, query_id: str, limit: int = 20, path: str = MATCH_TABLE_PATH) -> list[dict] | None:
+    """
+    Najbolji parovi za job ad (namespace="job_ads") ili kandidata (namespace="candidates") iz poslednjeg batch-a.
+    Vraća None ako tabela još nije napravljena.
+    """
+    table, query_column, match_column = DIRECTIONS[namespace]
+    conn = _connect(path)
+    if conn is None:
+        return None
+    try:
+        rows = conn.execute(
+            f"SELECT rank, {match_column}, score FROM {table} WHERE {query_column} = ? ORDER BY rank LIMIT ?",
+            (query_id, limit)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [{"rank": rank, match_column: match_id, "score": score} for rank, match_id, score in rows]
+
+
+def match_table_info(path: str = MATCH_TABLE_PATH) -> dict | None:
+    conn = _connect(path)
+    if conn is None:
+        return None
+    try:
+        return {key: json.loads(value) for key, value in conn.execute("SELECT key, value FROM match_run")}
+    finally:
+        conn.close()
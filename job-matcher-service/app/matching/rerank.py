@@ -0,0 +1,197 @@
+import os
+import re
+import threading
+
+import numpy as np
+
+from app.embeddings.skills_table import skills_mask
+from app.enums.candidates_enums import SKILLS_POOL
+from app.matching.batch_match import EXPERIENCE_YEARS
+
+# Strukturni re-ranking posle Pinecone (ili lokalnog) pretraživanja: dohvata se RERANK_OVERFETCH puta više
+# kandidata nego što se traži, pa se za ceo blok odjednom (NumPy, bez petlje po kandidatu) računa
+# kombinovani skor: semantički skor, udeo traženih skill-ova, penal za razliku u iskustvu i poklapanje grada.
+# Težine se podešavaju kroz env; feature za koji upit ne daje kriterijum ne ulazi u skor.
+
+RERANK_WEIGHTS = {
+    "semantic": float(os.getenv("RERANK_WEIGHT_SEMANTIC", 0.5)),
+    "skills": float(os.getenv("RERANK_WEIGHT_SKILLS", 0.25)),
+    "experience": float(os.getenv("RERANK_WEIGHT_EXPERIENCE", 0.15)),
+    "location": float(os.getenv("RERANK_WEIGHT_LOCATION", 0.1)),
+}
+RERANK_OVERFETCH = int(os.getenv("RERANK_OVERFETCH", 5))
+RERANK_MAX_FETCH = int(os.getenv("RERANK_MAX_FETCH", 1000))
+# razlika od ovoliko godina (ili više) daje experience feature 0
+RERANK_EXPERIENCE_SCALE = float(os.getenv("RERANK_EXPERIENCE_SCALE", 3))
+
+_SKILL_BY_LOWER = {skill.lower(): skill for skill in SKILLS_POOL}
+_KNOWN_SKILLS = set(SKILLS_POOL)
+
+
+def fetch_size(top_k: int) -> int:
+    """Koliko kandidata dohvatiti da bi posle re-rankinga ostalo top_k"""
+    return max(top_k, min(top_k * RERANK_OVERFETCH, RERANK_MAX_FETCH))
+
+
+def mentioned_skills(text: str | None) -> list[str]:
+    """Skill-ovi iz SKILLS_POOL pomenuti u slobodnom tekstu (npr. opisu posla), redosledom iz SKILLS_POOL"""
+    if not text:
+        return []
+    tokens = {token for token in re.split(r"\W+", text.lower()) if token}
+    found = {_SKILL_BY_LOWER[token] for token in tokens if token in _SKILL_BY_LOWER}
+    return [skill for skill in SKILLS_POOL if skill in found]
+
+
+def experience_window(required_experience_level: str | None) -> tuple[float | None, float | None]:
+    """required_experience_level job ad-a -> očekivani raspon years_experience (isti kao u batch match-u)"""
+    level = getattr(required_experience_level, "value", required_experience_level)
+    return EXPERIENCE_YEARS.get(level, (None, None))
+
+
+class CandidateColumns:
+    """
+    Kodirane kolone kandidata (skill maska, years_experience, kod grada) po id-ju, za jednu verziju namespace-a.
+    Kodiranje iz metadata je jedini deo sa Python petljom po kandidatu, pa se radi jednom po kandidatu,
+    a blok za re-ranking je posle samo indeksiranje nizova. Upis u namespace (nova verzija) briše keš.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, version):
+        self.version = version
+        self._rows = {}
+        self._city_codes = {}
+        self._size = 0
+        self._skills = np.empty(0, dtype=np.uint64)
+        self._years = np.empty(0, dtype=np.float32)
+        self._cities = np.empty(0, dtype=np.int32)
+
+    def _append(self, new: dict):
+        # kombinacija skill-ova ima najviše 2^9, pa se maska računa jednom po kombinaciji
+        masks = {}
+        skills = []
+        for metadata in new.values():
+            key = tuple(metadata.get("skills") or ())
+            mask = masks.get(key)
+            if mask is None:
+                mask = masks[key] = skills_mask(skill for skill in key if skill in _KNOWN_SKILLS)
+            skills.append(mask)
+        city_codes = self._city_codes
+        cities = [city_codes.setdefault((md.get("city") or "").strip().lower(), len(city_codes)) for md in new.values()]
+        # None (kandidat bez iskustva) postaje NaN
+        years = [metadata.get("years_experience") for metadata in new.values()]
+
+        start, end = self._size, self._size + len(new)
+        if end > len(self._years):
+            capacity = max(end, 2 * len(self._years))
+            self._skills, self._years, self._cities = (
+                np.concatenate([column[:start], np.empty(capacity - start, dtype=column.dtype)])
+                for column in (self._skills, self._years, self._cities)
+            )
+        self._skills[start:end] = skills
+        self._years[start:end] = np.array(years, dtype=np.float32)
+        self._cities[start:end] = cities
+        self._rows.update(zip(new, range(start, end)))
+        self._size = end
+
+    def block(self, candidates: list[dict], version) -> dict:
+        with self._lock:
+            if version != self.version:
+                self._reset(version)
+            rows = self._rows
+            new = {candidate["id"]: candidate["metadata"] for candidate in candidates if candidate["id"] not in rows}
+            if new:
+                self._append(new)
+            positions = np.fromiter((rows[candidate["id"]] for candidate in candidates), dtype=np.int64, count=len(candidates))
+            return {
+                "semantic": np.array([candidate.get("score") for candidate in candidates], dtype=np.float32),
+                "skills": self._skills[positions],
+                "years": self._years[positions],
+                "city": self._cities[positions],
+                "city_codes": self._city_codes,
+            }
+
+
+candidate_columns = CandidateColumns()
+
+
+def candidate_block(candidates: list[dict], version=None) -> dict:
+    """
+    [{"id", "metadata", "score"}] -> kolone (NumPy nizovi) nad kojima se računaju feature-i.
+    Sa version (namespace_versions.get("candidates")) kodirane kolone se čuvaju između upita.
+    """
+    columns = candidate_columns if version is not None else CandidateColumns()
+    return columns.block(candidates, version)
+
+
+def feature_scores(block: dict, required_skills: list[str] | None = None, min_years: float | None = None,
+                   max_years: float | None = None, city: str | None = None) -> dict:
+    """
+    Feature-i u opsegu [0, 1] po kandidatu. Feature bez kriterijuma u upitu (npr. nema traženog grada) se izostavlja,
+    pa ne podiže i ne spušta skor svima podjednako.
+    """
+    features = {}
+
+    semantic = block["semantic"]
+    if len(semantic) and not np.isnan(semantic).all():
+        features["semantic"] = np.nan_to_num(semantic, nan=0.0)
+
+    required = skills_mask(required_skills or [])
+    if required:
+        overlap = np.bitwise_count(block["skills"] & np.uint64(required))
+        features["skills"] = overlap.astype(np.float32) / bin(required).count("1")
+
+    if min_years is not None or max_years is not None:
+        years = block["years"]
+        gap = np.zeros(len(years), dtype=np.float32)
+        if min_years is not None:
+            gap += np.clip(min_years - years, 0, None)
+        if max_years is not None:
+            gap += np.clip(years - max_years, 0, None)
+        # kandidat bez years_experience dobija najveći penal
+        gap = np.nan_to_num(gap, nan=RERANK_EXPERIENCE_SCALE)
+        features["experience"] = 1.0 - np.clip(gap / RERANK_EXPERIENCE_SCALE, 0.0, 1.0)
+
+    if city:
+        code = block["city_codes"].get(city.strip().lower(), -1)
+        features["location"] = (block["city"] == code).astype(np.float32)
+
+    return features
+
+
+def rerank(candidates: list[dict], top_k: int, weights: dict | None = None, version=None, **query) -> list[dict]:
+    """
+    Re-rangira [{"id", "metadata", "score"}] i vraća top_k sa kombinovanim "score" i "features" (vrednost
+    svakog feature-a koji je ušao u skor; "semantic" je originalni skor iz pretrage).
+    query: required_skills, min_years, max_years, city (vidi feature_scores); version kao za candidate_block.
+    """
+    if not candidates:
+        return []
+
+    weights = weights or RERANK_WEIGHTS
+    features = {
+        name: values for name, values in feature_scores(candidate_block(candidates, version), **query).items()
+        if weights.get(name, 0) > 0
+    }
+    if not features:
+        return [{**candidate, "features": {}} for candidate in candidates[:top_k]]
+
+    total_weight = sum(weights[name] for name in features)
+    blended = sum(weights[name] * values for name, values in features.items()) / total_weight
+
+    if top_k < len(blended):
+        top = np.argpartition(-blended, top_k - 1)[:top_k]
+        order = top[np.argsort(-blended[top], kind="stable")]
+    else:
+        order = np.argsort(-blended, kind="stable")
+
+    return [
+        {
+            **candidates[row],
+            "score": round(float(blended[row]), 4),
+            "features": {name: round(float(values[row]), 4) for name, values in features.items()},
+        }
+        for row in order
+    ]
@@ -0,0 +1,99 @@
+import argparse
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from pinecone import ServerlessSpec
+
+from app.database import pc, FULL_INDEX_NAME
+from app.embeddings.embedding_cache import embedding_key
+from app.embeddings.providers import OpenAIEmbeddingProvider, shorten_embedding
+from app.crud_operations.candidates import candidate_text_from_metadata
+from app.crud_operations.job_ads import job_text_from_metadata
+from app.export.namespace_export import iter_namespace
+from app.ingestion.pipeline import _batched
+
+# Pravi kompaktni index (npr. 512 dimenzija) iz postojećeg 1536-dim indexa, bez poziva ka OpenAI:
+# text-embedding-3 vektor skraćen na prvih N vrednosti i ponovo normalizovan je isti kao
+# embedding dobijen sa dimensions=N. (Za EMBEDDING_PROVIDER=local ovo ne važi - tada ponovo pokreni ingestion.)
+#
+#   python -m app.migrate_compact_index --dimensions 512
+# posle toga servis se prebacuje sa EMBEDDING_DIMENSIONS=512 (i PINECONE_COMPACT_INDEX_NAME ako nije default)
+
+NAMESPACES = {
+    "candidates": candidate_text_from_metadata,
+    "job_ads": job_text_from_metadata,
+}
+
+
+def ensure_index(name: str, dimensions: int, cloud: str, region: str):
+    if not pc.has_index(name):
+        print(f"Pravim index '{name}' ({dimensions} dim, cosine)")
+        pc.create_index(
+            name=name,
+            dimension=dimensions,
+            metric="cosine",
+            spec=ServerlessSpec(cloud=cloud, region=region)
+        )
+    return pc.Index(name)
+
+
+def compact_batch(target, namespace: str, records: list[dict], dimensions: int, model_name: str) -> int:
+    text_from_metadata = NAMESPACES[namespace]
+
+    vectors = []
+    for record in records:
+        metadata = record["metadata"]
+        # hash mora da odgovara skraćenom modelu, inače bi prvi PUT nepotrebno ponovo embedovao
+        metadata["embedding_hash"] = embedding_key(model_name, text_from_metadata(metadata))
+        vectors.append({
+            "id": record["id"],
+            "values": shorten_embedding(record["values"], dimensions),
+            "metadata": metadata
+        })
+
+    if vectors:
+        target.upsert(vectors=vectors, namespace=namespace)
+    return len(vectors)
+
+
+def migrate_namespace(source, target, namespace: str, dimensions: int, workers: int) -> int:
+    model_name = OpenAIEmbeddingProvider(None, dimensions=dimensions).name
+    migrated = 0
+    started = time.perf_counter()
+    in_flight = set()
+
+    # čitanje (list + fetch) ide kroz exporter, a upsert-i u kompaktni index paralelno ovde
+    records = iter_namespace(namespace, include_values=True, max_in_flight=workers, source_index=source)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch in _batched(records, 100):
+            if len(in_flight) >= workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                migrated += sum(future.result() for future in done)
+            in_flight.add(executor.submit(compact_batch, target, namespace, batch, dimensions, model_name))
+
+        migrated += sum(future.result() for future in in_flight)
+
+    elapsed = time.perf_counter() - started
+    print(f"[{namespace}] {migrated} vektora prebačeno za {elapsed:.1f}s")
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pravi kompaktni Pinecone index sa skraćenim embedding-ima")
+    parser.add_argument("--dimensions", type=int, default=512)
+    parser.add_argument("--target", help="Ime kompaktnog indexa (default: <PINECONE_INDEX_NAME>-<dimensions>)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--cloud", default="aws")
+    parser.add_argument("--region", default="us-east-1")
+    args = parser.parse_args()
+
+    target_name = args.target or f"{FULL_INDEX_NAME}-{args.dimensions}"
+    source = pc.Index(FULL_INDEX_NAME)
+    target = ensure_index(target_name, args.dimensions, args.cloud, args.region)
+
+    for namespace in NAMESPACES:
+        migrate_namespace(source, target, namespace, args.dimensions, args.workers)
+
+
+if __name__ == "__main__":
+    main()
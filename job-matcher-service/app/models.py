@@ -20,6 +20,21 @@ class CandidateUpdate(BaseModel):
     city: Optional[str] = None
     country: Optional[str] = None
 
+class MgetRequest(BaseModel):
+    ids: List[str]
+    include_values: bool = False
+
+class CandidateBulkUpdate(CandidateUpdate):
+    id: str
+
+class CandidateBulkDelete(BaseModel):
+    ids: Optional[List[str]] = None
+    education_level: Optional[str] = None
+    city: Optional[str] = None
+    country: Optional[str] = None
+    min_years_experience: Optional[float] = None
+    max_years_experience: Optional[float] = None
+
 class JobAdCreate(BaseModel):
     title: str
     description: str
@@ -38,6 +53,17 @@ class JobAdUpdate(BaseModel):
     city: Optional[str] = None
     country: Optional[str] = None
 
+class JobAdBulkUpdate(JobAdUpdate):
+    id: str
+
+class JobAdBulkDelete(BaseModel):
+    ids: Optional[List[str]] = None
+    experience_level: Optional[str] = None
+    job_type: Optional[str] = None
+    work_mode: Optional[str] = None
+    city: Optional[str] = None
+    country: Optional[str] = None
+
 class JobAdResult(BaseModel):
     id: str
     title: str
@@ -0,0 +1,120 @@
+import os
+
+# Zajednički modul za job-matcher-service i job-filter-service (isti fajl u oba servisa).
+# Raspored teksta za FPDF izveštaje u jednom prolazu: tekst se prelama jednom, pa ista lista linija daje i visinu
+# bloka (za page break) i ono što se crta - umesto multi_cell(split_only=True) za merenje pa multi_cell za crtanje.
+# Prelom je isti kao u FPDF 1.7.2 multi_cell (uključujući razmak reči za align="J"), ali se širina meri po reči
+# iz keša metrike fonta, a ne znak po znak pri svakom pozivu.
+
+PDF_WORD_CACHE_SIZE = int(os.getenv("PDF_WORD_CACHE_SIZE", 200000))
+
+# širine reči po core fontu (family+style) u 1/1000 veličine fonta - ne zavise od veličine, pa se dele
+# između svih izveštaja u procesu (i između job-ova u istom report worker-u)
+_word_widths = {}
+
+
+def _word_cache(font: dict) -> dict:
+    key = font["name"]
+    cache = _word_widths.get(key)
+    if cache is None or len(cache) >= PDF_WORD_CACHE_SIZE:
+        cache = _word_widths[key] = {}
+    return cache
+
+
+def word_cache_stats() -> dict:
+    return {name: len(cache) for name, cache in _word_widths.items()}
+
+
+class ReportLayout:
+    """
+    Prelamanje i crtanje teksta nad jednim FPDF dokumentom.
+    wrap() vraća linije [(tekst, razmak_reči)] za trenutni font; height() i draw() rade nad istim linijama.
+    """
+
+    def __init__(self, pdf):
+        self.pdf = pdf
+
+    def _units(self, word: str, widths: dict, cw: dict) -> int:
+        units = widths.get(word)
+        if units is None:
+            units = widths[word] = sum(cw.get(char, 0) for char in word)
+        return units
+
+    @staticmethod
+    def _break_word(word: str, cw: dict, wmax: float, lines: list) -> tuple[str, int]:
+        """Reč šira od linije se seče po znakovima (isto kao multi_cell); vraća ostatak i njegovu širinu"""
+        start = position = units = 0
+        while position < len(word):
+            units += cw.get(word[position], 0)
+            if units > wmax:
+                if position == start:
+                    position += 1
+                lines.append((word[start:position], None))
+                start, units = position, 0
+            else:
+                position += 1
+        return word[start:], units
+
+    def wrap(self, text: str, width: float = 0, align: str = "J") -> list[tuple[str, float | None]]:
+        pdf = self.pdf
+        if pdf.unifontsubset:
+            # TTF fontovi mere širinu drugačije - za njih ostaje multi_cell
+            return [(line, None) for line in pdf.multi_cell(width, 0, text, align=align, split_only=True)]
+
+        if width == 0:
+            width = pdf.w - pdf.r_margin - pdf.x
+        wmax = (width - 2 * pdf.c_margin) * 1000.0 / pdf.font_size
+        cw = pdf.current_font["cw"]
+        widths = _word_cache(pdf.current_font)
+        space = cw.get(" ", 0)
+        justify = align == "J"
+
+        text = text.replace("\r", "")
+        if text.endswith("\n"):
+            text = text[:-1]
+
+        lines = []
+        for paragraph in text.split("\n"):
+            parts, units = [], 0
+            for word in paragraph.split(" "):
+                word_units = self._units(word, widths, cw)
+                if parts:
+                    if units + space + word_units <= wmax:
+                        parts.append(word)
+                        units += space + word_units
+                        continue
+                    # prelom na poslednjem razmaku; uz "J" razmak reči popunjava liniju do pune širine
+                    spacing = None
+                    if justify:
+                        spacing = (wmax - units) / 1000.0 * pdf.font_size / (len(parts) - 1) if len(parts) > 1 else 0
+                    lines.append((" ".join(parts), spacing))
+                    parts, units = [], 0
+                if word_units > wmax:
+                    word, word_units = self._break_word(word, cw, wmax, lines)
+                parts, units = [word], word_units
+            lines.append((" ".join(parts), None))
+        return lines
+
+    @staticmethod
+    def height(lines: list, line_height: float) -> float:
+        return len(lines) * line_height
+
+    def draw(self, lines: list, line_height: float, width: float = 0, align: str = "J"):
+        """Crta linije iz wrap() kao multi_cell(width, line_height, ...) - isti izlaz, bez ponovnog merenja"""
+        pdf = self.pdf
+        for text, spacing in lines:
+            if spacing is None:
+                if pdf.ws > 0:
+                    pdf.ws = 0
+                    pdf._out("0 Tw")
+            else:
+                pdf.ws = spacing
+                pdf._out("%.3f Tw" % (spacing * pdf.k))
+            pdf.cell(width, line_height, text, 0, 2, align, 0)
+        pdf.x = pdf.l_margin
+
+    def multi_cell(self, width: float, line_height: float, text: str, align: str = "J") -> int:
+        """Zamena za pdf.multi_cell kad visina nije potrebna unapred; vraća broj linija"""
+        lines = self.wrap(text, width, align)
+        self.draw(lines, line_height, width, align)
+        return len(lines)
@@ -0,0 +1,217 @@
+import os
+import time
+import zlib
+from array import array
+
+from fpdf import FPDF
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Zajednički modul za job-matcher-service i job-filter-service (isti fajl u oba servisa).
+# FPDF drži sve stranice i ceo dokument u memoriji i upisuje fajl tek u pdf.output(). StreamingPDF upisuje svaku
+# završenu stranicu (page objekat + content stream) u fajl čim se pređe na sledeću, pa je u memoriji samo trenutna
+# stranica; na kraju se dopišu koren stabla stranica, fontovi, katalog i xref. Izlaz je isti PDF kao iz FPDF 1.7.2.
+# Izveštaj koji troši iterator rezultata (ES search_after, Pinecone list+fetch) je tako ograničen samo diskom.
+# Posle svake stranice se meri RSS procesa: rast preko PDF_MEMORY_LIMIT_MB od početka renderovanja ga prekida.
+
+PDF_MEMORY_LIMIT_MB = int(os.getenv("PDF_MEMORY_LIMIT_MB", 256))
+
+# statistika poslednjeg renderovanja u ovom procesu (report worker je vraća uz putanju)
+_last_stats = {}
+
+
+class PdfMemoryLimitExceeded(Exception):
+    """Renderovanje je prešlo PDF_MEMORY_LIMIT_MB - fajl se briše"""
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        # bez /proc - vršni RSS procesa (ru_maxrss je u KB na Linux-u)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else 0.0
+
+
+def last_render_stats() -> dict | None:
+    """Statistika poslednjeg završenog renderovanja u procesu (i briše je)"""
+    stats = dict(_last_stats) or None
+    _last_stats.clear()
+    return stats
+
+
+class _FileBuffer:
+    """Zamena za FPDF.buffer: += upisuje u fajl, len() je broj upisanih bajtova (od njega FPDF računa xref offset-e)"""
+
+    def __init__(self, file):
+        self.file = file
+        self.size = 0
+
+    def __iadd__(self, s: str):
+        data = s.encode("latin1")
+        self.file.write(data)
+        self.size += len(data)
+        return self
+
+    def __len__(self):
+        return self.size
+
+
+class _Offsets:
+    """Zamena za FPDF.offsets (dict broj objekta -> offset): niz od 8 bajtova po objektu, umesto dict unosa"""
+
+    def __init__(self):
+        self.values = array("Q")
+
+    def __setitem__(self, n: int, offset: int):
+        if n >= len(self.values):
+            self.values.extend([0] * (n + 1 - len(self.values)))
+        self.values[n] = offset
+
+    def __getitem__(self, n: int) -> int:
+        return self.values[n]
+
+
+class StreamingPDF(FPDF):
+    """
+    FPDF koji piše direktno u output_path, stranicu po stranicu. Koristi se kao context manager:
+        with StreamingPDF(output_path) as pdf:
+            ...crtanje kao sa FPDF...
+    Na izlazu se dokument završava (pdf.stats), a na izuzetak se nedovršen fajl briše.
+    Interni linkovi (add_link/set_link) moraju biti postavljeni pre nego što se pređe na sledeću stranicu.
+    """
+
+    def __init__(self, output_path: str, memory_limit_mb: int = PDF_MEMORY_LIMIT_MB, orientation="P", unit="mm", format="A4"):
+        super().__init__(orientation, unit, format)
+        self.output_path = output_path
+        self.memory_limit_mb = memory_limit_mb
+        self.stats = None
+        self._file = open(output_path, "wb")
+        self.buffer = _FileBuffer(self._file)
+        # knjigovodstvo po stranici mora ostati malo - to je jedino što raste sa brojem stranica
+        self.offsets = _Offsets()
+        self._started = time.perf_counter()
+        self._rss_start = self._rss_peak = current_rss_mb()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finish()
+        else:
+            self.abort()
+        return False
+
+    def open(self):
+        super().open()
+        # zaglavlje ide pre prve stranice, jer se stranice upisuju čim se završe
+        super()._putheader()
+
+    def _putheader(self):
+        pass
+
+    def alias_nb_pages(self, alias="{nb}"):
+        self.error("alias_nb_pages nije podržan: stranica se upisuje pre nego što je poznat ukupan broj stranica")
+
+    def _endpage(self):
+        super()._endpage()
+        self._putpage(self.page)
+        # sadržaj stranice je u fajlu
+        del self.pages[self.page]
+        self.page_links.pop(self.page, None)
+        self._file.flush()
+        self._check_memory()
+
+    def _page_size_pt(self) -> tuple[float, float]:
+        if self.def_orientation == "P":
+            return self.fw_pt, self.fh_pt
+        return self.fh_pt, self.fw_pt
+
+    def _putpage(self, n: int):
+        """Page objekat i content stream jedne stranice - isto kao telo petlje u FPDF._putpages"""
+        w_pt, h_pt = self._page_size_pt()
+        self._newobj()
+        self._out("<</Type /Page")
+        self._out("/Parent 1 0 R")
+        if n in self.orientation_changes:
+            self._out("/MediaBox [0 0 %.2f %.2f]" % (h_pt, w_pt))
+        self._out("/Resources 2 0 R")
+        if n in self.page_links:
+            annots = "/Annots ["
+            for pl in self.page_links[n]:
+                rect = "%.2f %.2f %.2f %.2f" % (pl[0], pl[1], pl[0] + pl[2], pl[1] - pl[3])
+                annots += "<</Type /Annot /Subtype /Link /Rect [" + rect + "] /Border [0 0 0] "
+                if isinstance(pl[4], str):
+                    annots += "/A <</S /URI /URI " + self._textstring(pl[4]) + ">>>>"
+                else:
+                    link = self.links[pl[4]]
+                    h = w_pt if link[0] in self.orientation_changes else h_pt
+                    annots += "/Dest [%d 0 R /XYZ 0 %.2f null]>>" % (1 + 2 * link[0], h - link[1] * self.k)
+            self._out(annots + "]")
+        if self.pdf_version > "1.3":
+            self._out("/Group <</Type /Group /S /Transparency /CS /DeviceRGB>>")
+        self._out("/Contents " + str(self.n + 1) + " 0 R>>")
+        self._out("endobj")
+
+        content = self.pages[n].encode("latin1")
+        if self.compress:
+            content = zlib.compress(content)
+        self._newobj()
+        self._out("<<" + ("/Filter /FlateDecode " if self.compress else "") + "/Length " + str(len(content)) + ">>")
+        self._putstream(content)
+        self._out("endobj")
+
+    def _putpages(self):
+        # stranice su već upisane u _endpage, ostaje koren stabla stranica
+        w_pt, h_pt = self._page_size_pt()
+        self.offsets[1] = len(self.buffer)
+        self._out("1 0 obj")
+        self._out("<</Type /Pages")
+        self._out("/Kids [" + "".join(str(3 + 2 * i) + " 0 R " for i in range(self.page)) + "]")
+        self._out("/Count " + str(self.page))
+        self._out("/MediaBox [0 0 %.2f %.2f]" % (w_pt, h_pt))
+        self._out(">>")
+        self._out("endobj")
+
+    def _check_memory(self):
+        rss = current_rss_mb()
+        self._rss_peak = max(self._rss_peak, rss)
+        if self.memory_limit_mb and rss - self._rss_start > self.memory_limit_mb:
+            raise PdfMemoryLimitExceeded(
+                f"PDF renderovanje je preraslo {self.memory_limit_mb} MB "
+                f"(+{rss - self._rss_start:.1f} MB, RSS {rss:.1f} MB, strana {self.page})"
+            )
+
+    def output(self, name="", dest=""):
+        self.error("StreamingPDF piše direktno u output_path - koristi with blok ili finish()")
+
+    def finish(self) -> dict:
+        """Završava dokument i zatvara fajl; vraća statistiku renderovanja"""
+        if self.state < 3:
+            self.close()
+        self._file.close()
+        self._rss_peak = max(self._rss_peak, current_rss_mb())
+        self.stats = {
+            "pages": self.page,
+            "bytes": len(self.buffer),
+            "seconds": round(time.perf_counter() - self._started, 3),
+            "peak_rss_mb": round(self._rss_peak, 1),
+            "rss_growth_mb": round(self._rss_peak - self._rss_start, 1),
+        }
+        _last_stats.clear()
+        _last_stats.update(self.stats)
+        print(
+            f"PDF {self.output_path}: {self.page} strana, {len(self.buffer) / 1024 / 1024:.1f} MB, "
+            f"peak RSS {self._rss_peak:.1f} MB (+{self._rss_peak - self._rss_start:.1f} MB)"
+        )
+        return self.stats
+
+    def abort(self):
+        """Prekid renderovanja: zatvara i briše nedovršen fajl"""
+        self._file.close()
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
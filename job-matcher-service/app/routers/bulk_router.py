@@ -0,0 +1,99 @@
+import asyncio
+from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.crud_operations.bulk import (
+    BULK_MAX_ITEMS,
+    bulk_create,
+    bulk_delete,
+    bulk_update,
+    collect_results,
+    ids_matching_filter,
+    iter_bulk_ndjson,
+    job_ad_delete_filter,
+)
+from app.models import CandidateBulkDelete, CandidateBulkUpdate, CandidateCreate, JobAdBulkDelete, JobAdBulkUpdate, JobAdCreate
+
+# mora da se uključi pre candidates/job_ads router-a, inače PUT /candidates/bulk hvata PUT /candidates/{candidate_id}
+router = APIRouter()
+
+STREAM_DESCRIPTION = "NDJSON stream: stavka po stavka + progress posle svakog chunk-a + summary na kraju"
+
+
+def _check_size(items: list, allow_empty: bool = False):
+    if not items and not allow_empty:
+        raise HTTPException(status_code=400, detail="Prazan zahtev")
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Najviše {BULK_MAX_ITEMS} stavki po zahtevu")
+
+
+async def _bulk_response(events, stream: bool):
+    if stream:
+        return StreamingResponse(iter_bulk_ndjson(events), media_type="application/x-ndjson")
+    return await asyncio.to_thread(collect_results, events)
+
+
+async def _ids_to_delete(namespace: str, ids: list[str] | None, equals: dict, ranges: dict) -> list[str]:
+    has_filter = bool(equals) or any(bound is not None for bounds in ranges.values() for bound in bounds)
+    if ids and has_filter:
+        raise HTTPException(status_code=400, detail="Prosledi ili ids ili filter, ne oba")
+    if not ids and not has_filter:
+        # bez ovoga bi prazan filter obrisao ceo namespace
+        raise HTTPException(status_code=400, detail="Potrebni su ids ili bar jedan filter")
+    if ids:
+        return ids
+    return await asyncio.to_thread(ids_matching_filter, namespace, equals, ranges)
+
+
+@router.post("/candidates/bulk", tags=["Candidates"], summary="Bulk kreiranje kandidata")
+async def bulk_create_candidates(candidates: List[CandidateCreate], stream: bool = Query(False, description=STREAM_DESCRIPTION)):
+    _check_size(candidates)
+    return await _bulk_response(bulk_create("candidates", [candidate.dict() for candidate in candidates]), stream)
+
+
+@router.put("/candidates/bulk", tags=["Candidates"], summary="Bulk izmena kandidata")
+async def bulk_update_candidates(updates: List[CandidateBulkUpdate], stream: bool = Query(False, description=STREAM_DESCRIPTION)):
+    _check_size(updates)
+    return await _bulk_response(bulk_update("candidates", [update.dict(exclude_unset=True) for update in updates]), stream)
+
+
+@router.post("/candidates/bulk/delete", tags=["Candidates"], summary="Bulk brisanje kandidata po id-jevima ili filteru")
+async def bulk_delete_candidates(request: CandidateBulkDelete, stream: bool = Query(False, description=STREAM_DESCRIPTION)):
+    ids = await _ids_to_delete(
+        "candidates",
+        request.ids,
+        equals={field: value for field, value in {
+            "education_level": request.education_level,
+            "city": request.city,
+            "country": request.country,
+        }.items() if value},
+        ranges={"years_experience": (request.min_years_experience, request.max_years_experience)},
+    )
+    # filter koji ne pogađa nijedan dokument daje prazan rezultat, a ne grešku
+    _check_size(ids, allow_empty=True)
+    return await _bulk_response(bulk_delete("candidates", ids), stream)
+
+
+@router.post("/job_ads/bulk", tags=["Job Ads"], summary="Bulk kreiranje job ad-ova")
+async def bulk_create_job_ads(jobs: List[JobAdCreate], stream: bool = Query(False, description=STREAM_DESCRIPTION)):
+    _check_size(jobs)
+    return await _bulk_response(bulk_create("job_ads", [job.dict() for job in jobs]), stream)
+
+
+@router.put("/job_ads/bulk", tags=["Job Ads"], summary="Bulk izmena job ad-ova")
+async def bulk_update_job_ads(updates: List[JobAdBulkUpdate], stream: bool = Query(False, description=STREAM_DESCRIPTION)):
+    _check_size(updates)
+    return await _bulk_response(bulk_update("job_ads", [update.dict(exclude_unset=True) for update in updates]), stream)
+
+
+@router.post("/job_ads/bulk/delete", tags=["Job Ads"], summary="Bulk brisanje job ad-ova po id-jevima ili filteru")
+async def bulk_delete_job_ads(request: JobAdBulkDelete, stream: bool = Query(False, description=STREAM_DESCRIPTION)):
+    ids = await _ids_to_delete(
+        "job_ads",
+        request.ids,
+        equals=job_ad_delete_filter(request.experience_level, request.job_type, request.work_mode, request.city, request.country),
+        ranges={},
+    )
+    # filter koji ne pogađa nijedan dokument daje prazan rezultat, a ne grešku
+    _check_size(ids, allow_empty=True)
+    return await _bulk_response(bulk_delete("job_ads", ids), stream)
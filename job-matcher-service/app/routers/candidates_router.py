@@ -1,19 +1,29 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List
-from app.crud_operations.candidates import create_candidate, get_candidate_by_id, update_candidate, delete_candidate, filter_candidates
+import asyncio
+from app.crud_operations.async_candidates import create_candidate, get_candidate_by_id, update_candidate, delete_candidate, rank_candidates, rerank_candidates, hydrate_candidates
+from app.search.pagination import MAX_PAGE_SIZE, candidate_result_sets, encode_cursor, decode_cursor
+from app.search.result_cache import namespace_versions, normalize_query_text
+from app.matching.match_table import top_matches
+from app.crud_operations.async_similarity import candidate_filters, job_ad_filters, match_stored
+from app.enums.job_ads_enums import ExperienceLevel, JobType, WorkMode
 from app.enums.candidates_enums import EducationLevel, SKILLS_POOL
-from app.models import CandidateCreate, CandidateUpdate
+from app.crud_operations.async_common import MGET_MAX_IDS, fetch_many, normalize_ids
+from app.models import CandidateCreate, CandidateUpdate, MgetRequest
 from fastapi.responses import FileResponse
-from app.generate_reports.pinecone_reports import filter_candidates_for_report, generate_candidates_pdf, filter_candidates_for_job_description, generate_candidates_by_job_pdf
+from app.generate_reports.pinecone_reports import generate_candidates_pdf, generate_candidates_by_job_pdf
+from app.generate_reports.async_reports import filter_candidates_for_report, filter_candidates_for_job_description
+from app.report_jobs import NoReportData
+from app.routers.report_jobs_router import submit_report_job
 import os
 
 router = APIRouter(prefix="/candidates", tags=["Candidates"])
 @router.get("/report", summary="Pinecone candidates PDF report")
-def generate_candidates_report(
+async def generate_candidates_report(
     skills: List[str] = Query(None, description="Skills list"),
     min_years: int = Query(None, description="Minimum years of experience")
 ):
-    candidates = filter_candidates_for_report(
+    candidates = await filter_candidates_for_report(
         skill_query=",".join(skills) if skills else None,
         min_years_experience=min_years
     )
@@ -24,7 +34,7 @@ def generate_candidates_report(
             detail="No candidates found for given filters"
         )
 
-    pdf_path = generate_candidates_pdf(candidates, skills, min_years)
+    pdf_path = await asyncio.to_thread(generate_candidates_pdf, candidates, skills, min_years)
 
     return FileResponse(
         pdf_path,
@@ -32,57 +42,147 @@ def generate_candidates_report(
         filename=os.path.basename(pdf_path)
     )
 
+@router.post("/report/jobs", status_code=202, summary="Pinecone candidates PDF report kao pozadinski job")
+async def submit_candidates_report_job(
+    skills: List[str] = Query(None, description="Skills list"),
+    min_years: int = Query(None, description="Minimum years of experience")
+):
+    async def fetch():
+        candidates = await filter_candidates_for_report(
+            skill_query=",".join(skills) if skills else None,
+            min_years_experience=min_years
+        )
+        if not candidates:
+            raise NoReportData("No candidates found for given filters")
+        return candidates, skills, min_years
+
+    return submit_report_job("candidates_report", fetch, generate_candidates_pdf)
+
 @router.get("/complex-report", summary="Top candidates by job description")
-def generate_report_by_job(
+async def generate_report_by_job(
     job_description: str = Query(..., description="Job description for vector search"),
-    top_k: int = Query(5, description="Number of top candidates to return")
+    top_k: int = Query(5, description="Number of top candidates to return"),
+    rerank: bool = Query(False, description="Strukturni re-ranking: skill-ovi iz opisa, iskustvo, grad i semantički skor"),
+    required_experience_level: ExperienceLevel | None = Query(None, description="Samo uz rerank: očekivani nivo iskustva"),
+    city: str | None = Query(None, description="Samo uz rerank: grad posla")
 ):
     try:
-        candidates = filter_candidates_for_job_description(job_description, top_k)
+        candidates = await filter_candidates_for_job_description(job_description, top_k, rerank, required_experience_level, city)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     if not candidates:
         raise HTTPException(status_code=404, detail="No candidates found for this job description")
 
-    pdf_path = generate_candidates_by_job_pdf(candidates, job_description)
+    pdf_path = await asyncio.to_thread(generate_candidates_by_job_pdf, candidates, job_description)
     return FileResponse(
         pdf_path,
         media_type="application/pdf",
         filename=pdf_path.split("/")[-1]
     )
 
+@router.post("/complex-report/jobs", status_code=202, summary="Top candidates by job description kao pozadinski job")
+async def submit_report_by_job_job(
+    job_description: str = Query(..., description="Job description for vector search"),
+    top_k: int = Query(5, description="Number of top candidates to return"),
+    rerank: bool = Query(False, description="Strukturni re-ranking: skill-ovi iz opisa, iskustvo, grad i semantički skor"),
+    required_experience_level: ExperienceLevel | None = Query(None, description="Samo uz rerank: očekivani nivo iskustva"),
+    city: str | None = Query(None, description="Samo uz rerank: grad posla")
+):
+    if not normalize_query_text(job_description):
+        raise HTTPException(status_code=400, detail="Job description is required for vector search")
+
+    async def fetch():
+        candidates = await filter_candidates_for_job_description(job_description, top_k, rerank, required_experience_level, city)
+        if not candidates:
+            raise NoReportData("No candidates found for this job description")
+        return candidates, job_description
+
+    return submit_report_job("complex_report", fetch, generate_candidates_by_job_pdf)
+
 @router.get("/filter")
-def filter_candidates_endpoint(
+async def filter_candidates_endpoint(
     skill_query: str | None = None,
     education_level: str | None = None,
     min_years_experience: float | None = None,
-    page: int = Query(1, description="Stranica rezultata"),
-    page_size: int = Query(20, description="Broj rezultata po stranici")
+    rerank: bool = Query(False, description="Strukturni re-ranking: skill-ovi, iskustvo, grad i semantički skor"),
+    max_years_experience: float | None = Query(None, description="Samo uz rerank: penal za iskustvo preko ove granice"),
+    city: str | None = Query(None, description="Samo uz rerank: prednost kandidatima iz ovog grada"),
+    page: int = Query(1, ge=1, description="Stranica rezultata"),
+    page_size: int = Query(20, ge=1, le=MAX_PAGE_SIZE, description="Broj rezultata po stranici"),
+    cursor: str | None = Query(None, description="next_cursor iz prethodnog odgovora (zamenjuje ostale parametre)")
 
 ):
-    all_matches = filter_candidates(
-        skill_query=skill_query,
-        education_level=education_level,
-        min_years_experience=min_years_experience,
-        top_k=500 
-    )
+    """
+    Bez skill_query rezultat dolazi iz lokalnog metadata index-a. Upisi iz drugih procesa (drugi worker-i,
+    bulk, ingestion) vidljivi su posle najviše METADATA_INDEX_POLL_SECONDS (default 2 s);
+    upisi mimo dnevnika izmena tek posle celog osvežavanja (METADATA_INDEX_REFRESH_SECONDS, default 1 h).
+    """
+    if cursor:
+        try:
+            cursor_params, start, page_size = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        skill_query = cursor_params.get("skill_query")
+        education_level = cursor_params.get("education_level")
+        min_years_experience = cursor_params.get("min_years_experience")
+        rerank = cursor_params.get("rerank", False)
+        max_years_experience = cursor_params.get("max_years_experience")
+        city = cursor_params.get("city")
+    else:
+        start = (page - 1) * page_size
 
-    start = (page - 1) * page_size
+    params = {
+        "skill_query": normalize_query_text(skill_query),
+        "education_level": education_level,
+        "min_years_experience": min_years_experience
+    }
+    compute = lambda: rank_candidates(**params)
+    if rerank:
+        params.update({"rerank": True, "max_years_experience": max_years_experience, "city": city})
+        compute = lambda: rerank_candidates(**{key: value for key, value in params.items() if key != "rerank"})
+
+    # rangirana lista id-jeva se računa jednom po upitu, svaka stranica je samo isecanje + metadata za nju
+    try:
+        ranked = await candidate_result_sets.aget_or_compute(
+            params, compute, version=namespace_versions.get("candidates")
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     end = start + page_size
-    paged_matches = all_matches[start:end]
 
     return {
-        "count": len(all_matches),
-        "page": page,
+        "count": len(ranked),
+        "page": start // page_size + 1,
         "page_size": page_size,
-        "results": paged_matches
+        "results": await hydrate_candidates(ranked[start:end]),
+        "next_cursor": encode_cursor(params, end, page_size) if end < len(ranked) else None
     }
 
+async def _mget(ids: list[str], include_values: bool) -> dict:
+    ids = normalize_ids(ids)
+    if not ids:
+        raise HTTPException(status_code=400, detail="Potreban je bar jedan id")
+    if len(ids) > MGET_MAX_IDS:
+        raise HTTPException(status_code=413, detail=f"Najviše {MGET_MAX_IDS} id-jeva po zahtevu")
+    results, missing = await fetch_many("candidates", ids, include_values)
+    return {"count": len(results), "results": results, "missing": missing}
+
+@router.get("", summary="Više kandidata po id-jevima, u redosledu zahteva")
+async def get_candidates_endpoint(
+    ids: List[str] = Query(..., description="Id-jevi (ponovljen parametar ili razdvojeni zarezom)"),
+    include_values: bool = Query(False, description="Uključi i embedding vektore")
+):
+    return await _mget(ids, include_values)
+
+@router.post("/mget", summary="Više kandidata po id-jevima (duge liste id-jeva u telu zahteva)")
+async def mget_candidates_endpoint(request: MgetRequest):
+    return await _mget(request.ids, request.include_values)
+
 @router.post("/")
-def create_candidate_endpoint(candidate: CandidateCreate):
+async def create_candidate_endpoint(candidate: CandidateCreate):
     try:
-        candidate_id = create_candidate(
+        candidate_id = await create_candidate(
             firstname=candidate.firstname,
             lastname=candidate.lastname,
             skills=candidate.skills,
@@ -96,25 +196,63 @@ def create_candidate_endpoint(candidate: CandidateCreate):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{candidate_id}")
-def get_candidate_endpoint(candidate_id: str):
-    candidate = get_candidate_by_id(candidate_id)
+async def get_candidate_endpoint(candidate_id: str):
+    candidate = await get_candidate_by_id(candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     return candidate
 
+@router.get("/{candidate_id}/matches", summary="Top job ad-ovi za kandidata iz batch match tabele")
+async def get_candidate_matches_endpoint(candidate_id: str, limit: int = Query(20, ge=1, le=100)):
+    matches = await asyncio.to_thread(top_matches, "candidates", candidate_id, limit)
+    if matches is None:
+        raise HTTPException(status_code=503, detail="Match table not built yet (python -m app.matching.batch_match)")
+    if not matches:
+        raise HTTPException(status_code=404, detail="No matches for this candidate")
+    return {"candidate_id": candidate_id, "matches": matches}
+
+@router.get("/{candidate_id}/jobs", summary="Najbliži job ad-ovi za kandidata preko sačuvanog vektora (bez OpenAI poziva)")
+async def get_candidate_jobs_endpoint(
+    candidate_id: str,
+    top_k: int = Query(10, ge=1, le=100),
+    required_experience_level: ExperienceLevel | None = None,
+    job_type: JobType | None = None,
+    work_mode: WorkMode | None = None,
+    city: str | None = None,
+):
+    equals, ranges = job_ad_filters(required_experience_level, job_type, work_mode, city)
+    results = await match_stored("candidates", candidate_id, "job_ads", top_k, equals, ranges)
+    if results is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return {"candidate_id": candidate_id, "jobs": results}
+
+@router.get("/{candidate_id}/similar", summary="Slični kandidati preko sačuvanog vektora (bez OpenAI poziva)")
+async def get_similar_candidates_endpoint(
+    candidate_id: str,
+    top_k: int = Query(10, ge=1, le=100),
+    education_level: EducationLevel | None = None,
+    min_years_experience: float | None = Query(None, ge=0),
+    city: str | None = None,
+):
+    equals, ranges = candidate_filters(education_level, min_years_experience, city)
+    results = await match_stored("candidates", candidate_id, "candidates", top_k, equals, ranges)
+    if results is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return {"candidate_id": candidate_id, "similar": results}
+
 @router.put("/{candidate_id}")
-def update_candidate_endpoint(candidate_id: str, candidate_update: CandidateUpdate):
+async def update_candidate_endpoint(candidate_id: str, candidate_update: CandidateUpdate):
     updates = candidate_update.dict(exclude_unset=True)  # uzima samo polja koja su prosleđena
     if not updates:
         raise HTTPException(status_code=400, detail="No fields to update provided")
 
-    success = update_candidate(candidate_id, **updates)
+    success = await update_candidate(candidate_id, **updates)
     if not success:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
     return {"status": "updated"}
 
 @router.delete("/{candidate_id}")
-def delete_candidate_endpoint(candidate_id: str):
-    delete_candidate(candidate_id)
+async def delete_candidate_endpoint(candidate_id: str):
+    await delete_candidate(candidate_id)
     return {"status": "deleted"}
\ No newline at end of file
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.export.namespace_export import NAMESPACES, iter_ndjson
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+@router.get("/{namespace}", summary="Stream celog namespace-a kao NDJSON")
+def export_namespace(
+    namespace: str,
+    include_values: bool = Query(False, description="Uključi i embedding vektore"),
+    batch_size: int = Query(100, ge=1, le=1000, description="Broj id-jeva po fetch pozivu")
+):
+    if namespace not in NAMESPACES:
+        raise HTTPException(status_code=404, detail=f"Namespace mora biti jedan od {list(NAMESPACES)}")
+
+    return StreamingResponse(
+        iter_ndjson(namespace, include_values=include_values, batch_size=batch_size),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{namespace}.ndjson"'}
+    )
@@ -1,46 +1,107 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
-from app.crud_operations.job_ads import create_job_ad, get_job_ad_by_id, update_job_ad, delete_job_ad, filter_job_ads
+import asyncio
+from app.crud_operations.async_job_ads import create_job_ad, get_job_ad_by_id, update_job_ad, delete_job_ad, filter_job_ads
 from app.enums.job_ads_enums import JobType, ExperienceLevel, WorkMode
-from app.models import JobAdCreate, JobAdUpdate, JobAdsResponse
-from app.generate_reports.pinecone_reports import filter_job_ads_for_report, generate_job_ads_pdf
+from app.crud_operations.async_common import MGET_MAX_IDS, fetch_many, normalize_ids
+from app.models import JobAdCreate, JobAdUpdate, JobAdsResponse, MgetRequest
+from app.generate_reports.pinecone_reports import generate_job_ads_pdf, count_job_ads_for_report, render_all_job_ads_report
+from app.generate_reports.async_reports import filter_job_ads_for_report
+from app.report_jobs import NoReportData
+from app.routers.report_jobs_router import submit_report_job
 from fastapi.responses import FileResponse
+from app.matching.match_table import top_matches
+from app.crud_operations.async_similarity import candidate_filters, job_ad_filters, match_stored
+from app.enums.candidates_enums import EducationLevel
 
 router = APIRouter(prefix="/job_ads", tags=["Job Ads"])
 
 @router.get("/report", summary="Pinecone JobAds PDF report")
-def generate_job_ads_report(
+async def generate_job_ads_report(
     job_type: List[str] = Query(None, description="Filter by job type"),
     city: Optional[str] = Query(None, description="Filter by city")
 ):
     cities = [city] if city else None
-    job_ads = filter_job_ads_for_report(job_types=job_type, cities=cities, top_k=10)
+    job_ads = await filter_job_ads_for_report(job_types=job_type, cities=cities, top_k=10)
 
     if not job_ads:
         raise HTTPException(status_code=404, detail="No job ads found for given filters")
 
-    pdf_path = generate_job_ads_pdf(job_ads, job_type=job_type, city=city)
+    pdf_path = await asyncio.to_thread(generate_job_ads_pdf, job_ads, job_type=job_type, city=city)
     return FileResponse(pdf_path, media_type="application/pdf", filename=pdf_path.split("/")[-1])
 
 
+@router.post("/report/jobs", status_code=202, summary="Pinecone JobAds PDF report kao pozadinski job")
+async def submit_job_ads_report_job(
+    job_type: List[str] = Query(None, description="Filter by job type"),
+    city: Optional[str] = Query(None, description="Filter by city")
+):
+    async def fetch():
+        job_ads = await filter_job_ads_for_report(job_types=job_type, cities=[city] if city else None, top_k=10)
+        if not job_ads:
+            raise NoReportData("No job ads found for given filters")
+        return job_ads, job_type, city
+
+    return submit_report_job("job_ads_report", fetch, generate_job_ads_pdf)
+
+
+@router.post("/report/all/jobs", status_code=202, summary="Pinecone JobAds PDF report za sve oglase po filterima (bez top_k), kao pozadinski job")
+async def submit_all_job_ads_report_job(
+    job_type: List[str] = Query(None, description="Filter by job type"),
+    city: Optional[str] = Query(None, description="Filter by city")
+):
+    # ceo namespace se čita kao stream u worker procesu; PDF stranice idu na disk čim se završe
+    def fetch():
+        total = count_job_ads_for_report(job_type, [city] if city else None)
+        if not total:
+            raise NoReportData("No job ads found for given filters")
+        return job_type, city, total
+
+    return submit_report_job("all_job_ads_report", fetch, render_all_job_ads_report)
+
 @router.get("/filter", response_model=JobAdsResponse)
-def filter_job_ads_endpoint(
+async def filter_job_ads_endpoint(
     title_query: str | None = None,
     required_experience_level: ExperienceLevel | None = None,
     job_type: JobType | None = None,
     work_mode: WorkMode | None = None
 ):
-    return filter_job_ads(
+    """
+    Bez title_query rezultat dolazi iz lokalnog metadata index-a. Upisi iz drugih procesa (drugi worker-i,
+    saga u job-filter-service, ingestion) vidljivi su posle najviše METADATA_INDEX_POLL_SECONDS (default 2 s);
+    upisi mimo dnevnika izmena tek posle celog osvežavanja (METADATA_INDEX_REFRESH_SECONDS, default 1 h).
+    """
+    return await filter_job_ads(
         title_query=title_query,
         required_experience_level=required_experience_level,
         job_type=job_type,
         work_mode=work_mode
     )
 
+async def _mget(ids: list[str], include_values: bool) -> dict:
+    ids = normalize_ids(ids)
+    if not ids:
+        raise HTTPException(status_code=400, detail="Potreban je bar jedan id")
+    if len(ids) > MGET_MAX_IDS:
+        raise HTTPException(status_code=413, detail=f"Najviše {MGET_MAX_IDS} id-jeva po zahtevu")
+    results, missing = await fetch_many("job_ads", ids, include_values)
+    return {"count": len(results), "results": results, "missing": missing}
+
+@router.get("", summary="Više job ad-ova po id-jevima, u redosledu zahteva")
+async def get_job_ads_endpoint(
+    ids: List[str] = Query(..., description="Id-jevi (ponovljen parametar ili razdvojeni zarezom)"),
+    include_values: bool = Query(False, description="Uključi i embedding vektore")
+):
+    return await _mget(ids, include_values)
+
+@router.post("/mget", summary="Više job ad-ova po id-jevima (duge liste id-jeva u telu zahteva)")
+async def mget_job_ads_endpoint(request: MgetRequest):
+    return await _mget(request.ids, request.include_values)
+
 @router.post("/")
-def create_job_ad_endpoint(job: JobAdCreate):
+async def create_job_ad_endpoint(job: JobAdCreate):
     try:
-        job_id = create_job_ad(
+        job_id = await create_job_ad(
             title=job.title,
             description=job.description,
             experience_level=job.experience_level,
@@ -54,22 +115,60 @@ def create_job_ad_endpoint(job: JobAdCreate):
         raise HTTPException(status_code=400, detail=str(e))
     
 @router.get("/{job_id}")
-def get_job_ad_endpoint(job_id: str):
-    job = get_job_ad_by_id(job_id)
+async def get_job_ad_endpoint(job_id: str):
+    job = await get_job_ad_by_id(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job ad not found")
     return job
 
+@router.get("/{job_id}/matches", summary="Top kandidati za job ad iz batch match tabele")
+async def get_job_ad_matches_endpoint(job_id: str, limit: int = Query(20, ge=1, le=100)):
+    matches = await asyncio.to_thread(top_matches, "job_ads", job_id, limit)
+    if matches is None:
+        raise HTTPException(status_code=503, detail="Match table not built yet (python -m app.matching.batch_match)")
+    if not matches:
+        raise HTTPException(status_code=404, detail="No matches for this job ad")
+    return {"job_id": job_id, "matches": matches}
+
+@router.get("/{job_id}/candidates", summary="Najbliži kandidati za job ad preko sačuvanog vektora (bez OpenAI poziva)")
+async def get_job_ad_candidates_endpoint(
+    job_id: str,
+    top_k: int = Query(10, ge=1, le=100),
+    education_level: EducationLevel | None = None,
+    min_years_experience: float | None = Query(None, ge=0),
+    city: str | None = None,
+):
+    equals, ranges = candidate_filters(education_level, min_years_experience, city)
+    results = await match_stored("job_ads", job_id, "candidates", top_k, equals, ranges)
+    if results is None:
+        raise HTTPException(status_code=404, detail="Job ad not found")
+    return {"job_id": job_id, "candidates": results}
+
+@router.get("/{job_id}/similar", summary="Slični job ad-ovi preko sačuvanog vektora (bez OpenAI poziva)")
+async def get_similar_job_ads_endpoint(
+    job_id: str,
+    top_k: int = Query(10, ge=1, le=100),
+    required_experience_level: ExperienceLevel | None = None,
+    job_type: JobType | None = None,
+    work_mode: WorkMode | None = None,
+    city: str | None = None,
+):
+    equals, ranges = job_ad_filters(required_experience_level, job_type, work_mode, city)
+    results = await match_stored("job_ads", job_id, "job_ads", top_k, equals, ranges)
+    if results is None:
+        raise HTTPException(status_code=404, detail="Job ad not found")
+    return {"job_id": job_id, "similar": results}
+
 @router.put("/{job_id}")
-def update_job_ad_endpoint(job_id: str, job_update: JobAdUpdate):
+async def update_job_ad_endpoint(job_id: str, job_update: JobAdUpdate):
     updates = {k: v for k, v in job_update.dict().items() if v is not None}
     
-    success = update_job_ad(job_id, **updates)
+    success = await update_job_ad(job_id, **updates)
     if not success:
         raise HTTPException(status_code=404, detail="Job ad not found")
     return {"status": "updated"}
 
 @router.delete("/{job_id}")
-def delete_job_ad_endpoint(job_id: str):
-    delete_job_ad(job_id)
+async def delete_job_ad_endpoint(job_id: str):
+    await delete_job_ad(job_id)
     return {"status": "deleted"}
\ No newline at end of file
@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+
+from app.change_log import change_log, origin
+from app.database import index
+from app.export.namespace_export import iter_namespace
+from app.search.metadata_index import MetadataIndex
+from app.search.result_cache import namespace_versions
+
+candidates_metadata_index = MetadataIndex(
+    "candidates",
+    keyword_fields=("education_level", "city", "country"),
+    list_fields=("skills",),
+    range_fields=("years_experience",),
+)
+
+job_ads_metadata_index = MetadataIndex(
+    "job_ads",
+    keyword_fields=("required_experience_level", "job_type", "work_mode", "city", "country"),
+)
+
+METADATA_INDEXES = {
+    "candidates": candidates_metadata_index,
+    "job_ads": job_ads_metadata_index,
+}
+
+METADATA_INDEX_ENABLED = os.getenv("METADATA_INDEX_ENABLED", "true").lower() == "true"
+# upisi iz drugih worker-a, job-filter-service (saga) i ingestion-a stižu iz dnevnika izmena (app.change_log):
+# svakih POLL sekundi se iz Pinecone-a čitaju samo izmenjeni id-jevi. Ceo namespace se ponovo čita na startu,
+# svakih REFRESH sekundi (zaštita za upise mimo dnevnika) i kad izmena ima više od MAX_INCREMENTAL.
+METADATA_INDEX_POLL_SECONDS = float(os.getenv("METADATA_INDEX_POLL_SECONDS", 2))
+METADATA_INDEX_REFRESH_SECONDS = float(os.getenv("METADATA_INDEX_REFRESH_SECONDS", 3600))
+METADATA_INDEX_MAX_INCREMENTAL = int(os.getenv("METADATA_INDEX_MAX_INCREMENTAL", 5000))
+METADATA_FETCH_BATCH_SIZE = 100
+
+# poslednji seq iz dnevnika izmena primenjen na index (po namespace-u)
+_applied_seq = {}
+
+
+def iter_namespace_metadata(namespace: str):
+    for record in iter_namespace(namespace):
+        yield record["id"], record["metadata"]
+
+
+def refresh_metadata_index(namespace: str):
+    metadata_index = METADATA_INDEXES[namespace]
+    started = time.perf_counter()
+    # izmene posle ovog seq-a se posle rebuild-a primenjuju inkrementalno (ponavljanje je bezopasno)
+    seq = change_log.version(namespace)
+    try:
+        metadata_index.rebuild(iter_namespace_metadata(namespace))
+        # refresh vidi i upise drugih worker-a, pa keširani rezultati ovog procesa zastarevaju
+        namespace_versions.bump(namespace)
+    except Exception as e:
+        # do uspešnog učitavanja upiti idu na Pinecone kao i ranije
+        print(f"Metadata index '{namespace}' nije osvežen: {e}")
+        return
+    if seq is not None:
+        _applied_seq[namespace] = seq
+    print(f"Metadata index '{namespace}': {metadata_index.stats()['documents']} dokumenata za {time.perf_counter() - started:.1f}s")
+
+
+def refresh_metadata_indexes():
+    for namespace in METADATA_INDEXES:
+        refresh_metadata_index(namespace)
+
+
+def apply_metadata_changes(namespace: str):
+    """Primenjuje izmene iz dnevnika posle poslednjeg primenjenog seq-a; bez nastavka (ili previše izmena) - ceo refresh"""
+    metadata_index = METADATA_INDEXES[namespace]
+    if not metadata_index.ready:
+        return
+    applied = _applied_seq.get(namespace)
+    changes = change_log.since(namespace, applied, METADATA_INDEX_MAX_INCREMENTAL + 1) if applied is not None else None
+    if changes is None or len(changes) > METADATA_INDEX_MAX_INCREMENTAL:
+        refresh_metadata_index(namespace)
+        return
+    if not changes:
+        return
+
+    # poslednja izmena po id-ju; svoje upise ovaj proces je već primenio
+    own = origin()
+    latest = {doc_id: op for _, doc_id, op, writer in changes if writer != own}
+    upserts = [doc_id for doc_id, op in latest.items() if op == "upsert"]
+    for start in range(0, len(upserts), METADATA_FETCH_BATCH_SIZE):
+        ids = upserts[start:start + METADATA_FETCH_BATCH_SIZE]
+        vectors = index.fetch(ids=ids, namespace=namespace).vectors or {}
+        for doc_id in ids:
+            vector = vectors.get(doc_id)
+            if vector is None:
+                metadata_index.delete(doc_id)  # obrisan posle upisa u dnevnik
+            else:
+                metadata_index.upsert(doc_id, dict(vector.metadata or {}))
+    for doc_id, op in latest.items():
+        if op == "delete":
+            metadata_index.delete(doc_id)
+
+    _applied_seq[namespace] = changes[-1][0]
+    if latest:
+        namespace_versions.bump(namespace)
+
+
+def _sync_loop():
+    refreshed_at = None
+    while True:
+        if refreshed_at is None or (METADATA_INDEX_REFRESH_SECONDS > 0 and time.monotonic() - refreshed_at >= METADATA_INDEX_REFRESH_SECONDS):
+            refresh_metadata_indexes()
+            refreshed_at = time.monotonic()
+        elif METADATA_INDEX_POLL_SECONDS > 0:
+            for namespace in METADATA_INDEXES:
+                try:
+                    apply_metadata_changes(namespace)
+                except Exception as e:
+                    # sledeći krug pokušava ponovo od istog seq-a
+                    print(f"Izmene za metadata index '{namespace}' nisu primenjene: {e}")
+        if METADATA_INDEX_POLL_SECONDS <= 0 and METADATA_INDEX_REFRESH_SECONDS <= 0:
+            return
+        time.sleep(METADATA_INDEX_POLL_SECONDS if METADATA_INDEX_POLL_SECONDS > 0 else METADATA_INDEX_REFRESH_SECONDS)
+
+
+def start_metadata_index_sync():
+    """Učitava index-e u pozadini da ne bi blokirao startup worker-a"""
+    if METADATA_INDEX_ENABLED:
+        threading.Thread(target=_sync_loop, name="metadata-index-sync", daemon=True).start()
+
+
+def metadata_index_stats() -> list[dict]:
+    return [
+        {**metadata_index.stats(), "change_seq": _applied_seq.get(namespace), "poll_seconds": METADATA_INDEX_POLL_SECONDS}
+        for namespace, metadata_index in METADATA_INDEXES.items()
+    ]
+
+
+def metadata_index_for(namespace: str) -> MetadataIndex | None:
+    """Vraća index samo ako je uključen i učitan - inače pozivalac ide na Pinecone"""
+    metadata_index = METADATA_INDEXES[namespace]
+    if METADATA_INDEX_ENABLED and metadata_index.ready:
+        return metadata_index
+    return None
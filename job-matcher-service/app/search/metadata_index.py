@@ -0,0 +1,201 @@
+import bisect
+import threading
+import time
+
+
+class _State:
+    def __init__(self):
+        self.docs = {}
+        self.order = {}
+        self.next_seq = 0
+        self.postings = {}
+        self.ranges = {}
+
+
+class MetadataIndex:
+    """
+    In-process sekundarni index nad metadata jednog namespace-a.
+    - keyword/list polja: inverted postings vrednost -> set(id)
+    - range polja: sortirana lista (vrednost, id) za bisect
+    Filter-only upiti se odgovaraju odavde (potpun rezultat i tačan count), a Pinecone ostaje za semantičke upite.
+    """
+
+    def __init__(self, namespace: str, keyword_fields=(), list_fields=(), range_fields=()):
+        self.namespace = namespace
+        self.keyword_fields = tuple(keyword_fields)
+        self.list_fields = tuple(list_fields)
+        self.range_fields = tuple(range_fields)
+        self.ready = False
+        self.loaded_at = None
+        self._state = self._empty_state()
+        self._lock = threading.RLock()
+        self._journal = None
+
+    def _empty_state(self) -> _State:
+        state = _State()
+        state.postings = {field: {} for field in self.keyword_fields + self.list_fields}
+        state.ranges = {field: [] for field in self.range_fields}
+        return state
+
+    # ---------------- održavanje ----------------
+
+    def _index(self, state: _State, doc_id: str, metadata: dict):
+        for field in self.keyword_fields:
+            value = metadata.get(field)
+            if value is not None:
+                state.postings[field].setdefault(value, set()).add(doc_id)
+        for field in self.list_fields:
+            for value in metadata.get(field) or []:
+                state.postings[field].setdefault(value, set()).add(doc_id)
+        for field in self.range_fields:
+            value = metadata.get(field)
+            if value is not None:
+                bisect.insort(state.ranges[field], (value, doc_id))
+
+    def _unindex(self, state: _State, doc_id: str, metadata: dict):
+        for field in self.keyword_fields:
+            self._discard_posting(state, field, metadata.get(field), doc_id)
+        for field in self.list_fields:
+            for value in metadata.get(field) or []:
+                self._discard_posting(state, field, value, doc_id)
+        for field in self.range_fields:
+            value = metadata.get(field)
+            if value is not None:
+                entries = state.ranges[field]
+                position = bisect.bisect_left(entries, (value, doc_id))
+                if position < len(entries) and entries[position] == (value, doc_id):
+                    del entries[position]
+
+    def _add(self, state: _State, doc_id: str, metadata: dict):
+        previous = state.docs.get(doc_id)
+        if previous is not None:
+            self._unindex(state, doc_id, previous)
+        else:
+            state.order[doc_id] = state.next_seq
+            state.next_seq += 1
+        # dodela postojećem ključu čuva poziciju u dict-u, pa update ne menja redosled rezultata
+        state.docs[doc_id] = metadata
+        self._index(state, doc_id, metadata)
+
+    def _remove(self, state: _State, doc_id: str):
+        metadata = state.docs.pop(doc_id, None)
+        if metadata is not None:
+            self._unindex(state, doc_id, metadata)
+            state.order.pop(doc_id, None)
+
+    @staticmethod
+    def _discard_posting(state: _State, field: str, value, doc_id: str):
+        if value is None:
+            return
+        ids = state.postings[field].get(value)
+        if ids is not None:
+            ids.discard(doc_id)
+            if not ids:
+                del state.postings[field][value]
+
+    def _apply(self, state: _State, op: str, doc_id: str, metadata: dict | None):
+        if op == "upsert":
+            self._add(state, doc_id, metadata)
+        elif op == "delete":
+            self._remove(state, doc_id)
+
+    def _write(self, op: str, doc_id: str, metadata: dict | None = None):
+        with self._lock:
+            self._apply(self._state, op, doc_id, metadata)
+            # upisi tokom rebuild-a se ponavljaju nad novim stanjem pre zamene
+            if self._journal is not None:
+                self._journal.append((op, doc_id, metadata))
+
+    def upsert(self, doc_id: str, metadata: dict):
+        self._write("upsert", doc_id, dict(metadata))
+
+    def update(self, doc_id: str, changes: dict):
+        with self._lock:
+            current = self._state.docs.get(doc_id)
+            if current is None:
+                return
+            self._write("upsert", doc_id, {**current, **changes})
+
+    def delete(self, doc_id: str):
+        self._write("delete", doc_id)
+
+    def rebuild(self, entries):
+        """Gradi novo stanje iz (id, metadata) parova (npr. ceo namespace iz Pinecone-a) i atomično ga menja"""
+        with self._lock:
+            self._journal = []
+
+        try:
+            state = self._empty_state()
+            for doc_id, metadata in entries:
+                self._add(state, doc_id, dict(metadata))
+        except BaseException:
+            with self._lock:
+                self._journal = None
+            raise
+
+        with self._lock:
+            for op, doc_id, metadata in self._journal:
+                self._apply(state, op, doc_id, metadata)
+            self._journal = None
+            self._state = state
+            self.ready = True
+            self.loaded_at = time.time()
+
+    # ---------------- upiti ----------------
+
+    def _ids_for(self, state: _State, field: str, value) -> set:
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        postings = state.postings[field]
+        if len(values) == 1:
+            return postings.get(values[0], set())
+        result = set()
+        for item in values:
+            result |= postings.get(item, set())
+        return result
+
+    def _ids_in_range(self, state: _State, field: str, minimum=None, maximum=None) -> set:
+        entries = state.ranges[field]
+        start = 0 if minimum is None else bisect.bisect_left(entries, minimum, key=lambda entry: entry[0])
+        end = len(entries) if maximum is None else bisect.bisect_right(entries, maximum, key=lambda entry: entry[0])
+        return {doc_id for _, doc_id in entries[start:end]}
+
+    def query(self, equals: dict | None = None, ranges: dict | None = None) -> list[tuple[str, dict]]:
+        """
+        equals: {polje: vrednost ili lista vrednosti (bilo koja)}; za list polja (skills) znači "sadrži".
+        ranges: {polje: (min, max)} uključivo, None = bez granice.
+        Vraća sve pogotke kao (id, metadata) redom upisa.
+        """
+        equals = {field: value for field, value in (equals or {}).items() if value not in (None, [], ())}
+        ranges = {field: bounds for field, bounds in (ranges or {}).items() if bounds != (None, None)}
+
+        with self._lock:
+            state = self._state
+            candidate_sets = [self._ids_for(state, field, value) for field, value in equals.items()]
+            candidate_sets += [self._ids_in_range(state, field, *bounds) for field, bounds in ranges.items()]
+
+            if candidate_sets:
+                candidate_sets.sort(key=len)
+                ids = set(candidate_sets[0])
+                for other in candidate_sets[1:]:
+                    ids &= other
+                    if not ids:
+                        break
+                ordered = sorted(ids, key=state.order.__getitem__)
+            else:
+                ordered = list(state.docs)
+
+            return [(doc_id, dict(state.docs[doc_id])) for doc_id in ordered]
+
+    def get(self, doc_id: str) -> dict | None:
+        with self._lock:
+            metadata = self._state.docs.get(doc_id)
+            return dict(metadata) if metadata is not None else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "namespace": self.namespace,
+                "ready": self.ready,
+                "documents": len(self._state.docs),
+                "loaded_at": self.loaded_at,
+            }
@@ -0,0 +1,85 @@
+import base64
+import binascii
+import hashlib
+import json
+import os
+
+from app.caching import TTLCache, SingleFlight, AsyncSingleFlight, approx_size
+
+# najveća stranica za /candidates/filter - važi i za page_size iz cursor-a
+MAX_PAGE_SIZE = int(os.getenv("FILTER_MAX_PAGE_SIZE", 500))
+
+
+def query_key(params: dict) -> str:
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def encode_cursor(params: dict, offset: int, page_size: int) -> str:
+    """Cursor nosi parametre upita, pa i posle isteka keša sledeća stranica može ponovo da se izračuna"""
+    payload = json.dumps({"q": params, "o": offset, "s": page_size}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[dict, int, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        params, offset, page_size = payload["q"], int(payload["o"]), int(payload["s"])
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        raise ValueError("Neispravan cursor")
+    if offset < 0 or not 0 < page_size <= MAX_PAGE_SIZE:
+        raise ValueError("Neispravan cursor")
+    return params, offset, page_size
+
+
+class ResultSetCache:
+    """
+    Keš rangiranih rezultata (lista (id, score)) po upitu.
+    Dublje stranice se seku iz keširane liste umesto ponovnog embedding-a i Pinecone query-ja;
+    LRU + TTL i granica ukupne veličine (max_bytes) drže memoriju ograničenom - broj unosa sam nije dovoljan,
+    jer jedan rangirani rezultat može imati i hiljade id-jeva. Istovremeni isti upiti računaju se samo jednom.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300, max_bytes: int | None = 64 * 1024 * 1024):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds, weigher=approx_size, max_bytes=max_bytes)
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+
+    def get_or_compute(self, params: dict, compute, version: int = 0) -> tuple:
+        """version je verzija namespace-a - posle upisa rangiranje se računa ponovo"""
+        key = (version, query_key(params))
+        ranked = self._cache.get(key)
+        if ranked is not None:
+            return ranked
+
+        def load():
+            result = tuple(compute())
+            self._cache.set(key, result)
+            return result
+
+        ranked, _ = self._flight.do(key, load)
+        return ranked
+
+    async def aget_or_compute(self, params: dict, acompute, version: int = 0) -> tuple:
+        key = (version, query_key(params))
+        ranked = self._cache.get(key)
+        if ranked is not None:
+            return ranked
+
+        async def load():
+            result = tuple(await acompute())
+            self._cache.set(key, result)
+            return result
+
+        ranked, _ = await self._async_flight.do(key, load)
+        return ranked
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+candidate_result_sets = ResultSetCache(
+    max_entries=int(os.getenv("RESULT_SET_CACHE_ENTRIES", 256)),
+    ttl_seconds=float(os.getenv("RESULT_SET_CACHE_TTL_SECONDS", 300)),
+    max_bytes=int(os.getenv("RESULT_SET_CACHE_MAX_MB", 64)) * 1024 * 1024,
+)
@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+
+from app.caching import TTLCache, SingleFlight, AsyncSingleFlight, approx_size
+from app.change_log import change_log, record_changes
+from app.search.pagination import query_key
+
+# koliko dugo se pamti seq iz zajedničkog dnevnika izmena - gornja granica zastarelosti keša za tuđe upise
+NAMESPACE_VERSION_POLL_SECONDS = float(os.getenv("NAMESPACE_VERSION_POLL_SECONDS", 1))
+
+
+class NamespaceVersions:
+    """
+    Brojač verzija po namespace-u. Svaki upis (create/update/delete) podiže verziju,
+    a verzija je deo ključa keša - stari rezultati posle upisa više nisu dostupni i ističu kroz LRU/TTL.
+    Verzija je zbir lokalnog brojača (upisi i osvežavanja index-a u ovom procesu) i poslednjeg seq-a namespace-a
+    iz zajedničkog dnevnika izmena (upisi drugih worker-a i job-filter-service), koji se čita najviše
+    jednom u NAMESPACE_VERSION_POLL_SECONDS. Oba rastu, pa svaka izmena daje novu verziju.
+    """
+
+    def __init__(self, poll_seconds: float = NAMESPACE_VERSION_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._versions = {}
+        self._shared = {}  # namespace -> (seq, vreme čitanja)
+        self._lock = threading.Lock()
+
+    def _shared_version(self, namespace: str) -> int:
+        now = time.monotonic()
+        with self._lock:
+            seq, checked_at = self._shared.get(namespace, (0, None))
+            if checked_at is not None and now - checked_at < self.poll_seconds:
+                return seq
+            # ostali čitaoci do kraja čitanja koriste prethodni seq
+            self._shared[namespace] = (seq, now)
+        latest = change_log.version(namespace)
+        if latest is None:
+            return seq  # dnevnik nedostupan - ostaju lokalna verzija i TTL
+        with self._lock:
+            seq = max(latest, self._shared[namespace][0])
+            self._shared[namespace] = (seq, now)
+        return seq
+
+    def get(self, namespace: str) -> int:
+        shared = self._shared_version(namespace)
+        with self._lock:
+            return self._versions.get(namespace, 0) + shared
+
+    def bump(self, namespace: str, doc_ids=None, op: str = "upsert") -> int:
+        """Upis iz ovog procesa; sa doc_ids ide i u zajednički dnevnik izmena, da bi ga videli i ostali procesi"""
+        if doc_ids:
+            record_changes(namespace, doc_ids, op)
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            return self._versions[namespace]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {namespace: self._versions.get(namespace, 0) + self._shared.get(namespace, (0, None))[0]
+                    for namespace in set(self._versions) | set(self._shared)}
+
+
+namespace_versions = NamespaceVersions()
+
+
+def normalize_query_text(text: str | None) -> str | None:
+    if text is None:
+        return None
+    text = " ".join(text.split())
+    return text or None
+
+
+def normalize_filters(filters: dict) -> dict:
+    """Izbacuje prazne filtere, enum-e pretvara u vrednosti, a liste sortira (redosled ne menja rezultat)"""
+    normalized = {}
+    for field, value in filters.items():
+        if value is None or value == [] or value == ():
+            continue
+        if hasattr(value, "value"):
+            value = value.value
+        if isinstance(value, (list, tuple, set)):
+            value = sorted(getattr(item, "value", item) for item in value)
+        normalized[field] = value
+    return normalized
+
+
+class SearchResultCache:
+    """
+    Keš rezultata pretrage: ključ = vrsta upita + normalizovani filteri + tekst upita + verzija namespace-a.
+    Istovremeni isti promašaji idu jednom do OpenAI/Pinecone-a (single-flight).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300, versions: NamespaceVersions = namespace_versions):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds, weigher=approx_size)
+        self._flight = SingleFlight()
+        self._async_flight = AsyncSingleFlight()
+        self._versions = versions
+        self.coalesced = 0
+
+    def get_or_compute(self, namespace: str, kind: str, params: dict, compute):
+        # verzija se čita pre računanja: upis u toku računanja podiže verziju, pa se taj rezultat više ne vidi
+        key = (kind, self._versions.get(namespace), query_key(params))
+        result = self._cache.get(key)
+        if result is not None:
+            return result
+
+        def load():
+            value = compute()
+            self._cache.set(key, value)
+            return value
+
+        result, shared = self._flight.do(key, load)
+        if shared:
+            self.coalesced += 1
+        return result
+
+    async def aget_or_compute(self, namespace: str, kind: str, params: dict, acompute):
+        """Isto kao get_or_compute, za async upite (acompute je korutina)"""
+        key = (kind, self._versions.get(namespace), query_key(params))
+        result = self._cache.get(key)
+        if result is not None:
+            return result
+
+        async def load():
+            value = await acompute()
+            self._cache.set(key, value)
+            return value
+
+        result, shared = await self._async_flight.do(key, load)
+        if shared:
+            self.coalesced += 1
+        return result
+
+    def stats(self) -> dict:
+        return {
+            **self._cache.stats(),
+            "coalesced": self.coalesced,
+            "namespace_versions": self._versions.snapshot(),
+        }
+
+
+search_results = SearchResultCache(
+    max_entries=int(os.getenv("SEARCH_CACHE_ENTRIES", 1024)),
+    # TTL je samo rezervna granica kad dnevnik izmena nije dostupan; inače tuđe upise vidimo posle POLL sekundi
+    ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", 60)),
+)
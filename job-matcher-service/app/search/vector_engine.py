@@ -0,0 +1,566 @@
+import argparse
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from array import array
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows - bez međuprocesnih lock-ova
+    fcntl = None
+
+from app.embeddings.embedding_client import EMBEDDING_MODEL
+from app.search.result_cache import namespace_versions
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_REPLICA_DIR = os.path.join(BASE_DIR, "cache", "vector_replica")
+
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "pinecone").lower()
+VECTOR_REPLICA_DIR = os.getenv("VECTOR_REPLICA_DIR", DEFAULT_REPLICA_DIR)
+VECTOR_REPLICA_RELOAD_SECONDS = float(os.getenv("VECTOR_REPLICA_RELOAD_SECONDS", 30))
+# delta vidi samo upise ovog procesa - upisi drugih worker-a i job-filter-service (saga nad job_ads) stižu tek
+# sa novim build-om, pa se replika ponovo pravi kad je starija od MAX_AGE ili kad delta naraste preko MAX_DELTA
+VECTOR_REPLICA_AUTO_REBUILD = os.getenv("VECTOR_REPLICA_AUTO_REBUILD", "true").lower() == "true"
+VECTOR_REPLICA_MAX_AGE_SECONDS = float(os.getenv("VECTOR_REPLICA_MAX_AGE_SECONDS", 900))
+VECTOR_REPLICA_MAX_DELTA = int(os.getenv("VECTOR_REPLICA_MAX_DELTA", 5000))
+
+MAX_LIST_VALUES = 64  # list polja se čuvaju kao uint64 bitmask
+
+# <root>/<namespace>/.rebuild.lock - samo jedan proces pravi build namespace-a
+# <build>/.pin - shared lock čitaoca (batch match); prune ne briše build dok ga neko drži
+REBUILD_LOCK_FILE = ".rebuild.lock"
+PIN_FILE = ".pin"
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class _Columns:
+    """
+    Kolonski zapis metadata za filtere:
+    - keyword polja: int32 kod iz rečnika (-1 = nema vrednosti)
+    - list polja (skills): uint64 bitmask
+    - range polja: float32 (NaN = nema vrednosti)
+    Rečnici su zajednički za bazu i delta upise, pa se isti kodovi porede vektorizovano.
+    """
+
+    def __init__(self, keyword_fields, list_fields, range_fields, vocab: dict | None = None):
+        self.keyword_fields = tuple(keyword_fields)
+        self.list_fields = tuple(list_fields)
+        self.range_fields = tuple(range_fields)
+        vocab = vocab or {}
+        self.vocab = {field: list(vocab.get(field, [])) for field in self.keyword_fields + self.list_fields}
+        self._codes = {field: {value: code for code, value in enumerate(values)} for field, values in self.vocab.items()}
+
+    def _code(self, field: str, value, grow: bool) -> int:
+        codes = self._codes[field]
+        code = codes.get(value)
+        if code is None and grow:
+            if field in self.list_fields and len(codes) >= MAX_LIST_VALUES:
+                raise ValueError(f"Polje '{field}' ima više od {MAX_LIST_VALUES} različitih vrednosti")
+            code = len(codes)
+            codes[value] = code
+            self.vocab[field].append(value)
+        return code
+
+    def encode(self, metadata: dict) -> dict:
+        row = {}
+        for field in self.keyword_fields:
+            value = metadata.get(field)
+            row[field] = -1 if value is None else self._code(field, value, grow=True)
+        for field in self.list_fields:
+            bits = 0
+            for value in metadata.get(field) or []:
+                bits |= 1 << self._code(field, value, grow=True)
+            row[field] = bits
+        for field in self.range_fields:
+            value = metadata.get(field)
+            row[field] = float("nan") if value is None else float(value)
+        return row
+
+    def empty(self) -> dict:
+        return {
+            **{field: array("l") for field in self.keyword_fields},
+            **{field: array("Q") for field in self.list_fields},
+            **{field: array("f") for field in self.range_fields},
+        }
+
+    def to_numpy(self, rows: dict) -> dict:
+        return {
+            **{field: np.asarray(rows[field], dtype=np.int32) for field in self.keyword_fields},
+            **{field: np.asarray(rows[field], dtype=np.uint64) for field in self.list_fields},
+            **{field: np.asarray(rows[field], dtype=np.float32) for field in self.range_fields},
+        }
+
+    def mask(self, columns: dict, size: int, equals: dict | None, ranges: dict | None) -> np.ndarray:
+        """Ista semantika kao MetadataIndex.query: lista vrednosti = bilo koja, list polje = sadrži"""
+        mask = np.ones(size, dtype=bool)
+        for field, value in (equals or {}).items():
+            if value in (None, [], ()):
+                continue
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            codes = [self._code(field, item, grow=False) for item in values]
+            codes = [code for code in codes if code is not None]
+            if field in self.list_fields:
+                bits = 0
+                for code in codes:
+                    bits |= 1 << code
+                mask &= (columns[field] & np.uint64(bits)) != 0
+            else:
+                mask &= np.isin(columns[field], codes)
+        for field, (minimum, maximum) in (ranges or {}).items():
+            if minimum is not None:
+                mask &= columns[field] >= minimum
+            if maximum is not None:
+                mask &= columns[field] <= maximum
+        return mask
+
+
+class Replica:
+    """Jedan build sa diska: mmap matrica vektora + kolone + id-jevi"""
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.path = path
+        self.build_id = manifest["build_id"]
+        self.model = manifest["model"]
+        self.dims = manifest["dims"]
+        self.started_at = manifest["started_at"]
+        self.vocab = manifest["vocab"]
+        self.ids = manifest["ids"]
+        self.row_of = {doc_id: row for row, doc_id in enumerate(self.ids)}
+
+        if self.ids:
+            # mode="r": svi worker-i dele iste stranice fajla kroz page cache
+            self.vectors = np.memmap(os.path.join(path, "vectors.f32"), dtype=np.float32, mode="r", shape=(len(self.ids), self.dims))
+        else:
+            self.vectors = np.zeros((0, self.dims), dtype=np.float32)
+        with np.load(os.path.join(path, "columns.npz")) as columns:
+            self.columns = {field: columns[field] for field in columns.files}
+
+
+def read_current_build(namespace: str, root: str = VECTOR_REPLICA_DIR) -> str | None:
+    try:
+        with open(os.path.join(root, namespace, "CURRENT"), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+@contextmanager
+def _flock(path: str, shared: bool = False, blocking: bool = True):
+    """flock na fajlu; daje True ako je lock dobijen (bez fcntl uvek True), otpušta se zatvaranjem fajla"""
+    if fcntl is None:
+        yield True
+        return
+    with open(path, "a+") as f:
+        flags = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | (0 if blocking else fcntl.LOCK_NB)
+        try:
+            fcntl.flock(f, flags)
+        except BlockingIOError:
+            yield False
+            return
+        yield True
+
+
+def rebuild_lock(root: str, namespace: str, blocking: bool = True):
+    """Međuprocesni lock za pravljenje build-a namespace-a (with rebuild_lock(...) as locked)"""
+    os.makedirs(os.path.join(root, namespace), exist_ok=True)
+    return _flock(os.path.join(root, namespace, REBUILD_LOCK_FILE), blocking=blocking)
+
+
+@contextmanager
+def pinned_replica(namespace: str, root: str = VECTOR_REPLICA_DIR):
+    """
+    Otvara build na koji pokazuje CURRENT (za offline poslove koji čitaju celu matricu) i drži ga zaštićenim
+    od brisanja dok traje blok - novi build može da zameni CURRENT, ali ovaj ostaje na disku. None ako replike nema.
+    """
+    for _ in range(3):
+        build_id = read_current_build(namespace, root)
+        if build_id is None:
+            yield None
+            return
+        path = os.path.join(root, namespace, build_id)
+        opened = False
+        try:
+            with _flock(os.path.join(path, PIN_FILE), shared=True):
+                # build obrisan između čitanja CURRENT i pin-a - CURRENT već pokazuje na noviji
+                if not os.path.exists(os.path.join(path, "manifest.json")):
+                    continue
+                replica = Replica(path)
+                opened = True
+                yield replica
+                return
+        except FileNotFoundError:
+            if opened:
+                raise
+    raise FileNotFoundError(f"Vektorska replika '{namespace}' je menjana tokom otvaranja, pokušaj ponovo")
+
+
+def _top_k(scores: np.ndarray, mask: np.ndarray, ids, top_k: int) -> list[tuple[str, float]]:
+    candidates = np.flatnonzero(mask)
+    if candidates.size == 0 or top_k <= 0:
+        return []
+    selected = scores[candidates]
+    if candidates.size > top_k:
+        part = np.argpartition(-selected, top_k - 1)[:top_k]
+        candidates, selected = candidates[part], selected[part]
+    order = np.argsort(-selected, kind="stable")
+    return [(ids[candidates[i]], float(selected[i])) for i in order]
+
+
+class LocalVectorEngine:
+    """
+    Tačna (brute-force) kosinusna pretraga nad lokalnom replikom jednog namespace-a.
+    Baza je build sa diska (pre-normalizovana float32 matrica preko mmap-a), a upisi posle build-a
+    idu u malu delta tabelu u memoriji koja zaklanja redove baze (update/delete).
+    """
+
+    def __init__(self, namespace: str, model: str, keyword_fields=(), list_fields=(), range_fields=(), replica_dir: str = VECTOR_REPLICA_DIR):
+        self.namespace = namespace
+        self.model = model
+        self.fields = (tuple(keyword_fields), tuple(list_fields), tuple(range_fields))
+        self.root = os.path.join(replica_dir, namespace)
+        self.ready = False
+        self._lock = threading.RLock()
+        self._replica = None
+        self._columns = _Columns(*self.fields)
+        self._hidden = np.zeros(0, dtype=bool)
+        self._delta = {}  # id -> (vektor ili None za delete, metadata, vreme upisa)
+        self._delta_arrays = None
+        self._checked_at = 0.0
+        self.searches = 0
+
+    # ---------------- učitavanje ----------------
+
+    def current_build(self) -> str | None:
+        return read_current_build(self.namespace, os.path.dirname(self.root))
+
+    def load(self) -> bool:
+        build_id = self.current_build()
+        if build_id is None:
+            return False
+        if self._replica is not None and self._replica.build_id == build_id:
+            return True
+
+        replica = Replica(os.path.join(self.root, build_id))
+        if replica.model != self.model:
+            print(f"Vektorska replika '{self.namespace}' je za model {replica.model}, a servis koristi {self.model} - ide se na Pinecone")
+            return False
+
+        with self._lock:
+            # upisi pre početka build-a su već u njemu, ostali ostaju u delti
+            self._delta = {
+                doc_id: entry for doc_id, entry in self._delta.items()
+                if entry[2] >= replica.started_at
+            }
+            self._replica = replica
+            self._columns = _Columns(*self.fields, vocab=replica.vocab)
+            self._hidden = np.zeros(len(replica.ids), dtype=bool)
+            for doc_id in self._delta:
+                self._hide(doc_id)
+            self._delta_arrays = None
+            self.ready = True
+        print(f"Vektorska replika '{self.namespace}' učitana: {len(replica.ids)} vektora (build {build_id})")
+        return True
+
+    def maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < VECTOR_REPLICA_RELOAD_SECONDS:
+            return
+        self._checked_at = now
+        try:
+            self.load()
+        except Exception as e:
+            print(f"Vektorska replika '{self.namespace}' nije ponovo učitana: {e}")
+
+    def build_age(self) -> float | None:
+        """Sekunde od početka build-a učitane replike (None ako replika nije učitana)"""
+        replica = self._replica
+        return time.time() - replica.started_at if replica is not None else None
+
+    def is_stale(self) -> bool:
+        with self._lock:
+            age, delta = self.build_age(), len(self._delta)
+        if age is None:
+            return True
+        if VECTOR_REPLICA_MAX_AGE_SECONDS > 0 and age >= VECTOR_REPLICA_MAX_AGE_SECONDS:
+            return True
+        return VECTOR_REPLICA_MAX_DELTA > 0 and delta >= VECTOR_REPLICA_MAX_DELTA
+
+    # ---------------- upisi ----------------
+
+    def _hide(self, doc_id: str):
+        row = self._replica.row_of.get(doc_id)
+        if row is not None:
+            self._hidden[row] = True
+
+    def _current_vector(self, doc_id: str) -> np.ndarray | None:
+        if doc_id in self._delta:
+            return self._delta[doc_id][0]
+        row = self._replica.row_of.get(doc_id) if self._replica else None
+        if row is not None and not self._hidden[row]:
+            return np.array(self._replica.vectors[row])
+        return None
+
+    def upsert(self, doc_id: str, values, metadata: dict):
+        vector = normalize_rows(np.asarray(values, dtype=np.float32))
+        with self._lock:
+            # metadata se čuva sirova da bi se posle reload-a kodirala novim rečnikom
+            self._delta[doc_id] = (vector, dict(metadata), time.time())
+            self._delta_arrays = None
+            if self._replica is not None:
+                self._hide(doc_id)
+
+    def update(self, doc_id: str, metadata: dict, values=None):
+        """metadata je kompletna (posle izmene); values samo ako je embedding promenjen"""
+        with self._lock:
+            if values is None:
+                values = self._current_vector(doc_id)
+                if values is None:
+                    return  # nije u replici - stiže sa sledećim build-om
+            self.upsert(doc_id, values, metadata)
+
+    def delete(self, doc_id: str):
+        with self._lock:
+            self._delta[doc_id] = (None, None, time.time())
+            self._delta_arrays = None
+            if self._replica is not None:
+                self._hide(doc_id)
+
+    def _delta_snapshot(self):
+        if self._delta_arrays is None:
+            live = [(doc_id, vector, metadata) for doc_id, (vector, metadata, _) in self._delta.items() if vector is not None]
+            ids = [doc_id for doc_id, _, _ in live]
+            dims = self._replica.dims if self._replica else (live[0][1].shape[0] if live else 0)
+            vectors = np.vstack([vector for _, vector, _ in live]) if live else np.zeros((0, dims), dtype=np.float32)
+            rows = self._columns.empty()
+            for _, _, metadata in live:
+                for field, value in self._columns.encode(metadata).items():
+                    rows[field].append(value)
+            self._delta_arrays = (ids, vectors, self._columns.to_numpy(rows))
+        return self._delta_arrays
+
+    def vector(self, doc_id: str) -> np.ndarray | None:
+        """Sačuvani (normalizovani) vektor dokumenta iz replike ili delte, bez poziva ka Pinecone-u"""
+        with self._lock:
+            return self._current_vector(doc_id)
+
+    # ---------------- pretraga ----------------
+
+    def search(self, vector, top_k: int, equals: dict | None = None, ranges: dict | None = None) -> list[tuple[str, float]]:
+        """Vraća top_k (id, cosine score) koji prolaze filtere, isto kao Pinecone query bez metadata"""
+        self.maybe_reload()
+        query = normalize_rows(np.asarray(vector, dtype=np.float32))
+
+        with self._lock:
+            replica = self._replica
+            hidden = self._hidden.copy()
+            delta_ids, delta_vectors, delta_columns = self._delta_snapshot()
+            base_mask = self._columns.mask(replica.columns, len(replica.ids), equals, ranges) & ~hidden
+            delta_mask = self._columns.mask(delta_columns, len(delta_ids), equals, ranges)
+        self.searches += 1
+
+        results = _top_k(replica.vectors @ query, base_mask, replica.ids, top_k)
+        if delta_ids:
+            results += _top_k(delta_vectors @ query, delta_mask, delta_ids, top_k)
+            results.sort(key=lambda item: -item[1])
+        return results[:top_k]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "namespace": self.namespace,
+                "ready": self.ready,
+                "build_id": self._replica.build_id if self._replica else None,
+                "build_age_seconds": round(self.build_age(), 1) if self._replica else None,
+                "base_vectors": len(self._replica.ids) if self._replica else 0,
+                "delta_writes": len(self._delta),
+                "searches": self.searches,
+            }
+
+
+def build_replica(root: str, namespace: str, records, model: str, keyword_fields=(), list_fields=(), range_fields=(),
+                  keep_builds: int = 2, lock: bool = True) -> str:
+    """
+    Piše novi build iz stream-a zapisa ({"id","values","metadata"}, npr. iz exportera) i atomično
+    prebacuje CURRENT na njega. Vektori idu direktno u fajl, pa memorija ne raste sa brojem vektora.
+    Build se pravi pod rebuild_lock-om (lock=False samo kad ga pozivalac već drži).
+    """
+    if lock:
+        with rebuild_lock(root, namespace):
+            return build_replica(root, namespace, records, model, keyword_fields, list_fields, range_fields, keep_builds, lock=False)
+
+    started_at = time.time()
+    # milisekunde u imenu: redosled imena mora biti redosled build-ova i u istoj sekundi (prune poredi sa CURRENT)
+    build_id = f"{time.strftime('%Y%m%d%H%M%S', time.localtime(started_at))}{int(started_at * 1000) % 1000:03d}-{uuid.uuid4().hex[:6]}"
+    path = os.path.join(root, namespace, build_id)
+    os.makedirs(path)
+
+    columns = _Columns(keyword_fields, list_fields, range_fields)
+    rows = columns.empty()
+    ids = []
+    dims = None
+    with open(os.path.join(path, "vectors.f32"), "wb") as f:
+        for record in records:
+            vector = normalize_rows(np.asarray(record["values"], dtype=np.float32))
+            if dims is None:
+                dims = vector.shape[0]
+            elif vector.shape[0] != dims:
+                raise ValueError(f"Vektor {record['id']} ima {vector.shape[0]} dimenzija, očekivano {dims}")
+            f.write(vector.tobytes())
+            ids.append(record["id"])
+            for field, value in columns.encode(record["metadata"]).items():
+                rows[field].append(value)
+
+    np.savez(os.path.join(path, "columns.npz"), **columns.to_numpy(rows))
+    with open(os.path.join(path, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "build_id": build_id,
+            "namespace": namespace,
+            "model": model,
+            "dims": dims or 0,
+            "started_at": started_at,
+            "vocab": columns.vocab,
+            "ids": ids,
+        }, f)
+
+    current_path = os.path.join(root, namespace, "CURRENT")
+    tmp_path = f"{current_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(build_id)
+    os.replace(tmp_path, current_path)
+
+    _prune_builds(root, namespace, build_id, keep_builds)
+
+    print(f"Vektorska replika '{namespace}': {len(ids)} vektora, build {build_id}")
+    return build_id
+
+
+def _prune_builds(root: str, namespace: str, current: str, keep_builds: int):
+    """
+    Briše build-ove starije od CURRENT osim poslednjih keep_builds - 1; CURRENT i noviji od njega se ne diraju,
+    kao ni build koji neko drži pin-ovan. Worker koji stari build još ima mapiranog čita dalje dok ne uradi reload.
+    """
+    namespace_dir = os.path.join(root, namespace)
+    # build_id počinje vremenom, pa je redosled imena redosled build-ova
+    older = sorted(name for name in os.listdir(namespace_dir) if os.path.isdir(os.path.join(namespace_dir, name)) and name < current)
+    for name in older[:max(len(older) - (keep_builds - 1), 0)]:
+        path = os.path.join(namespace_dir, name)
+        with _flock(os.path.join(path, PIN_FILE), blocking=False) as unpinned:
+            if unpinned:
+                shutil.rmtree(path, ignore_errors=True)
+
+
+ENGINE_FIELDS = {
+    "candidates": {
+        "keyword_fields": ("education_level", "city", "country"),
+        "list_fields": ("skills",),
+        "range_fields": ("years_experience",),
+    },
+    "job_ads": {
+        "keyword_fields": ("required_experience_level", "job_type", "work_mode", "city", "country"),
+    },
+}
+
+
+VECTOR_ENGINES = {
+    namespace: LocalVectorEngine(namespace, EMBEDDING_MODEL, **fields)
+    for namespace, fields in ENGINE_FIELDS.items()
+}
+
+
+def load_vector_engines():
+    if VECTOR_BACKEND != "local":
+        return
+    for namespace, engine in VECTOR_ENGINES.items():
+        try:
+            if not engine.load():
+                print(f"Vektorska replika '{namespace}' ne postoji (python -m app.search.vector_engine) - ide se na Pinecone")
+        except Exception as e:
+            print(f"Vektorska replika '{namespace}' nije učitana: {e}")
+
+
+def rebuild_vector_engine(namespace: str, root: str = VECTOR_REPLICA_DIR, lock: bool = True):
+    """Novi build iz Pinecone-a pa reload; upisi tokom build-a ostaju u delti (load zadržava novije od started_at)"""
+    from app.export.namespace_export import iter_namespace
+    build_replica(root, namespace, iter_namespace(namespace, include_values=True), EMBEDDING_MODEL, lock=lock, **ENGINE_FIELDS[namespace])
+    VECTOR_ENGINES[namespace].load()
+    # nova replika vidi i tuđe upise, pa keširani rezultati ovog procesa zastarevaju
+    namespace_versions.bump(namespace)
+
+
+def _rebuild_loop():
+    while True:
+        for namespace, engine in VECTOR_ENGINES.items():
+            try:
+                # build koji je u međuvremenu napravio drugi proces se samo učitava
+                engine.load()
+                if not engine.is_stale():
+                    continue
+                # build pravi samo proces koji dobije lock; ostali učitaju njegov build u nekom od sledećih krugova
+                with rebuild_lock(VECTOR_REPLICA_DIR, namespace, blocking=False) as locked:
+                    if locked:
+                        engine.load()
+                        if engine.is_stale():
+                            rebuild_vector_engine(namespace, lock=False)
+            except Exception as e:
+                # engine ostaje na postojećoj replici (ili na Pinecone-u ako je nema)
+                print(f"Vektorska replika '{namespace}' nije ponovo napravljena: {e}")
+        time.sleep(VECTOR_REPLICA_RELOAD_SECONDS)
+
+
+def start_vector_engine_sync():
+    """Pozadinsko obnavljanje zastarelih replika (samo uz VECTOR_BACKEND=local)"""
+    if VECTOR_BACKEND == "local" and VECTOR_REPLICA_AUTO_REBUILD:
+        threading.Thread(target=_rebuild_loop, name="vector-engine-sync", daemon=True).start()
+
+
+def vector_engine_for(namespace: str, writes: bool = False) -> LocalVectorEngine | None:
+    """
+    Vraća lokalni engine samo ako je VECTOR_BACKEND=local i replika je učitana - inače pozivalac ide na Pinecone.
+    Za upise (writes=True) engine se vraća i pre učitavanja, da upis ne bi bio izgubljen do prvog load-a.
+    """
+    engine = VECTOR_ENGINES[namespace]
+    if VECTOR_BACKEND == "local" and (engine.ready or writes):
+        return engine
+    return None
+
+
+def sync_vector_engine(namespace: str, op: str, doc_id: str, metadata: dict | None = None, values=None):
+    """Prenosi upis iz CRUD-a u deltu lokalnog engine-a (samo kad je VECTOR_BACKEND=local)"""
+    engine = vector_engine_for(namespace, writes=True)
+    if engine is None:
+        return
+    if op == "upsert":
+        engine.upsert(doc_id, values, metadata)
+    elif op == "update":
+        engine.update(doc_id, metadata, values)
+    elif op == "delete":
+        engine.delete(doc_id)
+
+
+def main():
+    # python -m app.search.vector_engine --namespace candidates
+    parser = argparse.ArgumentParser(description="Pravi lokalnu mmap repliku Pinecone namespace-a za VECTOR_BACKEND=local")
+    parser.add_argument("--namespace", choices=list(ENGINE_FIELDS), action="append")
+    parser.add_argument("--root", default=VECTOR_REPLICA_DIR)
+    args = parser.parse_args()
+
+    from app.export.namespace_export import iter_namespace
+    for namespace in args.namespace or list(ENGINE_FIELDS):
+        build_replica(args.root, namespace, iter_namespace(namespace, include_values=True), EMBEDDING_MODEL, **ENGINE_FIELDS[namespace])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+
+import httpx
+
+from app.enums.candidates_enums import SKILLS_POOL, EducationLevel
+
+# Meri requests/sec i latenciju servisa koji već radi (uvicorn) pri 10, 100 i 1000 istovremenih klijenata.
+# Za poređenje pre/posle async izmena pokreni isti benchmark nad obe verzije servisa sa različitim --label:
+#   git checkout <commit pre async izmena> && uvicorn app.main:app --port 8000
+#   python -m benchmarks.concurrency_benchmark --label sync
+#   git checkout - && uvicorn app.main:app --port 8000
+#   python -m benchmarks.concurrency_benchmark --label async
+# Rezultati se dopisuju u --output, a tabela na kraju poredi sve label-e iz fajla.
+# Sa --cache-busting svaki upit je jedinstven, pa se meri put do OpenAI/Pinecone-a, a ne keš.
+
+JOB_TITLES = ["Backend Engineer", "Frontend Developer", "Fullstack Developer", "Data Analyst", "DevOps Engineer"]
+
+
+def random_request(rng: random.Random, cache_busting: bool) -> tuple[str, dict]:
+    suffix = f" {rng.getrandbits(32):08x}" if cache_busting else ""
+    if rng.random() < 0.5:
+        return "/job_ads/filter", {"title_query": rng.choice(JOB_TITLES) + suffix}
+    params = {"skill_query": ", ".join(rng.sample(SKILLS_POOL, k=rng.randint(1, 3))) + suffix, "page_size": 20}
+    if rng.random() < 0.5:
+        params["education_level"] = rng.choice([e.value for e in EducationLevel])
+    return "/candidates/filter", params
+
+
+async def client_loop(client: httpx.AsyncClient, deadline: float, rng: random.Random, cache_busting: bool, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        path, params = random_request(rng, cache_busting)
+        started = time.perf_counter()
+        try:
+            response = await client.get(path, params=params)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def run_level(base_url: str, concurrency: int, duration: float, seed: int, cache_busting: bool) -> dict:
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*[
+            client_loop(client, deadline, random.Random(seed + i), cache_busting, latencies, errors)
+            for i in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 1) if latencies else None,
+    }
+
+
+def print_comparison(results: list[dict]):
+    labels = sorted({result["label"] for result in results})
+    levels = sorted({result["concurrency"] for result in results})
+    print(f"{'klijenata':>10} " + " ".join(f"{label + ' rps':>14} {label + ' p95':>14}" for label in labels))
+    for level in levels:
+        row = []
+        for label in labels:
+            # poslednje merenje za (label, concurrency)
+            matches = [r for r in results if r["label"] == label and r["concurrency"] == level]
+            last = matches[-1] if matches else {}
+            row.append(f"{last.get('rps', '-'):>14} {last.get('p95_ms', '-'):>14}")
+        print(f"{level:>10} " + " ".join(row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requests/sec pri 10/100/1000 istovremenih klijenata")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--label", default="current", help="Ime merenja (npr. sync / async)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--duration", type=float, default=20, help="Sekundi po nivou")
+    parser.add_argument("--cache-busting", action="store_true")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default="concurrency_results.json")
+    args = parser.parse_args()
+
+    results = []
+    if os.path.exists(args.output):
+        with open(args.output, encoding="utf-8") as f:
+            results = json.load(f)
+
+    for concurrency in args.concurrency:
+        result = asyncio.run(run_level(args.base_url, concurrency, args.duration, args.seed, args.cache_busting))
+        result["label"] = args.label
+        print(result)
+        results.append(result)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    print_comparison(results)
+
+
+if __name__ == "__main__":
+    main()
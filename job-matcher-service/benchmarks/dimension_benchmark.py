@@ -0,0 +1,102 @@
+import argparse
+import json
+import random
+import statistics
+import time
+
+from app.database import pc, client, FULL_INDEX_NAME
+from app.embeddings.providers import OpenAIEmbeddingProvider, shorten_embedding
+from app.enums.candidates_enums import SKILLS_POOL
+
+# Poredi puni 1536-dim index i kompaktni index (napravljen sa app.migrate_compact_index):
+# latenciju query-ja, veličinu request payload-a, storage po vektoru i recall@k u odnosu na puni index.
+#   python -m benchmarks.dimension_benchmark --dimensions 512 --queries 100 --top-k 20
+
+JOB_TITLES = ["Backend Engineer", "Frontend Developer", "Fullstack Developer", "Data Analyst", "DevOps Engineer"]
+
+
+def sample_queries(count: int, rng: random.Random):
+    queries = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            skills = rng.sample(SKILLS_POOL, k=rng.randint(1, 4))
+            queries.append(("candidates", f"Skills: {', '.join(skills)}"))
+        else:
+            queries.append(("job_ads", f"Job title: {rng.choice(JOB_TITLES)}"))
+    return queries
+
+
+def timed_query(index, namespace, vector, top_k):
+    started = time.perf_counter()
+    response = index.query(namespace=namespace, vector=vector, top_k=top_k, include_metadata=False)
+    return (time.perf_counter() - started) * 1000, [match.id for match in response.matches]
+
+
+def payload_bytes(namespace, vector, top_k):
+    return len(json.dumps({"namespace": namespace, "vector": vector, "topK": top_k}).encode("utf-8"))
+
+
+def summarize(name, latencies, payloads, dimensions):
+    latencies = sorted(latencies)
+    return {
+        "index": name,
+        "dimensions": dimensions,
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "mean_ms": round(statistics.mean(latencies), 2),
+        "avg_payload_bytes": int(statistics.mean(payloads)),
+        "storage_bytes_per_vector": dimensions * 4,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dimensions", type=int, default=512)
+    parser.add_argument("--compact-index", help="default: <PINECONE_INDEX_NAME>-<dimensions>")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    compact_name = args.compact_index or f"{FULL_INDEX_NAME}-{args.dimensions}"
+    full_index = pc.Index(FULL_INDEX_NAME)
+    compact_index = pc.Index(compact_name)
+    queries = sample_queries(args.queries, random.Random(args.seed))
+
+    # jedan batch poziv za sve upite, pa latencija embedding-a ne ulazi u merenje
+    full_vectors = OpenAIEmbeddingProvider(client).embed([text for _, text in queries])
+
+    # warm-up konekcija
+    timed_query(full_index, queries[0][0], full_vectors[0], args.top_k)
+    timed_query(compact_index, queries[0][0], shorten_embedding(full_vectors[0], args.dimensions), args.top_k)
+
+    full_latencies, compact_latencies = [], []
+    full_payloads, compact_payloads = [], []
+    recalls = []
+
+    for (namespace, _), full_vector in zip(queries, full_vectors):
+        compact_vector = shorten_embedding(full_vector, args.dimensions)
+
+        full_ms, full_ids = timed_query(full_index, namespace, full_vector, args.top_k)
+        compact_ms, compact_ids = timed_query(compact_index, namespace, compact_vector, args.top_k)
+
+        full_latencies.append(full_ms)
+        compact_latencies.append(compact_ms)
+        full_payloads.append(payload_bytes(namespace, full_vector, args.top_k))
+        compact_payloads.append(payload_bytes(namespace, compact_vector, args.top_k))
+        if full_ids:
+            recalls.append(len(set(full_ids) & set(compact_ids)) / len(full_ids))
+
+    results = [
+        summarize(FULL_INDEX_NAME, full_latencies, full_payloads, len(full_vectors[0])),
+        summarize(compact_name, compact_latencies, compact_payloads, args.dimensions),
+    ]
+    results[1]["recall_at_k"] = round(statistics.mean(recalls), 4) if recalls else None
+
+    print(f"{args.queries} upita, top_k={args.top_k}")
+    for row in results:
+        print(json.dumps(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Meri vreme importa app.main (i opciono start sa warm-up-om) u svežem procesu i poredi ga sa budžetom:
+#   python -m benchmarks.import_budget --runs 5 --import-budget-ms 1500
+#   python -m benchmarks.import_budget --startup --startup-budget-ms 8000
+# Izlazni kod je 1 ako je budžet prekoračen ili ako je neki klijent napravljen već pri importu.
+# Isti skript postoji u oba servisa.
+
+CHILD = """
+import json, time
+started = time.perf_counter()
+import app.main
+result = {"import_ms": (time.perf_counter() - started) * 1000}
+from app.lazy_client import loaded_clients
+result["clients_loaded_on_import"] = loaded_clients()
+if STARTUP:
+    from fastapi.testclient import TestClient
+    with TestClient(app.main.app):
+        result["startup_ms"] = (time.perf_counter() - started) * 1000
+        result["warm_up"] = app.main.startup_report
+print("RESULT " + json.dumps(result))
+"""
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int]]:
+    """Linije "import time: self | cumulative | paket" -> (paket najvišeg nivoa, kumulativno us)"""
+    packages = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # uvučena imena su uvezena iz nekog drugog modula; broje se samo moduli najvišeg nivoa
+        if not name.startswith("  "):
+            packages.append((name.strip(), int(cumulative)))
+    return packages
+
+
+def run_once(startup: bool) -> tuple[dict, list[tuple[str, int]]]:
+    code = f"STARTUP = {startup}\n{CHILD}"
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    lines = [line for line in process.stdout.splitlines() if line.startswith("RESULT ")]
+    if process.returncode != 0 or not lines:
+        raise RuntimeError(f"Import app.main nije uspeo:\n{process.stderr[-4000:]}")
+    return json.loads(lines[-1][len("RESULT "):]), parse_importtime(process.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Budžet vremena importa i starta servisa")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--import-budget-ms", type=float, default=1500)
+    parser.add_argument("--startup", action="store_true", help="Meri i start sa lifespan warm-up-om")
+    parser.add_argument("--startup-budget-ms", type=float, default=8000)
+    parser.add_argument("--top", type=int, default=10, help="Koliko najsporijih paketa prikazati")
+    args = parser.parse_args()
+
+    # prvi (neizmereni) import puni __pycache__, pa merenja ne uključuju kompajliranje
+    run_once(False)
+    results, packages = [], []
+    for _ in range(args.runs):
+        result, packages = run_once(args.startup)
+        results.append(result)
+
+    import_ms = statistics.median(result["import_ms"] for result in results)
+    print(f"import app.main: {import_ms:.0f} ms (medijana od {args.runs}, budžet {args.import_budget_ms:.0f} ms)")
+    print("Najsporiji paketi (kumulativno):")
+    for name, cumulative in sorted(packages, key=lambda package: -package[1])[:args.top]:
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    failed = import_ms > args.import_budget_ms
+    loaded = results[-1]["clients_loaded_on_import"]
+    if loaded:
+        print(f"Klijenti napravljeni pri importu: {', '.join(loaded)}")
+        failed = True
+
+    if args.startup:
+        startup_ms = statistics.median(result["startup_ms"] for result in results)
+        print(f"import + warm-up: {startup_ms:.0f} ms (budžet {args.startup_budget_ms:.0f} ms)")
+        for step in (results[-1]["warm_up"] or {}).get("steps", []):
+            print(f"  {step['ms']:>8.1f} ms  {step['name']}" + (f"  ({step['error']})" if step["error"] else ""))
+        failed = failed or startup_ms > args.startup_budget_ms
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
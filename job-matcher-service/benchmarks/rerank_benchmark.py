@@ -0,0 +1,84 @@
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from app.enums.candidates_enums import EducationLevel, SKILLS_POOL
+from app.matching.rerank import candidate_block, feature_scores, rerank
+
+# Meri koliko re-ranking stage dodaje na pretragu, nad sintetičkim blokom kandidata (bez mreže):
+#   python -m benchmarks.rerank_benchmark --candidates 1000 --top-k 20 --budget-ms 1
+# Posebno se meri kodiranje kolona iz metadata (jedini deo sa petljom po kandidatu), sam NumPy skor i ceo stage:
+# "hladno" su svi kandidati novi, "toplo" su kolone već kodirane za istu verziju namespace-a (uobičajen slučaj).
+# Izlazni kod je 1 ako medijana toplog stage-a prelazi budžet.
+
+CITIES = ["Beograd", "Novi Sad", "Niš", "Kragujevac", "Subotica", "Zagreb", "Ljubljana"]
+
+
+def sample_candidates(count: int, rng: random.Random) -> list[dict]:
+    candidates = []
+    for position in range(count):
+        candidates.append({
+            "id": f"candidate-{position}",
+            "score": 0.9 - position * 0.4 / count,
+            "metadata": {
+                "firstname": "Ime",
+                "lastname": "Prezime",
+                "skills": rng.sample(SKILLS_POOL, k=rng.randint(1, 5)),
+                "education_level": rng.choice(list(EducationLevel)).value,
+                "years_experience": round(rng.uniform(0, 15), 1),
+                "city": rng.choice(CITIES),
+                "country": "Serbia",
+            },
+        })
+    return candidates
+
+
+def measure(function, runs: int) -> list[float]:
+    function()
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)
+
+
+def report(name: str, timings: list[float]):
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<22} median {statistics.median(timings):.3f} ms   p95 {p95:.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latencija re-ranking stage-a")
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--budget-ms", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    candidates = sample_candidates(args.candidates, random.Random(args.seed))
+    query = {"required_skills": ["Python", "Docker", "SQL"], "min_years": 2.0, "max_years": 6.0, "city": "Beograd"}
+    block = candidate_block(candidates)
+
+    print(f"{args.candidates} kandidata, top_k={args.top_k}, {args.runs} ponavljanja")
+    report("kolone, hladno", measure(lambda: candidate_block(candidates), args.runs))
+    report("kolone, toplo", measure(lambda: candidate_block(candidates, version=0), args.runs))
+    report("feature-i (NumPy)", measure(lambda: feature_scores(block, **query), args.runs))
+    report("re-ranking, hladno", measure(lambda: rerank(candidates, args.top_k, **query), args.runs))
+    total = measure(lambda: rerank(candidates, args.top_k, version=0, **query), args.runs)
+    report("re-ranking, toplo", total)
+
+    print("Top 3 posle re-rankinga:")
+    for candidate in rerank(candidates, 3, version=0, **query):
+        print(f"  {candidate['id']:<16} {candidate['score']:.4f}  {candidate['features']}")
+
+    median = statistics.median(total)
+    print(f"Budžet {args.budget_ms:.3f} ms: {'OK' if median <= args.budget_ms else 'PREKORAČEN'}")
+    sys.exit(0 if median <= args.budget_ms else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.database import EMBEDDING_DIMENSIONS, INDEX_NAME, PINECONE_API_KEY, pc
+from app.pinecone_transport import TRANSPORTS, open_index
+
+# Poredi REST i gRPC transport nad istim index-om: latenciju i protok upsert-a i query-ja.
+#   python -m benchmarks.transport_benchmark --vectors 2000 --queries 500 --concurrency 1 8 32
+# Vektori se upisuju u privremeni namespace (--namespace) koji se na kraju briše,
+# pa benchmark ne dira candidates/job_ads. Oba transporta dobijaju iste (nasumične) vektore.
+
+
+def random_vectors(rng: np.random.Generator, count: int, dimensions: int) -> np.ndarray:
+    vectors = rng.standard_normal((count, dimensions), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def percentile(latencies: list[float], fraction: float) -> float | None:
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+    return round(ordered[max(int(len(ordered) * fraction) - 1, 0)], 1)
+
+
+def timed(fn, *args, **kwargs) -> float:
+    started = time.perf_counter()
+    fn(*args, **kwargs)
+    return (time.perf_counter() - started) * 1000
+
+
+def run_parallel(calls: list, concurrency: int) -> tuple[list[float], float]:
+    """Izvršava (fn, kwargs) pozive sa zadatim brojem thread-ova; vraća latencije (ms) i ukupno trajanje (s)"""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = list(executor.map(lambda call: timed(call[0], **call[1]), calls))
+    return latencies, time.perf_counter() - started
+
+
+def bench_transport(transport: str, vectors: np.ndarray, queries: np.ndarray, namespace: str,
+                    batch_size: int, concurrency: int, top_k: int) -> dict:
+    index = open_index(pc, PINECONE_API_KEY, INDEX_NAME, transport=transport, pool_threads=max(concurrency, 1))
+
+    upserts = [
+        (index.upsert, {
+            "vectors": [{"id": f"bench-{i}", "values": vectors[i]} for i in range(start, min(start + batch_size, len(vectors)))],
+            "namespace": namespace,
+        })
+        for start in range(0, len(vectors), batch_size)
+    ]
+    upsert_latencies, upsert_seconds = run_parallel(upserts, concurrency)
+
+    # upis je eventually consistent; query-ji ionako mere samo vreme odgovora
+    query_calls = [(index.query, {"vector": query, "top_k": top_k, "namespace": namespace}) for query in queries]
+    query_latencies, query_seconds = run_parallel(query_calls, concurrency)
+
+    index.delete(delete_all=True, namespace=namespace)
+    return {
+        "transport": transport,
+        "concurrency": concurrency,
+        "upsert_batches": len(upserts),
+        "upsert_p50_ms": round(statistics.median(upsert_latencies), 1),
+        "upsert_p95_ms": percentile(upsert_latencies, 0.95),
+        "upsert_vectors_per_sec": round(len(vectors) / upsert_seconds, 1),
+        "query_p50_ms": round(statistics.median(query_latencies), 1),
+        "query_p95_ms": percentile(query_latencies, 0.95),
+        "queries_per_sec": round(len(queries) / query_seconds, 1),
+    }
+
+
+def print_comparison(results: list[dict]):
+    columns = ["upsert_p50_ms", "upsert_p95_ms", "upsert_vectors_per_sec", "query_p50_ms", "query_p95_ms", "queries_per_sec"]
+    print(f"{'transport':>10} {'klijenata':>10} " + " ".join(f"{column:>22}" for column in columns))
+    for result in results:
+        print(f"{result['transport']:>10} {result['concurrency']:>10} " + " ".join(f"{result[column]!s:>22}" for column in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="REST vs gRPC: latencija i protok upsert-a i query-ja")
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS))
+    parser.add_argument("--vectors", type=int, default=2000, help="Broj vektora za upsert")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--namespace", default="transport-benchmark")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default="transport_results.json")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = random_vectors(rng, args.vectors, EMBEDDING_DIMENSIONS)
+    queries = random_vectors(rng, args.queries, EMBEDDING_DIMENSIONS)
+
+    results = []
+    for concurrency in args.concurrency:
+        for transport in args.transports:
+            result = bench_transport(transport, vectors, queries, args.namespace, args.batch_size, concurrency, args.top_k)
+            print(result)
+            results.append(result)
+
+    if args.output:
+        previous = []
+        if os.path.exists(args.output):
+            with open(args.output, encoding="utf-8") as f:
+                previous = json.load(f)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(previous + results, f, indent=2)
+
+    print_comparison(results)
+
+
+if __name__ == "__main__":
+    main()